@@ -0,0 +1,270 @@
+#------------------------------------------------------------
+# Streaming alert rules for metric snapshots.
+#
+# Rules live in the AlertRule table. Every rule keeps O(1)
+# in-memory state (last value, last time, open alert), so
+# ingested points are evaluated as they arrive without reading
+# history back. A breach opens one SystemAlert per (metric,
+# rule); further breaches bump its OccurrenceCount/LastSeenAt
+# instead of adding rows, and the first healthy point resolves
+# it. Absence rules are checked by a periodic task.
+#------------------------------------------------------------
+import operator
+import threading
+from datetime import datetime
+
+from backend.db_connection import db
+from backend.db_connection.change_markers import mark_tables_changed, table_generations
+
+
+RULE_TYPES = {
+    "threshold": "Threshold",
+    "rate_of_change": "Rate of Change",
+    "absence": "Absence",
+}
+COMPARATORS = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+}
+
+# Statuses that close an alert; anything else (including NULL) is open.
+RESOLVED_STATUSES = ("resolved", "closed")
+OPEN_ALERT_CONDITION = (
+    "(Status IS NULL OR LOWER(Status) NOT IN ("
+    + ", ".join(f"'{s}'" for s in RESOLVED_STATUSES)
+    + "))"
+)
+
+_lock = threading.RLock()
+
+# rule id -> AlertRule row (Threshold as float)
+_rules: dict[int, dict] = {}
+_rules_by_metric: dict[int, list[int]] = {}
+# rule id -> {"last_value", "last_at", "alert_id"}
+_state: dict[int, dict] = {}
+_seen_generations: dict | None = None
+
+
+def _sync(cursor) -> None:
+    """Reload rules and open alerts when either was changed through the API."""
+    global _seen_generations
+    generations = table_generations(("AlertRule", "SystemAlert"))
+    if generations == _seen_generations:
+        return
+
+    cursor.execute(
+        """
+        SELECT RuleID, MetricID, Name, RuleType, Comparator,
+               Threshold, WindowSeconds, Severity
+        FROM AlertRule
+        WHERE IsActive = 1
+        """
+    )
+    rules = {}
+    for row in cursor.fetchall():
+        row["Threshold"] = float(row["Threshold"]) if row["Threshold"] is not None else None
+        rules[row["RuleID"]] = row
+
+    cursor.execute(
+        f"""
+        SELECT RuleID, MAX(AlertID) AS AlertID
+        FROM SystemAlert
+        WHERE RuleID IS NOT NULL AND {OPEN_ALERT_CONDITION}
+        GROUP BY RuleID
+        """
+    )
+    open_alerts = {row["RuleID"]: row["AlertID"] for row in cursor.fetchall()}
+
+    # Absence rules need to know when their metric last reported (once per rule)
+    new_absence = [r for rid, r in rules.items() if r["RuleType"] == "absence" and rid not in _state]
+    last_seen = {}
+    if new_absence:
+        metric_ids = sorted({r["MetricID"] for r in new_absence})
+        placeholders = ", ".join(["%s"] * len(metric_ids))
+        cursor.execute(
+            f"""
+            SELECT MetricID, MAX(MeasuredAt) AS LastAt
+            FROM MetricSnapshot
+            WHERE MetricID IN ({placeholders})
+            GROUP BY MetricID
+            """,
+            tuple(metric_ids),
+        )
+        last_seen = {row["MetricID"]: row["LastAt"] for row in cursor.fetchall()}
+
+    now = datetime.now()
+    for rule_id in list(_state):
+        if rule_id not in rules:
+            del _state[rule_id]
+    _rules_by_metric.clear()
+    for rule_id, rule in rules.items():
+        state = _state.setdefault(
+            rule_id,
+            {"last_value": None, "last_at": last_seen.get(rule["MetricID"]), "alert_id": None},
+        )
+        if rule["RuleType"] == "absence" and state["last_at"] is None:
+            state["last_at"] = now
+        state["alert_id"] = open_alerts.get(rule_id)
+        _rules_by_metric.setdefault(rule["MetricID"], []).append(rule_id)
+
+    _rules.clear()
+    _rules.update(rules)
+    _seen_generations = generations
+
+
+def _message(rule, observed) -> str:
+    if rule["RuleType"] == "absence":
+        return f"{rule['Name']}: no data for more than {rule['WindowSeconds']}s"
+    if rule["RuleType"] == "rate_of_change":
+        return (
+            f"{rule['Name']}: changed {observed:+g} per {rule['WindowSeconds']}s "
+            f"({rule['Comparator']} {rule['Threshold']:g})"
+        )
+    return f"{rule['Name']}: value {observed:g} {rule['Comparator']} {rule['Threshold']:g}"
+
+
+def _open_alert(cursor, run, rule, at, observed) -> int:
+    if run["next_alert_id"] is None:
+        cursor.execute("SELECT COALESCE(MAX(AlertID), 0) + 1 AS next_id FROM SystemAlert")
+        run["next_alert_id"] = cursor.fetchone()["next_id"]
+    alert_id = run["next_alert_id"]
+    run["next_alert_id"] += 1
+
+    cursor.execute(
+        """
+        INSERT INTO SystemAlert
+            (AlertID, MetricID, AlertType, Severity, Message,
+             CreatedAt, Status, RuleID, OccurrenceCount, LastSeenAt)
+        VALUES (%s, %s, %s, %s, %s, %s, 'open', %s, 1, %s)
+        """,
+        (
+            alert_id, rule["MetricID"], RULE_TYPES[rule["RuleType"]], rule["Severity"],
+            _message(rule, observed), at, rule["RuleID"], at,
+        ),
+    )
+    run["changed"] = True
+    return alert_id
+
+
+def _resolve_alert(cursor, run, alert_id, at) -> None:
+    delta, last_seen = run["bumps"].pop(alert_id, (0, None))
+    cursor.execute(
+        """
+        UPDATE SystemAlert
+        SET Status = 'resolved',
+            ResolvedAt = %s,
+            OccurrenceCount = COALESCE(OccurrenceCount, 0) + %s,
+            LastSeenAt = COALESCE(%s, LastSeenAt)
+        WHERE AlertID = %s
+        """,
+        (at, delta, last_seen, alert_id),
+    )
+    run["changed"] = True
+
+
+def _transition(cursor, run, rule, state, breached, at, observed=None) -> None:
+    alert_id = state["alert_id"]
+    if breached and alert_id is None:
+        state["alert_id"] = _open_alert(cursor, run, rule, at, observed)
+    elif breached:
+        delta, _ = run["bumps"].get(alert_id, (0, None))
+        run["bumps"][alert_id] = (delta + 1, at)
+    elif alert_id is not None:
+        _resolve_alert(cursor, run, alert_id, at)
+        state["alert_id"] = None
+
+
+def _evaluate_point(cursor, run, rule, state, measured_at, value) -> None:
+    last_at, last_value = state["last_at"], state["last_value"]
+    if last_at is None or measured_at > last_at:
+        state["last_at"], state["last_value"] = measured_at, value
+
+    rule_type = rule["RuleType"]
+    if rule_type == "absence":
+        # Any point ends an absence
+        _transition(cursor, run, rule, state, False, measured_at)
+        return
+
+    if rule_type == "threshold":
+        observed = value
+    else:
+        # Rate of change needs an earlier point; late points are ignored
+        if last_at is None or last_value is None or measured_at <= last_at:
+            return
+        elapsed = (measured_at - last_at).total_seconds()
+        observed = (value - last_value) / elapsed * rule["WindowSeconds"]
+
+    breached = COMPARATORS[rule["Comparator"]](observed, rule["Threshold"])
+    _transition(cursor, run, rule, state, breached, measured_at, round(observed, 2))
+
+
+def _finish(cursor, conn, run) -> None:
+    if run["bumps"]:
+        cursor.executemany(
+            """
+            UPDATE SystemAlert
+            SET OccurrenceCount = COALESCE(OccurrenceCount, 0) + %s,
+                LastSeenAt = %s
+            WHERE AlertID = %s
+            """,
+            [(delta, at, alert_id) for alert_id, (delta, at) in run["bumps"].items()],
+        )
+        run["changed"] = True
+    conn.commit()  # type: ignore
+    if run["changed"]:
+        global _seen_generations
+        mark_tables_changed("SystemAlert")
+        # Our own write does not invalidate the in-memory view
+        _seen_generations = table_generations(("AlertRule", "SystemAlert"))
+
+
+def evaluate(points) -> None:
+    """
+    Feed (metric_id, measured_at, value) points through the active rules.
+    Registered as an ingest flush listener; needs an app context.
+    """
+    with _lock:
+        conn = db.get_db()
+        cursor = conn.cursor()  # type: ignore
+        try:
+            _sync(cursor)
+            if not _rules:
+                return
+            run = {"next_alert_id": None, "bumps": {}, "changed": False}
+            for metric_id, measured_at, value in sorted(points, key=lambda p: p[1]):
+                for rule_id in _rules_by_metric.get(metric_id, ()):
+                    _evaluate_point(
+                        cursor, run, _rules[rule_id], _state[rule_id], measured_at, float(value)
+                    )
+            _finish(cursor, conn, run)
+        except Exception:
+            conn.rollback()  # type: ignore
+            raise
+        finally:
+            cursor.close()
+
+
+def check_absence() -> None:
+    """Background entry point: open alerts for metrics that stopped reporting."""
+    with _lock:
+        conn = db.get_db()
+        cursor = conn.cursor()  # type: ignore
+        try:
+            _sync(cursor)
+            now = datetime.now()
+            run = {"next_alert_id": None, "bumps": {}, "changed": False}
+            for rule_id, rule in _rules.items():
+                if rule["RuleType"] != "absence":
+                    continue
+                state = _state[rule_id]
+                silent_for = (now - state["last_at"]).total_seconds()
+                if silent_for > rule["WindowSeconds"]:
+                    _transition(cursor, run, rule, state, True, now)
+            _finish(cursor, conn, run)
+        except Exception:
+            conn.rollback()  # type: ignore
+            raise
+        finally:
+            cursor.close()
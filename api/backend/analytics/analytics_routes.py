@@ -1,5 +1,22 @@
 from flask import Blueprint, request, jsonify, current_app
-from backend.db_connection import db
+from datetime import datetime, timedelta
+from backend.db_connection import db, InstrumentedTupleCursor
+from backend.db_connection.change_markers import mark_tables_changed
+from backend.db_connection.projection import requested_fields, select_list
+from backend.serialization.json_provider import fetch_rows
+from backend.serialization.columnar import rows_route
+from backend.cache.response_cache import cached_response
+from backend.data_quality.checks import CHECKS
+from backend.data_quality.engine import latest_results, run_checks
+from backend.analytics.downsampling import (
+    bucket_aggregate,
+    lttb_indices,
+    series_arrays,
+)
+from backend.analytics.rollups import RESOLUTIONS_BY_NAME, get_watermarks, pick_resolution, read_buckets
+from backend.analytics.ingest import snapshot_buffer
+from backend.analytics.alert_rules import COMPARATORS, RESOLVED_STATUSES, RULE_TYPES
+from backend.analytics.anomalies import DETECTORS, detect_incremental, detect_range
 
 analytics_bp = Blueprint("analytics_bp", __name__)
 
@@ -8,13 +25,14 @@ analytics_bp = Blueprint("analytics_bp", __name__)
 
 
 @analytics_bp.route("/system-metrics", methods=["GET"])
+@rows_route
 def get_system_metrics():
     """
     List all system metrics with their latest snapshot (if any).
     """
     try:
         conn = db.get_db()
-        cursor = conn.cursor() # type: ignore
+        cursor = conn.cursor(InstrumentedTupleCursor) # type: ignore
         query = """
             SELECT sm.MetricID,
                    sm.Name,
@@ -32,7 +50,7 @@ def get_system_metrics():
             ORDER BY sm.MetricID
         """
         cursor.execute(query)
-        rows = cursor.fetchall()
+        rows = fetch_rows(cursor)
         cursor.close()
         return jsonify(rows), 200
     except Exception as e:
@@ -40,42 +58,329 @@ def get_system_metrics():
         return jsonify({"error": str(e)}), 500
 
 
+def _fetch_raw_snapshots(cursor, metric_id, start, end):
+    query = """
+        SELECT SnapshotID, MetricID, MeasuredAt, Value
+        FROM MetricSnapshot
+        WHERE MetricID = %s
+    """
+    params = [metric_id]
+    if start:
+        query += " AND MeasuredAt >= %s"
+        params.append(start)
+    if end:
+        query += " AND MeasuredAt <= %s"
+        params.append(end)
+
+    query += " ORDER BY MeasuredAt"
+    cursor.execute(query, tuple(params))
+    return cursor.fetchall()
+
+
 @analytics_bp.route("/system-metrics/<int:metric_id>/snapshots", methods=["GET"])
 def get_metric_snapshots(metric_id: int):
     """
     Get time series snapshots for a metric.
-    Query params: start (YYYY-MM-DD), end (YYYY-MM-DD)
+    Query params:
+      - start, end (YYYY-MM-DD or ISO datetime)
+      - bucket (optional: 1m | 1h | 1d | auto) -> one row per bucket with
+        BucketStart, Min, Max, Avg, Count, Last. Buckets are read from the
+        rollup tables; only the not-yet-compacted tail is computed from raw
+        snapshots. "auto" picks the finest resolution that keeps the range
+        under max_points buckets (default 500) and is still retained.
+        The chosen resolution is returned in the X-Metric-Resolution header.
+      - max_points (optional, >= 3) -> without bucket: at most max_points raw
+        snapshots, picked with largest-triangle-three-buckets downsampling
+    Without bucket, a start older than the raw retention window
+    (ROLLUP_RETENTION_DAYS_RAW) is answered as bucket=auto, since raw
+    snapshots no longer cover it.
     """
     try:
         start = request.args.get("start")
         end = request.args.get("end")
+        bucket = request.args.get("bucket")
+        max_points = request.args.get("max_points", type=int)
+
+        if bucket and bucket != "auto" and bucket not in RESOLUTIONS_BY_NAME:
+            return jsonify({"error": f"bucket must be one of: {', '.join(RESOLUTIONS_BY_NAME)}, auto"}), 400
+        if max_points is not None and max_points < 3:
+            return jsonify({"error": "max_points must be at least 3"}), 400
+        if bucket and bucket != "auto" and max_points is not None:
+            return jsonify({"error": "max_points can only be combined with bucket=auto"}), 400
+        try:
+            start_dt = datetime.fromisoformat(start) if start else None
+            end_dt = datetime.fromisoformat(end) if end else None
+        except ValueError:
+            return jsonify({"error": "start and end must be ISO dates (YYYY-MM-DD)"}), 400
+
+        now = datetime.now()
+        raw_days = current_app.config.get("ROLLUP_RETENTION_DAYS_RAW", 0)
+        if not bucket and raw_days > 0 and start_dt and start_dt < now - timedelta(days=raw_days):
+            bucket = "auto"
 
         conn = db.get_db()
         cursor = conn.cursor() # type: ignore
-        query = """
-            SELECT SnapshotID, MetricID, MeasuredAt, Value
-            FROM MetricSnapshot
-            WHERE MetricID = %s
-        """
-        params = [metric_id]
-        if start:
-            query += " AND MeasuredAt >= %s"
-            params.append(start) # type: ignore
-        if end:
-            query += " AND MeasuredAt <= %s"
-            params.append(end) # type: ignore
-
-        query += " ORDER BY MeasuredAt"
-        cursor.execute(query, tuple(params))
-        rows = cursor.fetchall()
+
+        if not bucket:
+            rows = _fetch_raw_snapshots(cursor, metric_id, start, end)
+            cursor.close()
+            if max_points is not None and len(rows) > max_points:
+                timestamps, values, kept = series_arrays(rows)
+                picked = kept[lttb_indices(timestamps, values, max_points)]
+                rows = [rows[i] for i in picked]
+            return jsonify(rows), 200, {"X-Metric-Resolution": "raw"}
+
+        if bucket == "auto":
+            start_dt = start_dt or now - timedelta(days=1)
+            end_dt = end_dt or now
+            resolution = pick_resolution(start_dt, end_dt, max_points or 500, now)
+        else:
+            resolution = RESOLUTIONS_BY_NAME[bucket]
+
+        buckets, watermark = read_buckets(cursor, metric_id, resolution, start_dt, end_dt)
+
+        # Buckets at or after the watermark are not compacted yet: build them from raw rows
+        tail_start = max(watermark, start_dt) if watermark and start_dt else (watermark or start_dt)
+        if end_dt is None or tail_start is None or tail_start <= end_dt:
+            raw = _fetch_raw_snapshots(cursor, metric_id, tail_start, end_dt)
+            timestamps, values, _ = series_arrays(raw)
+            buckets += bucket_aggregate(timestamps, values, resolution["seconds"])
         cursor.close()
-        return jsonify(rows), 200
+
+        return jsonify(buckets), 200, {"X-Metric-Resolution": resolution["name"]}
     except Exception as e:
         current_app.logger.error(f"Error in get_metric_snapshots: {e}")
         return jsonify({"error": str(e)}), 500
 
 
+@analytics_bp.route("/system-metrics/anomalies", methods=["GET"])
+def get_metric_anomalies():
+    """
+    Rank anomalous buckets across all metrics.
+    Query params:
+      - bucket (optional: 1m | 1h | 1d, default 1h) -> rollup resolution to score
+      - start, end (optional ISO datetimes) -> buckets to score; default is the
+        last 24 compacted buckets
+      - incremental (optional: true) -> ignore start/end and score the buckets
+        compacted from `since` (ISO datetime: the "through" of the previous
+        response) up to now; without since, the latest bucket. Buckets beyond
+        the per-call limit are skipped and reported under "skipped".
+      - detectors (optional, comma separated: ewma,zscore,seasonal)
+      - threshold (optional, default 3.0) -> minimum score reported
+      - limit (optional, default 50)
+    """
+    try:
+        bucket = request.args.get("bucket", "1h")
+        incremental = request.args.get("incremental", "false").lower() == "true"
+        threshold = request.args.get("threshold", 3.0, type=float)
+        limit = request.args.get("limit", 50, type=int)
+        detectors = [d for d in request.args.get("detectors", ",".join(DETECTORS)).split(",") if d]
+
+        if bucket not in RESOLUTIONS_BY_NAME:
+            return jsonify({"error": f"bucket must be one of: {', '.join(RESOLUTIONS_BY_NAME)}"}), 400
+        unknown = [d for d in detectors if d not in DETECTORS]
+        if unknown or not detectors:
+            return jsonify({"error": f"detectors must be a subset of: {', '.join(DETECTORS)}"}), 400
+        if limit <= 0:
+            return jsonify({"error": "limit must be positive"}), 400
+        try:
+            start_dt = datetime.fromisoformat(request.args["start"]) if "start" in request.args else None
+            end_dt = datetime.fromisoformat(request.args["end"]) if "end" in request.args else None
+            since_dt = datetime.fromisoformat(request.args["since"]) if "since" in request.args else None
+        except ValueError:
+            return jsonify({"error": "start, end and since must be ISO dates (YYYY-MM-DD)"}), 400
+
+        resolution = RESOLUTIONS_BY_NAME[bucket]
+        conn = db.get_db()
+        cursor = conn.cursor() # type: ignore
+
+        if incremental:
+            result = detect_incremental(cursor, resolution, since_dt, detectors, threshold, limit)
+        else:
+            try:
+                result = detect_range(cursor, resolution, start_dt, end_dt, detectors, threshold, limit)
+            except ValueError as e:
+                cursor.close()
+                return jsonify({"error": str(e)}), 400
+        cursor.close()
+
+        return jsonify(result), 200
+    except Exception as e:
+        current_app.logger.error(f"Error in get_metric_anomalies: {e}")
+        return jsonify({"error": str(e)}), 500
+
+
+def _parse_point(point):
+    """
+    Accept {"metric_id", "measured_at", "value"} or [metric_id, measured_at, value].
+    measured_at is an ISO datetime or epoch seconds. Returns a tuple or raises ValueError.
+    """
+    if isinstance(point, dict):
+        metric_id, measured_at, value = (
+            point.get("metric_id"), point.get("measured_at"), point.get("value")
+        )
+    elif isinstance(point, (list, tuple)) and len(point) == 3:
+        metric_id, measured_at, value = point
+    else:
+        raise ValueError("expected an object or a [metric_id, measured_at, value] triple")
+
+    if not isinstance(metric_id, int) or isinstance(metric_id, bool):
+        raise ValueError("metric_id must be an integer")
+    if isinstance(measured_at, (int, float)) and not isinstance(measured_at, bool):
+        measured_at = datetime.fromtimestamp(measured_at)
+    elif isinstance(measured_at, str):
+        measured_at = datetime.fromisoformat(measured_at)
+    else:
+        raise ValueError("measured_at must be an ISO datetime or epoch seconds")
+    if not isinstance(value, (int, float)) or isinstance(value, bool):
+        raise ValueError("value must be a number")
+    if measured_at.tzinfo is not None:
+        measured_at = measured_at.astimezone().replace(tzinfo=None)
+    return metric_id, measured_at.replace(microsecond=0), value
+
+
+@analytics_bp.route("/system-metrics/snapshots:batch", methods=["POST"])
+def ingest_metric_snapshots():
+    """
+    Queue many snapshots in one call.
+    Body: {"points": [{"metric_id": 1, "measured_at": "...", "value": 12.5}, ...]}
+    (points may also be [metric_id, measured_at, value] triples).
+    Points are written asynchronously in multi-row batches; 202 means queued.
+    Responds 422 when a point is older than the 1m rollup watermark (it would
+    never be compacted) and 503 with Retry-After when the ingest buffer is full.
+    """
+    try:
+        data = request.get_json() or {}
+        points = data.get("points")
+        max_batch = current_app.config.get("INGEST_MAX_BATCH_POINTS", 10000)
+
+        if not isinstance(points, list) or not points:
+            return jsonify({"error": "points must be a non-empty list"}), 400
+        if len(points) > max_batch:
+            return jsonify({"error": f"at most {max_batch} points per batch"}), 413
+
+        parsed = []
+        for i, point in enumerate(points):
+            try:
+                parsed.append(_parse_point(point))
+            except (ValueError, TypeError, OverflowError, OSError) as e:
+                return jsonify({"error": f"points[{i}]: {e}"}), 400
+
+        metric_ids = {p[0] for p in parsed}
+        conn = db.get_db()
+        cursor = conn.cursor() # type: ignore
+        known = snapshot_buffer.known_metric_ids(cursor, metric_ids)
+        unknown = sorted(metric_ids - known)
+        if unknown:
+            cursor.close()
+            return jsonify({"error": f"Unknown metric_id(s): {unknown}"}), 400
+
+        # Compaction never goes back behind its watermark: raw points landing
+        # there would be pruned without ever reaching a rollup
+        watermark = get_watermarks(cursor).get("1m")
+        cursor.close()
+        if watermark is not None:
+            late = [i for i, p in enumerate(parsed) if p[1] < watermark]
+            if late:
+                snapshot_buffer.reject_late(len(late))
+                return jsonify({
+                    "error": f"points[{late[0]}]: measured_at is before {watermark.isoformat()}, "
+                             "which is already compacted",
+                    "late_points": len(late),
+                    "watermark": watermark,
+                }), 422
+
+        if not snapshot_buffer.offer(parsed):
+            retry_after = max(1, int(snapshot_buffer.flush_interval))
+            return (
+                jsonify({
+                    "error": "Ingest buffer is full, retry later",
+                    "queue_depth": snapshot_buffer.queue_depth(),
+                }),
+                503,
+                {"Retry-After": str(retry_after)},
+            )
+
+        return jsonify({
+            "accepted": len(parsed),
+            "queue_depth": snapshot_buffer.queue_depth(),
+        }), 202
+    except Exception as e:
+        current_app.logger.error(f"Error in ingest_metric_snapshots: {e}")
+        return jsonify({"error": str(e)}), 500
+
+
+@analytics_bp.route("/system-metrics/snapshots:batch/stats", methods=["GET"])
+def get_ingest_stats():
+    """
+    Ingest buffer health: queue depth/capacity, accepted/rejected/late/flushed/
+    dead-lettered point counts and flush latency (last/avg/max, ms).
+    """
+    try:
+        return jsonify(snapshot_buffer.snapshot_stats()), 200
+    except Exception as e:
+        current_app.logger.error(f"Error in get_ingest_stats: {e}")
+        return jsonify({"error": str(e)}), 500
+
+
+@analytics_bp.route("/system-metrics/snapshots:batch/dead-letters", methods=["GET"])
+def get_ingest_dead_letters():
+    """
+    Points the ingest writer gave up on (oldest first), kept in
+    INGEST_DEAD_LETTER_PATH until replayed.
+    Query params: limit (optional, default 100)
+    """
+    try:
+        limit = request.args.get("limit", 100, type=int)
+        if limit <= 0:
+            return jsonify({"error": "limit must be positive"}), 400
+        points = snapshot_buffer.dead_letters.read(limit)
+        return jsonify({
+            "depth": len(snapshot_buffer.dead_letters),
+            "points": [
+                {"metric_id": m, "measured_at": at, "value": v} for m, at, v in points
+            ],
+        }), 200
+    except Exception as e:
+        current_app.logger.error(f"Error in get_ingest_dead_letters: {e}")
+        return jsonify({"error": str(e)}), 500
+
+
+@analytics_bp.route("/system-metrics/snapshots:batch/dead-letters/replay", methods=["POST"])
+def replay_ingest_dead_letters():
+    """
+    Queue the dead-lettered points for writing again. Points behind the 1m
+    rollup watermark, and any that do not fit in the ingest buffer, stay in
+    the dead letter file.
+    """
+    try:
+        points = snapshot_buffer.dead_letters.take()
+        if not points:
+            return jsonify({"replayed": 0, "late": 0, "remaining": 0}), 200
+
+        conn = db.get_db()
+        cursor = conn.cursor() # type: ignore
+        watermark = get_watermarks(cursor).get("1m")
+        cursor.close()
+        late = [p for p in points if watermark is not None and p[1] < watermark]
+        ready = [p for p in points if watermark is None or p[1] >= watermark]
+
+        replayed = ready if snapshot_buffer.offer(ready) else []
+        kept = late + ([] if replayed else ready)
+        if kept:
+            snapshot_buffer.dead_letters.append(kept)
+        return jsonify({
+            "replayed": len(replayed),
+            "late": len(late),
+            "remaining": len(snapshot_buffer.dead_letters),
+        }), 200
+    except Exception as e:
+        current_app.logger.error(f"Error in replay_ingest_dead_letters: {e}")
+        return jsonify({"error": str(e)}), 500
+
+
 @analytics_bp.route("/system-alerts", methods=["GET"])
+@rows_route
 def get_system_alerts():
     """
     List system alerts with optional filters.
@@ -86,10 +391,11 @@ def get_system_alerts():
         severity = request.args.get("severity")
 
         conn = db.get_db()
-        cursor = conn.cursor() # type: ignore
+        cursor = conn.cursor(InstrumentedTupleCursor) # type: ignore
         query = """
             SELECT AlertID, MetricID, AlertType, Severity,
-                   Message, CreatedAt, ResolvedAt, Status
+                   Message, CreatedAt, ResolvedAt, Status,
+                   RuleID, OccurrenceCount, LastSeenAt
             FROM SystemAlert
             WHERE 1=1
         """
@@ -103,7 +409,7 @@ def get_system_alerts():
 
         query += " ORDER BY CreatedAt DESC"
         cursor.execute(query, tuple(params))
-        rows = cursor.fetchall()
+        rows = fetch_rows(cursor)
         cursor.close()
         return jsonify(rows), 200
     except Exception as e:
@@ -148,6 +454,7 @@ def create_system_alert():
             (alert_id, metric_id, alert_type, severity, message, status),
         )
         conn.commit() # type: ignore
+        mark_tables_changed("SystemAlert")
         cursor.close()
         return jsonify({"message": "System alert created", "alert_id": alert_id}), 201
     except Exception as e:
@@ -166,7 +473,8 @@ def get_system_alert(alert_id: int):
         cursor.execute(
             """
             SELECT AlertID, MetricID, AlertType, Severity,
-                   Message, CreatedAt, ResolvedAt, Status
+                   Message, CreatedAt, ResolvedAt, Status,
+                   RuleID, OccurrenceCount, LastSeenAt
             FROM SystemAlert
             WHERE AlertID = %s
             """,
@@ -212,7 +520,7 @@ def update_system_alert(alert_id: int):
 
         # Auto-set ResolvedAt if status is moving to resolved
         if "status" in data and data.get("resolved_at") is None:
-            if data["status"].lower() in {"resolved", "closed"}:
+            if data["status"].lower() in RESOLVED_STATUSES:
                 updates.append("ResolvedAt = NOW()")
 
         if not updates:
@@ -229,6 +537,7 @@ def update_system_alert(alert_id: int):
         """
         cursor.execute(query, tuple(params))
         conn.commit() # type: ignore
+        mark_tables_changed("SystemAlert")
         affected = cursor.rowcount
         cursor.close()
 
@@ -241,81 +550,264 @@ def update_system_alert(alert_id: int):
         return jsonify({"error": str(e)}), 500
 
 
-# --------------- Data Quality & Analytics --------------------
+_RULE_FIELDS = {
+    "metric_id": "MetricID",
+    "name": "Name",
+    "rule_type": "RuleType",
+    "comparator": "Comparator",
+    "threshold": "Threshold",
+    "window_seconds": "WindowSeconds",
+    "severity": "Severity",
+    "is_active": "IsActive",
+}
+
+
+def _validate_rule(rule):
+    """Return an error message if the merged rule fields are inconsistent."""
+    if rule.get("rule_type") not in RULE_TYPES:
+        return f"rule_type must be one of: {', '.join(RULE_TYPES)}"
+    if rule["rule_type"] != "absence":
+        if rule.get("comparator") not in COMPARATORS:
+            return f"comparator must be one of: {', '.join(COMPARATORS)}"
+        threshold = rule.get("threshold")
+        if not isinstance(threshold, (int, float)) or isinstance(threshold, bool):
+            return "threshold must be a number"
+    if rule["rule_type"] != "threshold":
+        window = rule.get("window_seconds")
+        if not isinstance(window, int) or isinstance(window, bool) or window <= 0:
+            return "window_seconds must be a positive integer"
+    return None
+
+
+@analytics_bp.route("/alert-rules", methods=["GET"])
+@rows_route
+def get_alert_rules():
+    """
+    List alert rules.
+    Query params:
+      - metric_id (optional)
+      - active (optional: true/false)
+    """
+    try:
+        metric_id = request.args.get("metric_id", type=int)
+        active = request.args.get("active")
 
+        conn = db.get_db()
+        cursor = conn.cursor(InstrumentedTupleCursor) # type: ignore
+        query = """
+            SELECT RuleID, MetricID, Name, RuleType, Comparator,
+                   Threshold, WindowSeconds, Severity, IsActive
+            FROM AlertRule
+            WHERE 1=1
+        """
+        params = []
+        if metric_id is not None:
+            query += " AND MetricID = %s"
+            params.append(metric_id)
+        if active is not None:
+            query += " AND IsActive = %s"
+            params.append(1 if active.lower() == "true" else 0)
+
+        query += " ORDER BY RuleID"
+        cursor.execute(query, tuple(params))
+        rows = fetch_rows(cursor)
+        cursor.close()
+        return jsonify(rows), 200
+    except Exception as e:
+        current_app.logger.error(f"Error in get_alert_rules: {e}")
+        return jsonify({"error": str(e)}), 500
 
-@analytics_bp.route("/data-quality-reports", methods=["GET"])
-def get_data_quality_report():
+
+@analytics_bp.route("/alert-rules", methods=["POST"])
+def create_alert_rule():
     """
-    Return a simple data quality report with some aggregate checks.
+    Create an alert rule evaluated against ingested snapshots.
+    Body JSON: {metric_id, rule_type, name?, comparator?, threshold?,
+                window_seconds?, severity?}
+      - threshold: value <comparator> threshold
+      - rate_of_change: change per window_seconds <comparator> threshold
+      - absence: no snapshot for window_seconds
     """
     try:
+        data = request.get_json() or {}
+        if "metric_id" not in data:
+            return jsonify({"error": "Missing required fields: metric_id"}), 400
+        error = _validate_rule(data)
+        if error:
+            return jsonify({"error": error}), 400
+
         conn = db.get_db()
         cursor = conn.cursor() # type: ignore
 
-        report = {}
+        cursor.execute("SELECT COALESCE(MAX(RuleID), 0) + 1 AS next_id FROM AlertRule")
+        rule_id = cursor.fetchone()["next_id"]
 
-        # Orphan inventory items (should be 0 because of FK)
         cursor.execute(
             """
-            SELECT COUNT(*) AS cnt
-            FROM InventoryItem ii
-            LEFT JOIN Ingredient i ON ii.IngredientID = i.IngredientID
-            WHERE i.IngredientID IS NULL
-            """
+            INSERT INTO AlertRule
+                (RuleID, MetricID, Name, RuleType, Comparator,
+                 Threshold, WindowSeconds, Severity, IsActive)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, 1)
+            """,
+            (
+                rule_id,
+                data["metric_id"],
+                data.get("name") or f"{RULE_TYPES[data['rule_type']]} rule {rule_id}",
+                data["rule_type"],
+                data.get("comparator"),
+                data.get("threshold"),
+                data.get("window_seconds"),
+                data.get("severity", "Medium"),
+            ),
         )
-        orphan_inventory = cursor.fetchone()
-        report["orphan_inventory_items"] = orphan_inventory["cnt"]
+        conn.commit() # type: ignore
+        mark_tables_changed("AlertRule")
+        cursor.close()
+        return jsonify({"message": "Alert rule created", "rule_id": rule_id}), 201
+    except Exception as e:
+        current_app.logger.error(f"Error in create_alert_rule: {e}")
+        return jsonify({"error": str(e)}), 500
 
-        # Recipes without ingredients
+
+@analytics_bp.route("/alert-rules/<int:rule_id>", methods=["PUT"])
+def update_alert_rule(rule_id: int):
+    """
+    Update an alert rule, e.g. change its threshold or set is_active false.
+    Body JSON: any of {metric_id, name, rule_type, comparator, threshold,
+                       window_seconds, severity, is_active}
+    """
+    try:
+        data = request.get_json() or {}
+        updates = {k: v for k, v in data.items() if k in _RULE_FIELDS}
+        if not updates:
+            return jsonify({"error": "No updatable fields provided"}), 400
+
+        conn = db.get_db()
+        cursor = conn.cursor() # type: ignore
         cursor.execute(
             """
-            SELECT COUNT(*) AS cnt
-            FROM Recipe r
-            LEFT JOIN RecipeIngredient ri ON r.RecipeId = ri.RecipeID
-            WHERE ri.RecipeID IS NULL
-            """
+            SELECT MetricID AS metric_id, RuleType AS rule_type,
+                   Comparator AS comparator, Threshold AS threshold,
+                   WindowSeconds AS window_seconds
+            FROM AlertRule
+            WHERE RuleID = %s
+            """,
+            (rule_id,),
         )
-        recipes_without_ingredients = cursor.fetchone()
-        report["recipes_without_ingredients"] = recipes_without_ingredients["cnt"]
-
-        # Ingredients never used in recipes
+        current = cursor.fetchone()
+        if not current:
+            cursor.close()
+            return jsonify({"error": "Alert rule not found"}), 404
+
+        if current["threshold"] is not None:
+            current["threshold"] = float(current["threshold"])
+        error = _validate_rule({**current, **updates})
+        if error:
+            cursor.close()
+            return jsonify({"error": error}), 400
+
+        if "is_active" in updates:
+            updates["is_active"] = 1 if updates["is_active"] else 0
+        set_clause = ", ".join(f"{_RULE_FIELDS[k]} = %s" for k in updates)
         cursor.execute(
-            """
-            SELECT COUNT(*) AS cnt
-            FROM Ingredient i
-            LEFT JOIN RecipeIngredient ri ON i.IngredientID = ri.IngredientID
-            WHERE ri.IngredientID IS NULL
-            """
+            f"UPDATE AlertRule SET {set_clause} WHERE RuleID = %s",
+            (*updates.values(), rule_id),
         )
-        unused_ingredients = cursor.fetchone()
-        report["unused_ingredients"] = unused_ingredients["cnt"]
-
+        conn.commit() # type: ignore
+        mark_tables_changed("AlertRule")
         cursor.close()
+        return jsonify({"message": "Alert rule updated"}), 200
+    except Exception as e:
+        current_app.logger.error(f"Error in update_alert_rule: {e}")
+        return jsonify({"error": str(e)}), 500
+
+
+# --------------- Data Quality & Analytics --------------------
+
+
+@analytics_bp.route("/data-quality-reports", methods=["GET"])
+def get_data_quality_report():
+    """
+    Return the latest persisted result of every data quality check.
+    Checks are refreshed in the background when their tables change;
+    only checks that have never run are computed inline.
+
+    Response: {<check_name>: issue_count, ..., "checks": [...]}
+    """
+    try:
+        results = latest_results()
+        missing = [name for name in CHECKS if name not in {r["name"] for r in results}]
+        if missing:
+            run_checks(missing, force=True)
+            results = latest_results()
+
+        report = {r["name"]: r["issue_count"] for r in results}
+        report["checks"] = results
         return jsonify(report), 200
     except Exception as e:
         current_app.logger.error(f"Error in get_data_quality_report: {e}")
         return jsonify({"error": str(e)}), 500
 
 
+@analytics_bp.route("/data-quality-reports/recheck", methods=["POST"])
+def recheck_data_quality():
+    """
+    Re-run data quality checks right now, regardless of change markers.
+    Body JSON (optional): {checks: [check_name, ...]}  (default: all checks)
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        names = data.get("checks") or list(CHECKS)
+        unknown = [n for n in names if n not in CHECKS]
+        if unknown:
+            return jsonify({"error": f"Unknown checks: {', '.join(unknown)}"}), 400
+
+        ran = run_checks(names, force=True)
+        results = [r for r in latest_results() if r["name"] in ran]
+        return jsonify({"message": "Data quality checks re-run", "checks": results}), 200
+    except Exception as e:
+        current_app.logger.error(f"Error in recheck_data_quality: {e}")
+        return jsonify({"error": str(e)}), 500
+
+# ?fields= of the aggregated statistics routes: field -> SQL expression
+WASTE_STATISTIC_FIELDS = {
+    "IngredientID": "ws.IngredientID",
+    "CategoryID": "i.CategoryID",
+    "CategoryName": "c.CategoryName",
+    "TotalWastedAmount": "SUM(ws.WastedAmount)",
+    "AvgWasteRatePercent": "AVG(ws.WasteRatePercent)",
+}
+RECIPE_USAGE_STATISTIC_FIELDS = {
+    "RecipeID": "rus.RecipeID",
+    "Name": "r.Name",
+    "TotalUsageCount": "SUM(rus.UsageCount)",
+    "TotalUniqueUsers": "SUM(rus.UniqueUsers)",
+}
+
+
+# The statistics tables are only loaded outside the API, so their tags never
+# move: these entries are bounded by TTL alone and send no ETag
 @analytics_bp.route("/waste-statistics", methods=["GET"])
+@cached_response("WasteStatistic", "Ingredient", "Category", conditional=False)
+@rows_route
 def get_waste_statistics():
     """
     Aggregated food waste statistics.
-    Query params: period_id (optional), segment_id (optional)
+    Query params: period_id (optional), segment_id (optional), fields (optional)
     """
     try:
         period_id = request.args.get("period_id", type=int)
         segment_id = request.args.get("segment_id", type=int)
 
+        try:
+            fields = requested_fields(WASTE_STATISTIC_FIELDS)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
         conn = db.get_db()
-        cursor = conn.cursor() # type: ignore
-        query = """
-            SELECT ws.IngredientID,
-                   i.CategoryID,
-                   c.CategoryName,
-                   SUM(ws.WastedAmount) AS TotalWastedAmount,
-                   AVG(ws.WasteRatePercent) AS AvgWasteRatePercent
+        cursor = conn.cursor(InstrumentedTupleCursor) # type: ignore
+        query = f"""
+            SELECT {select_list(WASTE_STATISTIC_FIELDS, fields)}
             FROM WasteStatistic ws
             LEFT JOIN Ingredient i ON ws.IngredientID = i.IngredientID
             LEFT JOIN Category c ON i.CategoryID = c.CategoryID
@@ -331,10 +823,10 @@ def get_waste_statistics():
 
         query += """
             GROUP BY ws.IngredientID, i.CategoryID, c.CategoryName
-            ORDER BY TotalWastedAmount DESC
+            ORDER BY SUM(ws.WastedAmount) DESC
         """
         cursor.execute(query, tuple(params))
-        rows = cursor.fetchall()
+        rows = fetch_rows(cursor)
         cursor.close()
         return jsonify(rows), 200
     except Exception as e:
@@ -343,22 +835,26 @@ def get_waste_statistics():
 
 
 @analytics_bp.route("/recipe-usage-statistics", methods=["GET"])
+@cached_response("RecipeUsageStatistic", "Recipe", conditional=False)
+@rows_route
 def get_recipe_usage_statistics():
     """
     Aggregated recipe usage statistics.
-    Query params: period_id (optional), segment_id (optional)
+    Query params: period_id (optional), segment_id (optional), fields (optional)
     """
     try:
         period_id = request.args.get("period_id", type=int)
         segment_id = request.args.get("segment_id", type=int)
 
+        try:
+            fields = requested_fields(RECIPE_USAGE_STATISTIC_FIELDS)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
         conn = db.get_db()
-        cursor = conn.cursor() # type: ignore
-        query = """
-            SELECT rus.RecipeID,
-                   r.Name,
-                   SUM(rus.UsageCount) AS TotalUsageCount,
-                   SUM(rus.UniqueUsers) AS TotalUniqueUsers
+        cursor = conn.cursor(InstrumentedTupleCursor) # type: ignore
+        query = f"""
+            SELECT {select_list(RECIPE_USAGE_STATISTIC_FIELDS, fields)}
             FROM RecipeUsageStatistic rus
             JOIN Recipe r ON rus.RecipeID = r.RecipeId
             WHERE 1=1
@@ -373,10 +869,10 @@ def get_recipe_usage_statistics():
 
         query += """
             GROUP BY rus.RecipeID, r.Name
-            ORDER BY TotalUsageCount DESC
+            ORDER BY SUM(rus.UsageCount) DESC
         """
         cursor.execute(query, tuple(params))
-        rows = cursor.fetchall()
+        rows = fetch_rows(cursor)
         cursor.close()
         return jsonify(rows), 200
     except Exception as e:
@@ -385,13 +881,15 @@ def get_recipe_usage_statistics():
 
 
 @analytics_bp.route("/demographic-segments", methods=["GET"])
+@cached_response("DemographicSegment")
+@rows_route
 def get_demographic_segments():
     """
     Get all demographic segments.
     """
     try:
         conn = db.get_db()
-        cursor = conn.cursor() # type: ignore
+        cursor = conn.cursor(InstrumentedTupleCursor) # type: ignore
         cursor.execute(
             """
             SELECT SegmentID, Name, AgeMin, AgeMax, Region
@@ -399,7 +897,7 @@ def get_demographic_segments():
             ORDER BY SegmentID
             """
         )
-        rows = cursor.fetchall()
+        rows = fetch_rows(cursor)
         cursor.close()
         return jsonify(rows), 200
     except Exception as e:
@@ -408,6 +906,7 @@ def get_demographic_segments():
 
 
 @analytics_bp.route("/analytics/reports", methods=["GET"])
+@cached_response("WasteStatistic", "RecipeUsageStatistic", conditional=False)
 def get_analytics_report():
     """
     High-level analytics summary combining waste and usage for a time period.
@@ -0,0 +1,386 @@
+#------------------------------------------------------------
+# Anomaly detection across all metrics at once.
+#
+# Compacted rollup buckets are laid out as a (metrics x buckets)
+# matrix and scored column by column with three detectors:
+#   - ewma:     distance from an exponentially weighted mean,
+#               in exponentially weighted standard deviations
+#   - zscore:   distance from the mean of the previous `window`
+#               buckets, in their standard deviations
+#   - seasonal: distance from the median of the same bucket in
+#               the previous SEASONS seasons, in scaled MADs
+# Every detector is vectorized over metrics, so adding metrics
+# adds rows rather than queries or Python loops.
+#
+# Incremental runs are driven by a cursor the client keeps: a
+# call with since=<through of the previous response> scores the
+# buckets compacted after it. The detector state reached at each
+# cursor (last `window` buckets, EWMA per metric) is remembered
+# for a few cursors, so a follow-up call only reads the new
+# buckets; any other cursor is rebuilt from the rollup table.
+# Retries and several consumers therefore all get full results.
+#------------------------------------------------------------
+import threading
+import warnings
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from backend.analytics.rollups import floor_to, get_watermarks
+
+
+# Per resolution: rolling window and season length, both in buckets
+DETECTOR_SETTINGS = {
+    "1m": {"window": 60, "season": 1440},
+    "1h": {"window": 24, "season": 24},
+    "1d": {"window": 14, "season": 7},
+}
+DETECTORS = ("ewma", "zscore", "seasonal")
+
+EWMA_ALPHA = 0.1
+SEASONS = 4
+# Observations a detector needs before it scores anything
+MIN_PERIODS = 5
+# Scale floor relative to the baseline, so flat series do not score infinitely
+MIN_SCALE_FRACTION = 0.01
+# Buckets scored by default and at most in one call
+DEFAULT_SCORED_BUCKETS = 24
+MAX_SCORED_BUCKETS = 1440
+
+# Detector states remembered for follow-up incremental calls
+MAX_CACHED_STATES = 16
+
+_incremental_lock = threading.Lock()
+# (resolution name, through) -> {"metric_ids", "history", "ewma"}
+_incremental: OrderedDict = OrderedDict()
+
+
+# --------------- loading --------------------
+
+
+def load_metric_ids(cursor) -> np.ndarray:
+    cursor.execute("SELECT MetricID FROM SystemMetric ORDER BY MetricID")
+    return np.array([row["MetricID"] for row in cursor.fetchall()], dtype=np.int64)
+
+
+def fetch_matrix(cursor, resolution, metric_ids, start: datetime, count: int) -> np.ndarray:
+    """
+    Average value of every metric for `count` buckets starting at `start`,
+    as a (len(metric_ids) x count) float matrix with NaN for missing buckets.
+    """
+    matrix = np.full((metric_ids.size, count), np.nan)
+    if count <= 0 or metric_ids.size == 0:
+        return matrix
+
+    seconds = resolution["seconds"]
+    cursor.execute(
+        f"""
+        SELECT MetricID, BucketStart, SumValue / SampleCount AS AvgValue
+        FROM {resolution['table']}
+        WHERE BucketStart >= %s AND BucketStart < %s AND SampleCount > 0
+        """,
+        (start, start + timedelta(seconds=seconds * count)),
+    )
+    rows = cursor.fetchall()
+    if not rows:
+        return matrix
+
+    ids = np.array([r["MetricID"] for r in rows], dtype=np.int64)
+    epochs = np.array([r["BucketStart"] for r in rows], dtype="datetime64[s]").astype(np.int64)
+    values = np.array([r["AvgValue"] for r in rows], dtype=np.float64)
+
+    row_idx = np.searchsorted(metric_ids, ids)
+    known = (row_idx < metric_ids.size) & (metric_ids[np.minimum(row_idx, metric_ids.size - 1)] == ids)
+    start_epoch = np.datetime64(start, "s").astype(np.int64)
+    col_idx = (epochs - start_epoch) // seconds
+
+    matrix[row_idx[known], col_idx[known]] = values[known]
+    return matrix
+
+
+def fetch_seasonal_lags(cursor, resolution, metric_ids, start: datetime, count: int) -> np.ndarray:
+    """Same-phase buckets of the previous SEASONS seasons: (SEASONS x metrics x count)."""
+    period = DETECTOR_SETTINGS[resolution["name"]]["season"] * resolution["seconds"]
+    return np.stack([
+        fetch_matrix(cursor, resolution, metric_ids, start - timedelta(seconds=period * k), count)
+        for k in range(1, SEASONS + 1)
+    ])
+
+
+# --------------- detectors --------------------
+
+
+def _scale_floor(baseline):
+    return np.maximum(np.abs(np.nan_to_num(baseline)) * MIN_SCALE_FRACTION, 1e-9)
+
+
+def new_ewma_state(rows: int) -> dict:
+    return {
+        "mean": np.full(rows, np.nan),
+        "var": np.zeros(rows),
+        "count": np.zeros(rows, dtype=np.int64),
+    }
+
+
+def ewma_scores(matrix, state):
+    """
+    Score each column against the EWMA state before it, then fold it in.
+    Updates state in place; returns (scores, expected) matrices.
+    """
+    scores = np.full(matrix.shape, np.nan)
+    expected = np.full(matrix.shape, np.nan)
+    mean, var, count = state["mean"], state["var"], state["count"]
+
+    for j in range(matrix.shape[1]):
+        x = matrix[:, j]
+        seen = ~np.isnan(x)
+        ready = seen & (count >= MIN_PERIODS)
+        scale = np.maximum(np.sqrt(var), _scale_floor(mean))
+        scores[ready, j] = np.abs(x[ready] - mean[ready]) / scale[ready]
+        expected[:, j] = mean
+
+        first = seen & np.isnan(mean)
+        mean[first] = x[first]
+        update = seen & ~first
+        diff = x[update] - mean[update]
+        incr = EWMA_ALPHA * diff
+        mean[update] += incr
+        var[update] = (1 - EWMA_ALPHA) * (var[update] + diff * incr)
+        count[seen] += 1
+    return scores, expected
+
+
+def rolling_zscores(history, targets, window: int):
+    """
+    Score each target column against the `window` columns before it.
+    history holds at least the `window` columns preceding targets.
+    """
+    combined = np.concatenate([history[:, -window:], targets], axis=1)
+    pad = window - min(window, history.shape[1])
+    if pad:
+        combined = np.concatenate([np.full((combined.shape[0], pad), np.nan), combined], axis=1)
+
+    valid = ~np.isnan(combined)
+    # Center each row for numerically stable sums of squares
+    offset = np.zeros(combined.shape[0])
+    has_data = valid.any(axis=1)
+    offset[has_data] = np.nanmedian(combined[has_data], axis=1)
+    centered = np.where(valid, combined - offset[:, None], 0.0)
+
+    zeros = np.zeros((combined.shape[0], 1))
+    csum = np.concatenate([zeros, np.cumsum(centered, axis=1)], axis=1)
+    csq = np.concatenate([zeros, np.cumsum(centered ** 2, axis=1)], axis=1)
+    ccount = np.concatenate([zeros, np.cumsum(valid, axis=1)], axis=1)
+
+    n = targets.shape[1]
+    lo, hi = np.arange(n), np.arange(n) + window
+    count = ccount[:, hi] - ccount[:, lo]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = (csum[:, hi] - csum[:, lo]) / count
+        var = np.maximum((csq[:, hi] - csq[:, lo]) / count - mean ** 2, 0.0)
+        expected = mean + offset[:, None]
+        scale = np.maximum(np.sqrt(var), _scale_floor(expected))
+        scores = np.abs(targets - expected) / scale
+    scores[count < MIN_PERIODS] = np.nan
+    return scores, expected
+
+
+def seasonal_scores(targets, lags):
+    """Score targets against the median and MAD of their seasonal lags."""
+    enough = np.sum(~np.isnan(lags), axis=0) >= 2
+    with warnings.catch_warnings():
+        # All-NaN slices (no seasonal history yet) are expected
+        warnings.simplefilter("ignore", RuntimeWarning)
+        baseline = np.nanmedian(lags, axis=0)
+        mad = np.nanmedian(np.abs(lags - baseline), axis=0) * 1.4826
+        scale = np.maximum(np.nan_to_num(mad), _scale_floor(baseline))
+        scores = np.abs(targets - baseline) / scale
+    scores[~enough] = np.nan
+    return scores, baseline
+
+
+def rank_anomalies(metric_ids, start: datetime, seconds: int, targets, results, threshold, limit):
+    """
+    results: {detector: (scores, expected)} for the target matrix.
+    Returns one dict per (metric, bucket) whose best score >= threshold,
+    highest first.
+    """
+    names = list(results)
+    stacked = np.stack([results[n][0] for n in names])
+    filled = np.where(np.isnan(stacked), -np.inf, stacked)
+    best = filled.max(axis=0)
+    best_detector = filled.argmax(axis=0)
+
+    rows, cols = np.nonzero(best >= threshold)
+    order = np.argsort(-best[rows, cols], kind="stable")[:limit]
+
+    anomalies = []
+    for i in order:
+        r, c = rows[i], cols[i]
+        detector = names[best_detector[r, c]]
+        anomalies.append({
+            "MetricID": int(metric_ids[r]),
+            "BucketStart": start + timedelta(seconds=seconds * int(c)),
+            "Value": round(float(targets[r, c]), 4),
+            "Score": round(float(best[r, c]), 3),
+            "Detector": detector,
+            "Expected": round(float(results[detector][1][r, c]), 4),
+            "Scores": {
+                n: (None if np.isnan(results[n][0][r, c]) else round(float(results[n][0][r, c]), 3))
+                for n in names
+            },
+        })
+    return anomalies
+
+
+def _score(history, targets, lags, ewma_state, resolution, detectors):
+    window = DETECTOR_SETTINGS[resolution["name"]]["window"]
+    results = {}
+    # Always advance the EWMA so incremental state stays current
+    ewma = ewma_scores(targets, ewma_state)
+    if "ewma" in detectors:
+        results["ewma"] = ewma
+    if "zscore" in detectors:
+        results["zscore"] = rolling_zscores(history, targets, window)
+    if "seasonal" in detectors:
+        results["seasonal"] = seasonal_scores(targets, lags)
+    return results
+
+
+# --------------- entry points --------------------
+
+
+def detect_range(cursor, resolution, start=None, end=None, detectors=DETECTORS,
+                 threshold=3.0, limit=50) -> dict:
+    """
+    Score every compacted bucket in [start, end) for all metrics.
+    Defaults to the last DEFAULT_SCORED_BUCKETS compacted buckets.
+    Raises ValueError if more than MAX_SCORED_BUCKETS would be scored.
+    """
+    seconds = resolution["seconds"]
+    window = DETECTOR_SETTINGS[resolution["name"]]["window"]
+    watermark = get_watermarks(cursor).get(resolution["name"])
+    if watermark is None:
+        return {"resolution": resolution["name"], "from": None, "through": None, "anomalies": []}
+
+    end = min(end, watermark) if end else watermark
+    start = floor_to(start, seconds) if start else end - timedelta(seconds=seconds * DEFAULT_SCORED_BUCKETS)
+    count = max(int((end - start).total_seconds()) // seconds, 0)
+    if count > MAX_SCORED_BUCKETS:
+        raise ValueError(f"at most {MAX_SCORED_BUCKETS} buckets can be scored per call")
+
+    metric_ids = load_metric_ids(cursor)
+    history_start = start - timedelta(seconds=seconds * window)
+    history = fetch_matrix(cursor, resolution, metric_ids, history_start, window)
+    targets = fetch_matrix(cursor, resolution, metric_ids, start, count)
+    lags = fetch_seasonal_lags(cursor, resolution, metric_ids, start, count)
+
+    # Warm the EWMA up on the history window so the first targets are scored
+    ewma_state = new_ewma_state(metric_ids.size)
+    ewma_scores(history, ewma_state)
+
+    results = _score(history, targets, lags, ewma_state, resolution, detectors)
+    return {
+        "resolution": resolution["name"],
+        "from": start,
+        "through": start + timedelta(seconds=seconds * count),
+        "anomalies": rank_anomalies(metric_ids, start, seconds, targets, results, threshold, limit),
+    }
+
+
+def _realign(state, metric_ids) -> dict:
+    """A copy of `state` laid out for a new metric id list (new metrics start empty)."""
+    old_ids = state["metric_ids"]
+    if np.array_equal(old_ids, metric_ids):
+        return {
+            "metric_ids": metric_ids,
+            "history": state["history"].copy(),
+            "ewma": {key: values.copy() for key, values in state["ewma"].items()},
+        }
+    history = np.full((metric_ids.size, state["history"].shape[1]), np.nan)
+    ewma = new_ewma_state(metric_ids.size)
+    if old_ids.size == 0:
+        return {"metric_ids": metric_ids, "history": history, "ewma": ewma}
+
+    pos = np.searchsorted(old_ids, metric_ids)
+    pos_clipped = np.minimum(pos, old_ids.size - 1)
+    kept = (pos < old_ids.size) & (old_ids[pos_clipped] == metric_ids)
+    history[kept] = state["history"][pos_clipped[kept]]
+    for key in ewma:
+        ewma[key][kept] = state["ewma"][key][pos_clipped[kept]]
+    return {"metric_ids": metric_ids, "history": history, "ewma": ewma}
+
+
+def _state_at(cursor, resolution, metric_ids, through) -> dict:
+    """Detector state after the bucket before `through`: remembered, or rebuilt from rollups."""
+    seconds = resolution["seconds"]
+    window = DETECTOR_SETTINGS[resolution["name"]]["window"]
+    with _incremental_lock:
+        state = _incremental.get((resolution["name"], through))
+    if state is not None:
+        return _realign(state, metric_ids)
+
+    history = fetch_matrix(
+        cursor, resolution, metric_ids, through - timedelta(seconds=seconds * window), window
+    )
+    ewma_state = new_ewma_state(metric_ids.size)
+    ewma_scores(history, ewma_state)
+    return {"metric_ids": metric_ids, "history": history, "ewma": ewma_state}
+
+
+def _remember_state(name, through, state) -> None:
+    with _incremental_lock:
+        _incremental[(name, through)] = state
+        _incremental.move_to_end((name, through))
+        while len(_incremental) > MAX_CACHED_STATES:
+            _incremental.popitem(last=False)
+
+
+def detect_incremental(cursor, resolution, since=None, detectors=DETECTORS,
+                       threshold=3.0, limit=50) -> dict:
+    """
+    Score the buckets compacted from `since` (the "through" of a previous
+    call) up to the watermark. Without `since` only the latest compacted
+    bucket is scored. Nothing is consumed: repeating a call gives the same
+    answer. If more than MAX_SCORED_BUCKETS are pending, the oldest are
+    skipped and reported under "skipped".
+    """
+    seconds = resolution["seconds"]
+    window = DETECTOR_SETTINGS[resolution["name"]]["window"]
+
+    watermark = get_watermarks(cursor).get(resolution["name"])
+    if watermark is None:
+        return {"resolution": resolution["name"], "from": None, "through": None,
+                "skipped": None, "anomalies": []}
+
+    start = floor_to(since, seconds) if since else watermark - timedelta(seconds=seconds)
+    skipped = None
+    count = int((watermark - start).total_seconds()) // seconds
+    if count > MAX_SCORED_BUCKETS:
+        # Too far behind: skip ahead instead of scoring a huge backlog, and say so
+        skipped_until = watermark - timedelta(seconds=seconds * MAX_SCORED_BUCKETS)
+        skipped = {"from": start, "through": skipped_until}
+        start = skipped_until
+        count = MAX_SCORED_BUCKETS
+    if count <= 0:
+        return {"resolution": resolution["name"], "from": start, "through": start,
+                "skipped": None, "anomalies": []}
+
+    metric_ids = load_metric_ids(cursor)
+    state = _state_at(cursor, resolution, metric_ids, start)
+    targets = fetch_matrix(cursor, resolution, metric_ids, start, count)
+    lags = fetch_seasonal_lags(cursor, resolution, metric_ids, start, count)
+    results = _score(state["history"], targets, lags, state["ewma"], resolution, detectors)
+
+    through = start + timedelta(seconds=seconds * count)
+    state["history"] = np.concatenate([state["history"], targets], axis=1)[:, -window:]
+    _remember_state(resolution["name"], through, state)
+
+    return {
+        "resolution": resolution["name"],
+        "from": start,
+        "through": through,
+        "skipped": skipped,
+        "anomalies": rank_anomalies(metric_ids, start, seconds, targets, results, threshold, limit),
+    }
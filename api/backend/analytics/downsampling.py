@@ -0,0 +1,95 @@
+#------------------------------------------------------------
+# Server-side reduction of MetricSnapshot series so chart
+# payloads stay bounded no matter how dense the raw data is.
+#------------------------------------------------------------
+import numpy as np
+
+
+def series_arrays(rows, time_key="MeasuredAt", value_key="Value"):
+    """
+    Turn fetched rows (ordered by time) into (epoch_seconds, values, kept_index)
+    arrays. Rows with a NULL timestamp or value are dropped; kept_index maps
+    array positions back to the original rows.
+    """
+    kept = [
+        i for i, r in enumerate(rows)
+        if r[time_key] is not None and r[value_key] is not None
+    ]
+    timestamps = np.array(
+        [rows[i][time_key] for i in kept], dtype="datetime64[s]"
+    ).astype(np.int64)
+    values = np.array([rows[i][value_key] for i in kept], dtype=np.float64)
+    return timestamps, values, np.array(kept, dtype=np.int64)
+
+
+def bucket_aggregate(timestamps, values, bucket_seconds: int) -> list[dict]:
+    """
+    Aggregate a time-ordered series into fixed-width buckets.
+    Returns one dict per non-empty bucket with min/max/avg/count/last.
+    """
+    if timestamps.size == 0:
+        return []
+
+    bucket_ids = timestamps // bucket_seconds
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(bucket_ids)) + 1))
+    ends = np.append(starts[1:], timestamps.size)
+
+    counts = ends - starts
+    mins = np.minimum.reduceat(values, starts)
+    maxs = np.maximum.reduceat(values, starts)
+    avgs = np.add.reduceat(values, starts) / counts
+    lasts = values[ends - 1]
+    bucket_starts = (bucket_ids[starts] * bucket_seconds).astype("datetime64[s]").tolist()
+
+    return [
+        {
+            "BucketStart": bucket_starts[i],
+            "Min": float(mins[i]),
+            "Max": float(maxs[i]),
+            "Avg": round(float(avgs[i]), 4),
+            "Count": int(counts[i]),
+            "Last": float(lasts[i]),
+        }
+        for i in range(starts.size)
+    ]
+
+
+def lttb_indices(x, y, threshold: int):
+    """
+    Largest-Triangle-Three-Buckets downsampling.
+    Returns the indices of at most `threshold` points that preserve the visual
+    shape of the series. First and last points are always kept.
+    """
+    n = x.size
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = x.astype(np.float64)
+    # Bucket edges for the n - 2 interior points, split into threshold - 2 buckets
+    edges = np.floor(np.linspace(1, n - 1, threshold - 1)).astype(np.int64)
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+
+        # Average point of the next bucket (or the final point for the last bucket)
+        if i + 2 < edges.size:
+            nlo, nhi = edges[i + 1], edges[i + 2]
+            avg_x = x[nlo:nhi].mean()
+            avg_y = y[nlo:nhi].mean()
+        else:
+            avg_x, avg_y = x[n - 1], y[n - 1]
+
+        # Triangle areas (x2) between the previous pick, each candidate and the next average
+        areas = np.abs(
+            (x[a] - avg_x) * (y[lo:hi] - y[a])
+            - (x[a] - x[lo:hi]) * (avg_y - y[a])
+        )
+        a = lo + int(np.argmax(areas))
+        selected[i + 1] = a
+
+    return selected
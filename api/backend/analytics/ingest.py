@@ -0,0 +1,338 @@
+#------------------------------------------------------------
+# Buffered ingestion of MetricSnapshot points.
+#
+# POST /system-metrics/snapshots:batch hands points to the
+# shared `snapshot_buffer`; a single background writer drains
+# it with multi-row INSERTs once enough points are queued or
+# the flush interval has passed. When the buffer is full new
+# batches are rejected (the route answers 503) instead of
+# growing memory without bound. A batch that fails to write is
+# retried with exponential backoff (up to
+# INGEST_MAX_BACKOFF_SECONDS between attempts). Only once it has
+# failed INGEST_MAX_FLUSH_ATTEMPTS times over at least
+# INGEST_DEAD_LETTER_AFTER_SECONDS is it moved to a dead letter
+# queue, so a short database blip never costs a batch, and a
+# poison batch cannot block the points behind it forever.
+#
+# Dead letters are appended to INGEST_DEAD_LETTER_PATH as JSON
+# lines, so they survive a restart; they can be listed and
+# replayed through /system-metrics/snapshots:batch/dead-letters.
+# Points beyond INGEST_DEAD_LETTER_MAX_POINTS are not kept but
+# counted (dead_letter_overflow_points) and logged.
+#------------------------------------------------------------
+import atexit
+import json
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+from backend.db_connection import db
+from backend.db_connection.change_markers import mark_tables_changed
+
+
+class DeadLetterFile:
+    """Points given up on, as [metric_id, measured_at, value] JSON lines, oldest first."""
+
+    def __init__(self, path: str, max_points: int):
+        self.path = path
+        self.max_points = max_points
+        self._lock = threading.Lock()
+        self._count = 0
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self._count = sum(1 for line in f if line.strip())
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, points) -> int:
+        """Store as many points as fit; returns how many did not."""
+        with self._lock:
+            keep = points[:max(self.max_points - self._count, 0)]
+            if keep:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as f:
+                    for metric_id, measured_at, value in keep:
+                        f.write(json.dumps([metric_id, measured_at.isoformat(), value]) + "\n")
+                self._count += len(keep)
+            return len(points) - len(keep)
+
+    def read(self, limit=None) -> list[tuple]:
+        with self._lock:
+            return self._read(limit)
+
+    def take(self) -> list[tuple]:
+        """Remove and return every stored point."""
+        with self._lock:
+            points = self._read()
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            self._count = 0
+            return points
+
+    def _read(self, limit=None) -> list[tuple]:
+        points = []
+        if not os.path.exists(self.path):
+            return points
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                if limit is not None and len(points) >= limit:
+                    break
+                if line.strip():
+                    metric_id, measured_at, value = json.loads(line)
+                    points.append((metric_id, datetime.fromisoformat(measured_at), value))
+        return points
+
+
+class SnapshotBuffer:
+    def __init__(self):
+        self.app = None
+        self.max_points = 100000
+        self.flush_points = 5000
+        self.flush_interval = 1.0
+        self.max_attempts = 5
+        self.max_backoff = 30.0
+        self.dead_letter_after = 60.0
+
+        self._points = deque()
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._writer = None
+        self._known_metrics: set[int] = set()
+        self._failed_attempts = 0
+        # Monotonic time of the first failure of the current failing streak
+        self._failing_since = None
+        # Batches given up on (DeadLetterFile), set up by init_app
+        self.dead_letters = None
+        self._listeners = []
+
+        self.stats = {
+            "accepted_points": 0,
+            "rejected_points": 0,
+            "late_points": 0,
+            "flushed_points": 0,
+            "dropped_points": 0,
+            "dead_lettered_points": 0,
+            "dead_letter_overflow_points": 0,
+            "flushes": 0,
+            "flush_errors": 0,
+            "retry_backoff_seconds": 0.0,
+            "last_flush_ms": None,
+            "max_flush_ms": 0.0,
+            "total_flush_ms": 0.0,
+        }
+
+    def init_app(self, app):
+        self.app = app
+        self.max_points = app.config.get("INGEST_BUFFER_MAX_POINTS", self.max_points)
+        self.flush_points = app.config.get("INGEST_FLUSH_POINTS", self.flush_points)
+        self.flush_interval = app.config.get("INGEST_FLUSH_INTERVAL_SECONDS", self.flush_interval)
+        self.max_attempts = app.config.get("INGEST_MAX_FLUSH_ATTEMPTS", self.max_attempts)
+        self.max_backoff = app.config.get("INGEST_MAX_BACKOFF_SECONDS", self.max_backoff)
+        self.dead_letter_after = app.config.get("INGEST_DEAD_LETTER_AFTER_SECONDS", self.dead_letter_after)
+        self.dead_letters = DeadLetterFile(
+            app.config.get("INGEST_DEAD_LETTER_PATH", "logs/snapshot_dead_letters.jsonl"),
+            app.config.get("INGEST_DEAD_LETTER_MAX_POINTS", 1000000),
+        )
+        atexit.register(self._flush_on_exit)
+
+    def add_flush_listener(self, func):
+        """Call func(points) with every batch after it has been written."""
+        self._listeners.append(func)
+
+    # --------------- producer side --------------------
+
+    def known_metric_ids(self, cursor, metric_ids) -> set[int]:
+        """Return the subset of metric_ids that exist, refreshing the cache on a miss."""
+        if not set(metric_ids) <= self._known_metrics:
+            cursor.execute("SELECT MetricID FROM SystemMetric")
+            self._known_metrics = {row["MetricID"] for row in cursor.fetchall()}
+        return self._known_metrics & set(metric_ids)
+
+    def offer(self, points) -> bool:
+        """
+        Queue (metric_id, measured_at, value) tuples.
+        Returns False, queuing nothing, if they do not fit in the buffer.
+        """
+        self._ensure_writer()
+        with self._cond:
+            if len(self._points) + len(points) > self.max_points:
+                self.stats["rejected_points"] += len(points)
+                return False
+            self._points.extend(points)
+            self.stats["accepted_points"] += len(points)
+            if len(self._points) >= self.flush_points:
+                self._cond.notify()
+        return True
+
+    def reject_late(self, count: int) -> None:
+        """Count points refused for landing behind the rollup watermark."""
+        with self._cond:
+            self.stats["late_points"] += count
+
+    def queue_depth(self) -> int:
+        return len(self._points)
+
+    def snapshot_stats(self) -> dict:
+        with self._cond:
+            stats = dict(self.stats)
+        flushes = stats.pop("flushes")
+        total_ms = stats.pop("total_flush_ms")
+        stats["flushes"] = flushes
+        stats["avg_flush_ms"] = round(total_ms / flushes, 2) if flushes else None
+        stats["queue_depth"] = self.queue_depth()
+        stats["queue_capacity"] = self.max_points
+        stats["dead_letter_depth"] = len(self.dead_letters) if self.dead_letters is not None else 0
+        return stats
+
+    # --------------- writer side --------------------
+
+    def _ensure_writer(self):
+        if self._writer is not None and self._writer.is_alive():
+            return
+        with self._cond:
+            if self._writer is not None and self._writer.is_alive():
+                return
+            self._writer = threading.Thread(
+                target=self._run, name="snapshot-ingest-writer", daemon=True
+            )
+            self._writer.start()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if len(self._points) < self.flush_points:
+                    self._cond.wait(timeout=self.flush_interval)
+            try:
+                with self.app.app_context():  # type: ignore
+                    self.flush()
+            except Exception as e:
+                self.app.logger.error(f"Snapshot ingest flush failed: {e}")  # type: ignore
+                # The failed batch is back at the front: wait before retrying it
+                time.sleep(self._backoff())
+
+    def _backoff(self) -> float:
+        """Seconds to wait after the current failing streak: doubles per attempt, capped."""
+        with self._cond:
+            attempts = max(self._failed_attempts, 1)
+            delay = min(self.flush_interval * 2 ** (attempts - 1), self.max_backoff)
+            self.stats["retry_backoff_seconds"] = round(delay, 3)
+        return delay
+
+    def _drain(self, limit):
+        with self._cond:
+            count = min(limit, len(self._points))
+            return [self._points.popleft() for _ in range(count)]
+
+    def flush(self) -> int:
+        """Write queued points in chunks of flush_points. Needs an app context."""
+        written = 0
+        with self._flush_lock:
+            while True:
+                batch = self._drain(self.flush_points)
+                if not batch:
+                    return written
+                started = time.perf_counter()
+                try:
+                    self._write(batch)
+                except Exception:
+                    with self._cond:
+                        self.stats["flush_errors"] += 1
+                        self._failed_attempts += 1
+                        if self._failing_since is None:
+                            self._failing_since = time.monotonic()
+                        # Both: attempts alone would let a brief outage burn every retry
+                        give_up = (
+                            self._failed_attempts >= self.max_attempts
+                            and time.monotonic() - self._failing_since >= self.dead_letter_after
+                        )
+                    if give_up:
+                        self._dead_letter(batch)
+                    else:
+                        self._requeue(batch)
+                    raise
+                elapsed_ms = (time.perf_counter() - started) * 1000
+
+                with self._cond:
+                    self._failed_attempts = 0
+                    self._failing_since = None
+                    self.stats["retry_backoff_seconds"] = 0.0
+                    self.stats["flushed_points"] += len(batch)
+                    self.stats["flushes"] += 1
+                    self.stats["last_flush_ms"] = round(elapsed_ms, 2)
+                    self.stats["max_flush_ms"] = round(max(self.stats["max_flush_ms"], elapsed_ms), 2)
+                    self.stats["total_flush_ms"] += elapsed_ms
+                written += len(batch)
+
+                for listener in self._listeners:
+                    try:
+                        listener(batch)
+                    except Exception as e:
+                        self.app.logger.error(f"Snapshot ingest listener failed: {e}")  # type: ignore
+
+    def _write(self, batch):
+        conn = db.get_db()
+        cursor = conn.cursor()  # type: ignore
+        try:
+            # Single writer, so one MAX() per flush is enough to allocate IDs
+            cursor.execute("SELECT COALESCE(MAX(SnapshotID), 0) AS max_id FROM MetricSnapshot")
+            next_id = cursor.fetchone()["max_id"] + 1
+            rows = [
+                (next_id + i, metric_id, measured_at, value)
+                for i, (metric_id, measured_at, value) in enumerate(batch)
+            ]
+            # executemany() folds this into multi-row INSERT statements
+            cursor.executemany(
+                """
+                INSERT INTO MetricSnapshot (SnapshotID, MetricID, MeasuredAt, Value)
+                VALUES (%s, %s, %s, %s)
+                """,
+                rows,
+            )
+            conn.commit()  # type: ignore
+        except Exception:
+            conn.rollback()  # type: ignore
+            raise
+        finally:
+            cursor.close()
+        mark_tables_changed("MetricSnapshot")
+
+    def _requeue(self, batch):
+        """Put a failed batch back at the front, dropping what no longer fits."""
+        with self._cond:
+            room = max(self.max_points - len(self._points), 0)
+            keep = batch[:room]
+            self._points.extendleft(reversed(keep))
+            self.stats["dropped_points"] += len(batch) - len(keep)
+
+    def _dead_letter(self, batch):
+        """Set a batch that keeps failing aside, so the points behind it get written."""
+        try:
+            overflow = self.dead_letters.append(batch)  # type: ignore
+        except OSError as e:
+            self.app.logger.error(f"Snapshot ingest could not write dead letters: {e}")  # type: ignore
+            overflow = len(batch)
+        with self._cond:
+            self.stats["dead_lettered_points"] += len(batch) - overflow
+            self.stats["dead_letter_overflow_points"] += overflow
+            attempts = self._failed_attempts
+            self._failed_attempts = 0
+            self._failing_since = None
+        message = f"Snapshot ingest gave up on {len(batch)} points after {attempts} attempts"
+        if overflow:
+            message += f"; {overflow} of them could not be kept as dead letters and are lost"
+        self.app.logger.error(message)  # type: ignore
+
+    def _flush_on_exit(self):
+        if self.app is None or not self._points:
+            return
+        try:
+            with self.app.app_context():
+                self.flush()
+        except Exception as e:
+            self.app.logger.error(f"Snapshot ingest final flush failed: {e}")
+
+
+snapshot_buffer = SnapshotBuffer()
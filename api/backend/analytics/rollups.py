@@ -0,0 +1,317 @@
+#------------------------------------------------------------
+# Multi-resolution rollups for MetricSnapshot.
+#
+# Raw snapshots are compacted into 1-minute buckets, 1-minute
+# buckets into 1-hour buckets and 1-hour buckets into 1-day
+# buckets. Each level keeps a watermark in MetricRollupState:
+# every bucket that starts before it is complete and final.
+# Old rows are pruned per resolution, but never past the point
+# the next coarser level has already consumed.
+#------------------------------------------------------------
+from datetime import datetime, timedelta
+
+from flask import current_app
+
+from backend.db_connection import db
+from backend.db_connection.change_markers import mark_tables_changed
+
+
+# Finest to coarsest. "format" truncates a DATETIME to its bucket start
+# (doubled % because the statement is executed with parameters).
+RESOLUTIONS = [
+    {
+        "name": "1m",
+        "table": "MetricRollup1m",
+        "seconds": 60,
+        "format": "%%Y-%%m-%%d %%H:%%i:00",
+        "source": None,
+    },
+    {
+        "name": "1h",
+        "table": "MetricRollup1h",
+        "seconds": 3600,
+        "format": "%%Y-%%m-%%d %%H:00:00",
+        "source": "1m",
+    },
+    {
+        "name": "1d",
+        "table": "MetricRollup1d",
+        "seconds": 86400,
+        "format": "%%Y-%%m-%%d 00:00:00",
+        "source": "1h",
+    },
+]
+RESOLUTIONS_BY_NAME = {r["name"]: r for r in RESOLUTIONS}
+
+# Upper bound on buckets compacted per level per run, so one run stays short
+MAX_BUCKETS_PER_RUN = 1440
+
+PRUNE_BATCH_SIZE = 10000
+
+_RAW_SOURCE = """
+    SELECT MetricID, MeasuredAt AS SampleAt,
+           Value AS MinV, Value AS MaxV, Value AS SumV, 1 AS Cnt, Value AS LastV
+    FROM MetricSnapshot
+    WHERE MetricID IS NOT NULL AND Value IS NOT NULL
+      AND MeasuredAt >= %s AND MeasuredAt < %s
+"""
+
+_ROLLUP_SOURCE = """
+    SELECT MetricID, LastMeasuredAt AS SampleAt,
+           MinValue AS MinV, MaxValue AS MaxV, SumValue AS SumV,
+           SampleCount AS Cnt, LastValue AS LastV
+    FROM {table}
+    WHERE BucketStart >= %s AND BucketStart < %s
+"""
+
+_COMPACT = """
+    INSERT INTO {table}
+        (MetricID, BucketStart, MinValue, MaxValue, SumValue,
+         SampleCount, LastValue, LastMeasuredAt)
+    SELECT * FROM (
+        SELECT b.MetricID,
+               b.Bucket,
+               MIN(b.MinV) AS NewMin,
+               MAX(b.MaxV) AS NewMax,
+               SUM(b.SumV) AS NewSum,
+               SUM(b.Cnt) AS NewCount,
+               MAX(CASE WHEN b.rn = 1 THEN b.LastV END) AS NewLast,
+               MAX(b.SampleAt) AS NewLastAt
+        FROM (
+            SELECT src.*,
+                   DATE_FORMAT(src.SampleAt, '{fmt}') AS Bucket,
+                   ROW_NUMBER() OVER (
+                       PARTITION BY src.MetricID, DATE_FORMAT(src.SampleAt, '{fmt}')
+                       ORDER BY src.SampleAt DESC
+                   ) AS rn
+            FROM ({source}) src
+        ) b
+        GROUP BY b.MetricID, b.Bucket
+    ) AS dt
+    ON DUPLICATE KEY UPDATE
+        MinValue = NewMin,
+        MaxValue = NewMax,
+        SumValue = NewSum,
+        SampleCount = NewCount,
+        LastValue = NewLast,
+        LastMeasuredAt = NewLastAt
+"""
+
+
+def floor_to(ts: datetime, seconds: int) -> datetime:
+    """Truncate a naive datetime to the start of its bucket."""
+    if seconds >= 86400:
+        return ts.replace(hour=0, minute=0, second=0, microsecond=0)
+    epoch = datetime(1970, 1, 1)
+    offset = int((ts - epoch).total_seconds()) // seconds * seconds
+    return epoch + timedelta(seconds=offset)
+
+
+def get_watermarks(cursor) -> dict:
+    cursor.execute("SELECT Resolution, CompactedThrough FROM MetricRollupState")
+    return {row["Resolution"]: row["CompactedThrough"] for row in cursor.fetchall()}
+
+
+def _set_watermark(cursor, name, through) -> None:
+    cursor.execute(
+        """
+        INSERT INTO MetricRollupState (Resolution, CompactedThrough)
+        VALUES (%s, %s) AS new
+        ON DUPLICATE KEY UPDATE CompactedThrough = new.CompactedThrough
+        """,
+        (name, through),
+    )
+
+
+def _source_start(cursor, resolution) -> datetime | None:
+    """Earliest timestamp available in a level's source (for the first run)."""
+    if resolution["source"] is None:
+        cursor.execute("SELECT MIN(MeasuredAt) AS first_at FROM MetricSnapshot")
+    else:
+        source_table = RESOLUTIONS_BY_NAME[resolution["source"]]["table"]
+        cursor.execute(f"SELECT MIN(BucketStart) AS first_at FROM {source_table}")
+    row = cursor.fetchone()
+    return row["first_at"] if row else None
+
+
+def compact() -> dict:
+    """
+    Advance every resolution's watermark as far as complete data allows
+    (bounded by MAX_BUCKETS_PER_RUN). Returns {resolution: new watermark}.
+    """
+    lateness = current_app.config.get("ROLLUP_LATENESS_SECONDS", 120)
+
+    conn = db.get_db()
+    cursor = conn.cursor()  # type: ignore
+    advanced = {}
+    try:
+        cursor.execute("SELECT NOW() AS now")
+        now = cursor.fetchone()["now"]
+        watermarks = get_watermarks(cursor)
+
+        for resolution in RESOLUTIONS:
+            name = resolution["name"]
+            seconds = resolution["seconds"]
+
+            # A bucket is final once its source has moved past its end
+            if resolution["source"] is None:
+                complete_until = floor_to(now - timedelta(seconds=lateness), seconds)
+            else:
+                source_mark = watermarks.get(resolution["source"])
+                if source_mark is None:
+                    continue
+                complete_until = floor_to(source_mark, seconds)
+
+            start = watermarks.get(name)
+            if start is None:
+                first_at = _source_start(cursor, resolution)
+                if first_at is None:
+                    continue
+                start = floor_to(first_at, seconds)
+
+            end = min(complete_until, start + timedelta(seconds=seconds * MAX_BUCKETS_PER_RUN))
+            if end <= start:
+                continue
+
+            if resolution["source"] is None:
+                source_sql = _RAW_SOURCE
+            else:
+                source_table = RESOLUTIONS_BY_NAME[resolution["source"]]["table"]
+                source_sql = _ROLLUP_SOURCE.format(table=source_table)
+
+            cursor.execute(
+                _COMPACT.format(
+                    table=resolution["table"], fmt=resolution["format"], source=source_sql
+                ),
+                (start, end),
+            )
+            _set_watermark(cursor, name, end)
+            conn.commit()  # type: ignore
+
+            watermarks[name] = end
+            advanced[name] = end
+    finally:
+        cursor.close()
+
+    if advanced:
+        mark_tables_changed(*(RESOLUTIONS_BY_NAME[n]["table"] for n in advanced))
+    return advanced
+
+
+def _retention_days(name: str) -> int:
+    return current_app.config.get(f"ROLLUP_RETENTION_DAYS_{name.upper()}", 0)
+
+
+def _delete_in_batches(cursor, conn, sql, params) -> int:
+    total = 0
+    while True:
+        cursor.execute(f"{sql} LIMIT {PRUNE_BATCH_SIZE}", params)
+        conn.commit()  # type: ignore
+        total += cursor.rowcount
+        if cursor.rowcount < PRUNE_BATCH_SIZE:
+            return total
+
+
+def prune() -> dict:
+    """
+    Apply retention: delete rows older than each level's retention window
+    (0 = keep forever). Rows the next coarser level has not consumed yet
+    are never deleted. Returns {table: deleted row count}.
+    """
+    conn = db.get_db()
+    cursor = conn.cursor()  # type: ignore
+    deleted = {}
+    try:
+        cursor.execute("SELECT NOW() AS now")
+        now = cursor.fetchone()["now"]
+        watermarks = get_watermarks(cursor)
+
+        levels = [("raw", "MetricSnapshot", "MeasuredAt", "1m")]
+        for i, resolution in enumerate(RESOLUTIONS):
+            consumer = RESOLUTIONS[i + 1]["name"] if i + 1 < len(RESOLUTIONS) else None
+            levels.append((resolution["name"], resolution["table"], "BucketStart", consumer))
+
+        for name, table, time_column, consumer in levels:
+            days = _retention_days(name)
+            if days <= 0:
+                continue
+            cutoff = now - timedelta(days=days)
+            if consumer is not None:
+                consumed_until = watermarks.get(consumer)
+                if consumed_until is None:
+                    continue
+                cutoff = min(cutoff, consumed_until)
+
+            count = _delete_in_batches(
+                cursor, conn, f"DELETE FROM {table} WHERE {time_column} < %s", (cutoff,)
+            )
+            if count:
+                deleted[table] = count
+    finally:
+        cursor.close()
+
+    if deleted:
+        mark_tables_changed(*deleted)
+        current_app.logger.info(f"Metric retention pruned: {deleted}")
+    return deleted
+
+
+def run_rollup_job() -> None:
+    """Background entry point: compact, then apply retention."""
+    compact()
+    prune()
+
+
+def pick_resolution(start: datetime, end: datetime, max_points: int, now: datetime) -> dict:
+    """
+    Choose the finest resolution whose bucket count for [start, end] fits in
+    max_points and whose retention still covers start; falls back to the
+    coarsest level.
+    """
+    span = max((end - start).total_seconds(), 1)
+    for resolution in RESOLUTIONS:
+        days = _retention_days(resolution["name"])
+        if days > 0 and start < now - timedelta(days=days):
+            continue
+        if span / resolution["seconds"] <= max_points:
+            return resolution
+    return RESOLUTIONS[-1]
+
+
+def read_buckets(cursor, metric_id: int, resolution: dict, start, end) -> tuple[list[dict], datetime | None]:
+    """
+    Read compacted buckets for a metric in [start, end].
+    Returns (rows, watermark) where rows use the same shape as
+    downsampling.bucket_aggregate and watermark is where compacted data stops.
+    """
+    watermark = get_watermarks(cursor).get(resolution["name"])
+    if watermark is None:
+        return [], None
+
+    query = f"""
+        SELECT BucketStart, MinValue, MaxValue, SumValue, SampleCount, LastValue
+        FROM {resolution['table']}
+        WHERE MetricID = %s AND BucketStart < %s
+    """
+    params = [metric_id, watermark]
+    if start:
+        query += " AND BucketStart >= %s"
+        params.append(floor_to(start, resolution["seconds"]))
+    if end:
+        query += " AND BucketStart <= %s"
+        params.append(end)
+    query += " ORDER BY BucketStart"
+
+    cursor.execute(query, tuple(params))
+    rows = [
+        {
+            "BucketStart": r["BucketStart"],
+            "Min": float(r["MinValue"]),
+            "Max": float(r["MaxValue"]),
+            "Avg": round(float(r["SumValue"]) / r["SampleCount"], 4),
+            "Count": int(r["SampleCount"]),
+            "Last": float(r["LastValue"]),
+        }
+        for r in cursor.fetchall()
+    ]
+    return rows, watermark
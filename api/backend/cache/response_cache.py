@@ -0,0 +1,453 @@
+#------------------------------------------------------------
+# Response cache for read-heavy GET routes.
+#
+# @cached_response("Recipe", ...) caches a route's 200 answers,
+# keyed by path and normalized query args and tagged with the
+# tables the route reads. An entry is only served while the
+# version of each of its tags is still the one it was built
+# under, and write routes bump those versions through
+# mark_tables_changed(...) - so invalidation by tag needs no
+# bookkeeping of which keys a table touched. Entries also
+# expire after RESPONSE_CACHE_TTL_SECONDS, which bounds the
+# staleness of changes made outside the API.
+#
+# The first tier is an in-process LRU (RESPONSE_CACHE_MAX_ENTRIES).
+# With RESPONSE_CACHE_SQLITE_PATH set, entries and tag versions
+# are also kept in a local SQLite file shared by every API
+# process on the host, so a write in one worker invalidates the
+# others' entries too.
+#
+# The same versions give every response a strong ETag, so a
+# client sending it back in If-None-Match gets 304 Not Modified
+# before the view runs - no MySQL query, no serialization. The
+# tag also carries an epoch (per process, or per SQLite file),
+# so counters restarting from 0 never match an older tag, and
+# the TTL window the body was built in, so a tag stops matching
+# after at most one TTL - the bound on changes made outside the
+# API holds for 304s too. Conditional GETs are answered even
+# with the cache disabled. Routes reading tables no API route
+# writes opt out (conditional=False) and rely on TTL alone;
+# routes filtering on CURDATE() put the date in their key
+# (daily=True).
+#
+# Expiry never sends a crowd to MySQL. Concurrent misses of one
+# key wait for a single computation (single flight). An entry
+# past its TTL is still served for RESPONSE_CACHE_STALE_SECONDS
+# (X-Cache: STALE) while one background refresh replaces it,
+# and fresh entries are refreshed early with a probability that
+# grows as expiry nears and with how long they took to compute
+# (RESPONSE_CACHE_EARLY_BETA). Stale serving only covers the
+# TTL: an entry whose tags were bumped by a write is never served.
+#------------------------------------------------------------
+import datetime
+import functools
+import hashlib
+import json
+import math
+import os
+import random
+import sqlite3
+import threading
+import time
+import uuid
+from collections import namedtuple
+from urllib.parse import urlencode
+
+from flask import current_app, request
+
+from backend.cache.ttl_cache import TTLCache
+from backend.db_connection.change_markers import add_change_listener, table_generations
+from backend.observability.metrics import Counter
+from backend.serialization.columnar import requested_format
+
+
+CACHE_HEADER = "X-Cache"
+
+RESPONSE_CACHE_LOOKUPS = Counter(
+    "api_response_cache_lookups_total",
+    "Response cache lookups by route and result (hit, miss, bypass, not_modified, stale, coalesced).",
+    labels=("route", "result"),
+)
+RESPONSE_CACHE_REFRESHES = Counter(
+    "api_response_cache_refreshes_total",
+    "Background refreshes of cached responses by route and reason (stale, early).",
+    labels=("route", "reason"),
+)
+
+_STAT_NAMES = {
+    "hit": "hits",
+    "miss": "misses",
+    "bypass": "bypasses",
+    "not_modified": "not_modified",
+    "stale": "stale",
+    "coalesced": "coalesced",
+}
+
+# fresh_until is wall-clock time; compute_seconds is how long the view took
+_Entry = namedtuple("_Entry", "versions mimetype body fresh_until compute_seconds")
+
+
+class _Flight:
+    """One in-progress computation of a key that other requests can wait for."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.entry = None
+
+
+class _SqliteStore:
+    """Entries and tag versions shared through one SQLite file."""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        conn = self._conn()
+        # Files written before entries had a freshness deadline are rebuilt
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(response_cache)")}
+        if columns and "fresh_until" not in columns:
+            conn.execute("DROP TABLE response_cache")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS response_cache (
+                key TEXT PRIMARY KEY,
+                expires_at REAL NOT NULL,
+                fresh_until REAL NOT NULL,
+                compute_seconds REAL NOT NULL,
+                versions TEXT NOT NULL,
+                mimetype TEXT,
+                body BLOB NOT NULL
+            )
+            """
+        )
+        conn.execute("CREATE TABLE IF NOT EXISTS tag_version (tag TEXT PRIMARY KEY, version INTEGER NOT NULL)")
+        conn.execute("CREATE TABLE IF NOT EXISTS cache_meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        # First process to create the file picks the epoch; the others read it
+        conn.execute("INSERT OR IGNORE INTO cache_meta VALUES ('epoch', ?)", (uuid.uuid4().hex[:12],))
+        self.epoch = conn.execute("SELECT value FROM cache_meta WHERE name = 'epoch'").fetchone()[0]
+
+    def _conn(self):
+        # One connection per thread; autocommit, WAL so readers never block the writer
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def versions(self, tags) -> dict:
+        rows = self._conn().execute(
+            f"SELECT tag, version FROM tag_version WHERE tag IN ({','.join('?' * len(tags))})", tuple(tags)
+        ).fetchall()
+        found = dict(rows)
+        return {tag: found.get(tag, 0) for tag in tags}
+
+    def bump(self, tags) -> None:
+        self._conn().executemany(
+            """
+            INSERT INTO tag_version (tag, version) VALUES (?, 1)
+            ON CONFLICT(tag) DO UPDATE SET version = version + 1
+            """,
+            [(tag,) for tag in tags],
+        )
+
+    def get(self, key):
+        """(_Entry, seconds until it may no longer be served) or None."""
+        row = self._conn().execute(
+            """
+            SELECT expires_at, versions, mimetype, body, fresh_until, compute_seconds
+            FROM response_cache WHERE key = ?
+            """,
+            (key,),
+        ).fetchone()
+        if row is None or row[0] <= time.time():
+            return None
+        return _Entry(json.loads(row[1]), row[2], row[3], row[4], row[5]), row[0] - time.time()
+
+    def set(self, key, entry, keep_seconds) -> None:
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO response_cache VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                key, time.time() + keep_seconds, entry.fresh_until, entry.compute_seconds,
+                json.dumps(entry.versions, sort_keys=True), entry.mimetype, entry.body,
+            ),
+        )
+        conn.execute("DELETE FROM response_cache WHERE expires_at <= ?", (time.time(),))
+
+    def clear(self) -> None:
+        self._conn().execute("DELETE FROM response_cache")
+
+
+class ResponseCache:
+    def __init__(self):
+        self.enabled = False
+        self.ttl = 60.0
+        self.stale = 30.0
+        self.early_beta = 1.0
+        self.coalesce_timeout = 10.0
+        self._memory = TTLCache()
+        self._store = None
+        self._epoch = uuid.uuid4().hex[:12]
+        self._flights_lock = threading.Lock()
+        self._flights: dict[str, _Flight] = {}
+        self._stats_lock = threading.Lock()
+        self._stats: dict[str, dict] = {}
+
+    def init_app(self, app):
+        self.enabled = app.config.get("RESPONSE_CACHE_ENABLED", False)
+        self.ttl = app.config.get("RESPONSE_CACHE_TTL_SECONDS", self.ttl)
+        self.stale = app.config.get("RESPONSE_CACHE_STALE_SECONDS", self.stale)
+        self.early_beta = app.config.get("RESPONSE_CACHE_EARLY_BETA", self.early_beta)
+        self.coalesce_timeout = app.config.get("RESPONSE_CACHE_COALESCE_TIMEOUT_SECONDS", self.coalesce_timeout)
+        self._memory = TTLCache(max_entries=app.config.get("RESPONSE_CACHE_MAX_ENTRIES", 1024))
+        path = app.config.get("RESPONSE_CACHE_SQLITE_PATH")
+        if self.enabled and path:
+            self._store = _SqliteStore(path)
+            self._epoch = self._store.epoch
+            add_change_listener(self._store.bump)
+
+    # --------------- entries --------------------
+
+    def versions(self, tags) -> dict:
+        """Current version of every tag: shared ones with SQLite, else this process' generations."""
+        if self._store is not None:
+            return self._store.versions(tags)
+        return table_generations(tags)
+
+    def etag(self, key, versions, ttl, built_at=None) -> str:
+        """
+        Strong validator of the response for `key` while the tags keep
+        `versions`, within the `ttl`-second window holding `built_at` (now).
+        """
+        window = int((time.time() if built_at is None else built_at) // max(ttl, 1))
+        raw = json.dumps([self._epoch, key, versions, window], sort_keys=True)
+        return hashlib.sha1(raw.encode()).hexdigest()[:20]
+
+    def lookup(self, key, versions):
+        """The entry built under `versions`, fresh or stale, or None."""
+        entry = self._memory.get(key)
+        if entry is None and self._store is not None:
+            stored = self._store.get(key)
+            if stored is not None:
+                entry = stored[0]
+                self._memory.set(key, entry, stored[1])
+        if entry is None or entry.versions != versions:
+            return None
+        return entry
+
+    def store(self, key, entry, stale=None) -> None:
+        keep_seconds = entry.fresh_until - time.time() + (self.stale if stale is None else stale)
+        self._memory.set(key, entry, keep_seconds)
+        if self._store is not None:
+            self._store.set(key, entry, keep_seconds)
+
+    def refresh_early(self, entry) -> bool:
+        """
+        Probabilistic early expiration: True with a probability that rises
+        towards expiry, sooner for entries that were slow to compute.
+        """
+        if self.early_beta <= 0:
+            return False
+        jitter = -entry.compute_seconds * self.early_beta * math.log(1.0 - random.random())
+        return time.time() + jitter >= entry.fresh_until
+
+    # --------------- single flight --------------------
+
+    def join_flight(self, key):
+        """(flight, True) for the request that must compute `key`, (flight, False) for the ones waiting on it."""
+        with self._flights_lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                return flight, False
+            flight = self._flights[key] = _Flight()
+            return flight, True
+
+    def land_flight(self, key, flight, entry=None) -> None:
+        flight.entry = entry
+        with self._flights_lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+        flight.done.set()
+
+    def clear(self) -> None:
+        self._memory.clear()
+        if self._store is not None:
+            self._store.clear()
+
+    # --------------- statistics --------------------
+
+    def record(self, route, result) -> None:
+        RESPONSE_CACHE_LOOKUPS.inc(route=route, result=result)
+        with self._stats_lock:
+            stats = self._stats.setdefault(route, dict.fromkeys(_STAT_NAMES.values(), 0))
+            stats[_STAT_NAMES[result]] += 1
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            routes = {route: dict(s) for route, s in self._stats.items()}
+        # Anything answered without running the view counts as a hit
+        def served(s):
+            return s["hits"] + s["not_modified"] + s["stale"] + s["coalesced"]
+
+        for s in routes.values():
+            lookups = served(s) + s["misses"]
+            s["hit_ratio"] = round(served(s) / lookups, 4) if lookups else None
+        hits = sum(served(s) for s in routes.values())
+        lookups = hits + sum(s["misses"] for s in routes.values())
+        return {
+            "enabled": self.enabled,
+            "backend": "memory+sqlite" if self._store is not None else "memory",
+            "ttl_seconds": self.ttl,
+            "stale_seconds": self.stale,
+            "memory_entries": len(self._memory),
+            "hit_ratio": round(hits / lookups, 4) if lookups else None,
+            "routes": routes,
+        }
+
+
+response_cache = ResponseCache()
+
+
+def _request_key() -> str:
+    # Same arguments in any order give the same key; repeated values keep their order
+    args = sorted(request.args.lists())
+    key = f"{request.path}?{urlencode([(k, v) for k, values in args for v in values])}"
+    # A format picked through the Accept header is a different representation too
+    fmt = requested_format()
+    return key if fmt == "rows" else f"{key}#{fmt}"
+
+
+def _compute(view, args, kwargs, versions, ttl):
+    """Run the view; (response, entry to cache or None)."""
+    started = time.perf_counter()
+    response = current_app.make_response(view(*args, **kwargs))
+    if response.status_code != 200 or response.is_streamed:
+        return response, None
+    return response, _Entry(
+        versions, response.mimetype, response.get_data(),
+        time.time() + (response_cache.ttl if ttl is None else ttl),
+        time.perf_counter() - started,
+    )
+
+
+def _refresh_in_background(view, args, kwargs, tables, key, ttl, stale, reason) -> None:
+    """Recompute `key` on a thread of its own unless a computation is already running."""
+    flight_key = f"{key}#refresh"
+    flight, leader = response_cache.join_flight(flight_key)
+    if not leader:
+        return
+    RESPONSE_CACHE_REFRESHES.inc(route=request.url_rule.rule, reason=reason)
+    app = current_app._get_current_object()
+    environ = dict(request.environ)
+
+    def run():
+        entry = None
+        try:
+            # A request context of its own, so the view gets (and closes) its own connection
+            with app.request_context(environ):
+                versions = response_cache.versions(tables)
+                _, entry = _compute(view, args, kwargs, versions, ttl)
+                if entry is not None:
+                    response_cache.store(key, entry, stale)
+        except Exception as e:
+            app.logger.error(f"Error refreshing cached {key}: {e}")
+        finally:
+            response_cache.land_flight(flight_key, flight, entry)
+
+    threading.Thread(target=run, name="cache-refresh", daemon=True).start()
+
+
+def _from_entry(entry, key, route_ttl, cache_status, conditional):
+    response = current_app.response_class(entry.body, status=200, mimetype=entry.mimetype)
+    response.headers[CACHE_HEADER] = cache_status
+    if conditional:
+        # Tagged with the window the body was built in, not the current one
+        response.set_etag(response_cache.etag(key, entry.versions, route_ttl, entry.fresh_until - route_ttl))
+    # The key includes the format negotiated from Accept
+    response.vary.add("Accept")
+    return response
+
+
+def cached_response(*tables, ttl=None, stale=None, daily=False, conditional=True):
+    """
+    Cache a GET route's 200 responses, tagged with the tables it reads, and
+    answer If-None-Match with 304 while those tables are unchanged.
+    `ttl` and `stale` override RESPONSE_CACHE_TTL_SECONDS / _STALE_SECONDS.
+    `daily` puts today's date in the key, for routes filtering on CURDATE().
+    conditional=False sends no ETag (and never 304s), for routes whose tables
+    are only written outside the API: their entries are bounded by TTL alone.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            if request.method != "GET":
+                return view(*args, **kwargs)
+
+            route = request.url_rule.rule
+            key = _request_key()
+            if daily:
+                key = f"{key}@{datetime.date.today().isoformat()}"
+            route_ttl = response_cache.ttl if ttl is None else ttl
+            # Taken before the view runs: a write landing meanwhile makes the new entry stale at once
+            versions = response_cache.versions(tables)
+            etag = response_cache.etag(key, versions, route_ttl)
+
+            if conditional and request.if_none_match.contains_weak(etag):
+                response_cache.record(route, "not_modified")
+                response = current_app.response_class(status=304)
+                response.set_etag(etag)
+                return response
+
+            if not response_cache.enabled:
+                response = current_app.make_response(view(*args, **kwargs))
+                if conditional and response.status_code == 200:
+                    response.set_etag(etag)
+                return response
+
+            if "no-cache" in request.headers.get("Cache-Control", ""):
+                response_cache.record(route, "bypass")
+                response, entry = _compute(view, args, kwargs, versions, ttl)
+                if entry is not None:
+                    response_cache.store(key, entry, stale)
+                    if conditional:
+                        response.set_etag(etag)
+                response.headers[CACHE_HEADER] = "MISS"
+                return response
+
+            entry = response_cache.lookup(key, versions)
+            if entry is not None:
+                if time.time() < entry.fresh_until:
+                    if response_cache.refresh_early(entry):
+                        _refresh_in_background(view, args, kwargs, tables, key, ttl, stale, "early")
+                    response_cache.record(route, "hit")
+                    return _from_entry(entry, key, route_ttl, "HIT", conditional)
+                _refresh_in_background(view, args, kwargs, tables, key, ttl, stale, "stale")
+                response_cache.record(route, "stale")
+                return _from_entry(entry, key, route_ttl, "STALE", conditional)
+
+            # Miss: one request computes, identical concurrent ones wait for it
+            flight_key = f"{key}#{etag}"
+            flight, leader = response_cache.join_flight(flight_key)
+            if not leader:
+                flight.done.wait(response_cache.coalesce_timeout)
+                if flight.entry is not None:
+                    response_cache.record(route, "coalesced")
+                    return _from_entry(flight.entry, key, route_ttl, "COALESCED", conditional)
+
+            response_cache.record(route, "miss")
+            entry = None
+            try:
+                response, entry = _compute(view, args, kwargs, versions, ttl)
+                if entry is not None:
+                    response_cache.store(key, entry, stale)
+                    if conditional:
+                        response.set_etag(etag)
+            finally:
+                if leader:
+                    response_cache.land_flight(flight_key, flight, entry)
+            response.headers[CACHE_HEADER] = "MISS"
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,259 @@
+#------------------------------------------------------------
+# Backend-for-frontend endpoints for the persona home pages.
+#
+# GET /dashboards/<persona> returns everything one home page
+# shows, computed with a fixed number of queries (at most 3,
+# whatever the data size) and cached for
+# DASHBOARD_CACHE_TTL_SECONDS. The cache key includes the
+# change-marker generation of every table a dashboard reads, so
+# writes through the API are visible on the next page load.
+#------------------------------------------------------------
+from flask import Blueprint, request, jsonify, current_app
+
+from backend.analytics.alert_rules import OPEN_ALERT_CONDITION
+from backend.cache.ttl_cache import TTLCache
+from backend.data_quality.engine import latest_results
+from backend.db_connection import db
+from backend.db_connection.change_markers import table_generations
+
+
+dashboards_bp = Blueprint("dashboards_bp", __name__)
+
+_cache = TTLCache(max_entries=2048)
+
+EXPIRING_DAYS = 7
+SUGGESTION_LIMIT = 3
+TOP_LIMIT = 5
+
+
+def _student(cursor, user_id):
+    cursor.execute(
+        """
+        SELECT COUNT(*) AS InventoryCount,
+               COALESCE(SUM(ExpirationDate IS NOT NULL
+                            AND ExpirationDate <= DATE_ADD(CURDATE(), INTERVAL %s DAY)), 0) AS ExpiringCount
+        FROM InventoryItem
+        WHERE UserID = %s
+        """,
+        (EXPIRING_DAYS, user_id),
+    )
+    counts = cursor.fetchone()
+
+    # Same matching and order as GET /recipes/suggestions
+    cursor.execute(
+        """
+        SELECT r.RecipeId, r.Name, r.PrepTimeMinutes, r.DifficultyLevel
+        FROM Recipe r
+        JOIN RecipeIngredient ri ON r.RecipeId = ri.RecipeID
+        JOIN InventoryItem ii
+          ON ii.IngredientID = ri.IngredientID
+         AND ii.UserID = %s
+         AND (ii.ExpirationDate IS NULL OR ii.ExpirationDate >= CURDATE())
+        WHERE r.Status = 'Active'
+        GROUP BY r.RecipeId
+        ORDER BY COUNT(DISTINCT ri.IngredientID) DESC,
+                 CAST(r.PrepTimeMinutes AS UNSIGNED), r.RecipeId
+        LIMIT %s
+        """,
+        (user_id, SUGGESTION_LIMIT),
+    )
+    suggestions = cursor.fetchall()
+
+    cursor.execute(
+        """
+        SELECT fr.RecipeID, r.Name, r.PrepTimeMinutes, fr.FavoritedDate
+        FROM FavoriteRecipe fr
+        JOIN Recipe r ON fr.RecipeID = r.RecipeId
+        WHERE fr.UserID = %s
+        ORDER BY fr.FavoritedDate DESC
+        LIMIT %s
+        """,
+        (user_id, TOP_LIMIT),
+    )
+    favorites = cursor.fetchall()
+
+    return {
+        "inventory_count": int(counts["InventoryCount"]),
+        "expiring_count": int(counts["ExpiringCount"]),
+        "expiring_days": EXPIRING_DAYS,
+        "suggestions": suggestions,
+        "favorites": favorites,
+    }
+
+
+def _health(cursor, user_id):
+    cursor.execute(
+        """
+        SELECT d.DietTypes, d.Notes, b.WeeklyBudgetAmount, b.Currency
+        FROM User u
+        LEFT JOIN UsersBudgetProfile d ON d.UserID = u.UserID
+        LEFT JOIN UserBudgetProfile b ON b.UserID = u.UserID
+        WHERE u.UserID = %s
+        """,
+        (user_id,),
+    )
+    profile = cursor.fetchone() or {}
+
+    cursor.execute(
+        """
+        SELECT mp.MealPlanID, mp.StartDate, mp.EndDate, mp.IsSaved,
+               COUNT(e.MealPlanID) AS EntryCount,
+               COUNT(*) OVER () AS PlanCount
+        FROM MealPlan mp
+        LEFT JOIN MealPlanEntry e ON e.MealPlanID = mp.MealPlanID
+        WHERE mp.UserID = %s
+        GROUP BY mp.MealPlanID, mp.StartDate, mp.EndDate, mp.IsSaved
+        ORDER BY mp.StartDate DESC
+        LIMIT 1
+        """,
+        (user_id,),
+    )
+    latest_plan = cursor.fetchone()
+
+    cursor.execute(
+        """
+        SELECT RecipeId, Name, PrepTimeMinutes, DifficultyLevel
+        FROM Recipe
+        WHERE Status = 'Active'
+        ORDER BY CAST(PrepTimeMinutes AS UNSIGNED), RecipeId
+        LIMIT %s
+        """,
+        (SUGGESTION_LIMIT,),
+    )
+    quick_recipes = cursor.fetchall()
+
+    return {
+        "diet_types": profile.get("DietTypes"),
+        "notes": profile.get("Notes"),
+        "weekly_budget_amount": profile.get("WeeklyBudgetAmount"),
+        "currency": profile.get("Currency"),
+        "meal_plan_count": latest_plan.pop("PlanCount") if latest_plan else 0,
+        "latest_meal_plan": latest_plan,
+        "quick_recipes": quick_recipes,
+    }
+
+
+def _admin(cursor, user_id):
+    checks = latest_results()
+
+    cursor.execute(
+        f"""
+        SELECT AlertID, AlertType, Severity, Message, CreatedAt, Status,
+               COUNT(*) OVER () AS OpenCount
+        FROM SystemAlert
+        WHERE {OPEN_ALERT_CONDITION}
+        ORDER BY CreatedAt DESC
+        LIMIT %s
+        """,
+        (TOP_LIMIT,),
+    )
+    alerts = cursor.fetchall()
+
+    cursor.execute(
+        """
+        SELECT COALESCE(Status, 'Unknown') AS Status, COUNT(*) AS RecipeCount
+        FROM Recipe
+        GROUP BY COALESCE(Status, 'Unknown')
+        ORDER BY Status
+        """
+    )
+    recipes_by_status = {row["Status"]: row["RecipeCount"] for row in cursor.fetchall()}
+
+    return {
+        "data_quality_issues": sum(c["issue_count"] or 0 for c in checks),
+        "data_quality": {c["name"]: c["issue_count"] for c in checks},
+        "open_alert_count": alerts[0]["OpenCount"] if alerts else 0,
+        "recent_open_alerts": [{k: v for k, v in a.items() if k != "OpenCount"} for a in alerts],
+        "recipes_by_status": recipes_by_status,
+    }
+
+
+def _analyst(cursor, user_id):
+    cursor.execute(
+        """
+        SELECT (SELECT SUM(WastedAmount) FROM WasteStatistic) AS TotalWaste,
+               (SELECT SUM(UsageCount) FROM RecipeUsageStatistic) AS TotalUsage,
+               (SELECT SUM(UniqueUsers) FROM RecipeUsageStatistic) AS TotalUniqueUsers,
+               (SELECT COUNT(*) FROM DemographicSegment) AS SegmentCount
+        """
+    )
+    totals = cursor.fetchone()
+
+    cursor.execute(
+        """
+        SELECT ws.IngredientID, c.CategoryName, SUM(ws.WastedAmount) AS TotalWastedAmount
+        FROM WasteStatistic ws
+        LEFT JOIN Ingredient i ON ws.IngredientID = i.IngredientID
+        LEFT JOIN Category c ON i.CategoryID = c.CategoryID
+        GROUP BY ws.IngredientID, c.CategoryName
+        ORDER BY TotalWastedAmount DESC
+        LIMIT %s
+        """,
+        (TOP_LIMIT,),
+    )
+    top_wasted = cursor.fetchall()
+
+    cursor.execute(
+        """
+        SELECT rus.RecipeID, r.Name, SUM(rus.UsageCount) AS TotalUsageCount
+        FROM RecipeUsageStatistic rus
+        JOIN Recipe r ON rus.RecipeID = r.RecipeId
+        GROUP BY rus.RecipeID, r.Name
+        ORDER BY TotalUsageCount DESC
+        LIMIT %s
+        """,
+        (TOP_LIMIT,),
+    )
+    top_recipes = cursor.fetchall()
+
+    return {
+        "total_waste": totals["TotalWaste"],
+        "total_recipe_usage": totals["TotalUsage"],
+        "total_unique_users": totals["TotalUniqueUsers"],
+        "segment_count": totals["SegmentCount"],
+        "top_wasted_ingredients": top_wasted,
+        "top_recipes": top_recipes,
+    }
+
+
+# persona -> (builder, needs user_id, tables read)
+PERSONAS = {
+    "student": (_student, True, ("InventoryItem", "Recipe", "RecipeIngredient", "FavoriteRecipe")),
+    "health": (_health, True, ("UsersBudgetProfile", "UserBudgetProfile", "MealPlan", "MealPlanEntry", "Recipe")),
+    "admin": (_admin, False, ("DataQualityResult", "SystemAlert", "Recipe")),
+    "analyst": (_analyst, False, ("WasteStatistic", "RecipeUsageStatistic", "DemographicSegment", "Recipe")),
+}
+
+
+@dashboards_bp.route("/dashboards/<persona>", methods=["GET"])
+def get_dashboard(persona: str):
+    """
+    Everything a persona home page shows, in one call.
+    Personas: student, health (user_id required), admin, analyst.
+    """
+    try:
+        if persona not in PERSONAS:
+            return jsonify({"error": f"persona must be one of: {', '.join(PERSONAS)}"}), 404
+        build, needs_user, tables = PERSONAS[persona]
+
+        user_id = request.args.get("user_id", type=int)
+        if needs_user and not user_id:
+            return jsonify({"error": "user_id query parameter is required"}), 400
+        if not needs_user:
+            user_id = None
+
+        key = (persona, user_id, tuple(table_generations(tables).values()))
+        dashboard = _cache.get(key)
+        if dashboard is None:
+            cursor = db.get_db().cursor()  # type: ignore
+            try:
+                dashboard = build(cursor, user_id)
+            finally:
+                cursor.close()
+            dashboard = {"persona": persona, "user_id": user_id, **dashboard}
+            _cache.set(key, dashboard, current_app.config.get("DASHBOARD_CACHE_TTL_SECONDS", 15))
+
+        return jsonify(dashboard), 200
+    except Exception as e:
+        current_app.logger.error(f"Error in get_dashboard: {e}")
+        return jsonify({"error": str(e)}), 500
@@ -0,0 +1,197 @@
+#------------------------------------------------------------
+# Registry of data quality checks.
+#
+# Each check is a COUNT query (returning a single `cnt` column)
+# plus the tables it reads. The engine only re-runs a check when
+# one of those tables has changed since the last run. A check may
+# also define a sample query (returning an `id` column) so the
+# admin page can point at concrete offending rows.
+#------------------------------------------------------------
+
+CHECKS: dict[str, dict] = {}
+
+SAMPLE_LIMIT = 20
+
+
+def register_check(name, label, tables, count_sql, sample_sql=None):
+    """Add (or replace) a data quality check in the registry."""
+    CHECKS[name] = {
+        "name": name,
+        "label": label,
+        "tables": tuple(tables),
+        "count_sql": count_sql,
+        "sample_sql": sample_sql,
+    }
+
+
+# --------------- Orphans --------------------
+
+# Should be 0 because of the FK, but rows loaded with FOREIGN_KEY_CHECKS=0 slip through
+register_check(
+    "orphan_inventory_items",
+    "Inventory rows referencing missing ingredients",
+    ["InventoryItem", "Ingredient"],
+    """
+    SELECT COUNT(*) AS cnt
+    FROM InventoryItem ii
+    LEFT JOIN Ingredient i ON ii.IngredientID = i.IngredientID
+    WHERE i.IngredientID IS NULL
+    """,
+    """
+    SELECT DISTINCT ii.IngredientID AS id
+    FROM InventoryItem ii
+    LEFT JOIN Ingredient i ON ii.IngredientID = i.IngredientID
+    WHERE i.IngredientID IS NULL
+    """,
+)
+
+register_check(
+    "orphan_meal_plan_entries",
+    "Meal plan entries referencing missing recipes",
+    ["MealPlanEntry", "Recipe"],
+    """
+    SELECT COUNT(*) AS cnt
+    FROM MealPlanEntry e
+    LEFT JOIN Recipe r ON e.RecipeID = r.RecipeId
+    WHERE e.RecipeID IS NOT NULL AND r.RecipeId IS NULL
+    """,
+    """
+    SELECT DISTINCT e.MealPlanID AS id
+    FROM MealPlanEntry e
+    LEFT JOIN Recipe r ON e.RecipeID = r.RecipeId
+    WHERE e.RecipeID IS NOT NULL AND r.RecipeId IS NULL
+    """,
+)
+
+
+# --------------- Recipes & ingredients --------------------
+
+register_check(
+    "recipes_without_ingredients",
+    "Recipes with no ingredients",
+    ["Recipe", "RecipeIngredient"],
+    """
+    SELECT COUNT(*) AS cnt
+    FROM Recipe r
+    LEFT JOIN RecipeIngredient ri ON r.RecipeId = ri.RecipeID
+    WHERE ri.RecipeID IS NULL
+    """,
+    """
+    SELECT r.RecipeId AS id
+    FROM Recipe r
+    LEFT JOIN RecipeIngredient ri ON r.RecipeId = ri.RecipeID
+    WHERE ri.RecipeID IS NULL
+    ORDER BY r.RecipeId
+    """,
+)
+
+register_check(
+    "unused_ingredients",
+    "Ingredients never used in any recipe",
+    ["Ingredient", "RecipeIngredient"],
+    """
+    SELECT COUNT(*) AS cnt
+    FROM Ingredient i
+    LEFT JOIN RecipeIngredient ri ON i.IngredientID = ri.IngredientID
+    WHERE ri.IngredientID IS NULL
+    """,
+    """
+    SELECT i.IngredientID AS id
+    FROM Ingredient i
+    LEFT JOIN RecipeIngredient ri ON i.IngredientID = ri.IngredientID
+    WHERE ri.IngredientID IS NULL
+    ORDER BY i.IngredientID
+    """,
+)
+
+register_check(
+    "negative_quantities",
+    "Inventory or recipe quantities below zero",
+    ["InventoryItem", "RecipeIngredient"],
+    """
+    SELECT (SELECT COUNT(*) FROM InventoryItem WHERE Quantity < 0)
+         + (SELECT COUNT(*) FROM RecipeIngredient WHERE RequiredQuantity < 0) AS cnt
+    """,
+    """
+    SELECT IngredientID AS id FROM InventoryItem WHERE Quantity < 0
+    UNION
+    SELECT IngredientID AS id FROM RecipeIngredient WHERE RequiredQuantity < 0
+    """,
+)
+
+register_check(
+    "unit_mismatches",
+    "Ingredients recorded with more than one unit",
+    ["InventoryItem", "RecipeIngredient"],
+    """
+    SELECT COUNT(*) AS cnt
+    FROM (
+        SELECT u.IngredientID
+        FROM (
+            SELECT IngredientID, LOWER(TRIM(Unit)) AS Unit
+            FROM RecipeIngredient WHERE Unit IS NOT NULL
+            UNION
+            SELECT IngredientID, LOWER(TRIM(Unit)) AS Unit
+            FROM InventoryItem WHERE Unit IS NOT NULL
+        ) u
+        GROUP BY u.IngredientID
+        HAVING COUNT(DISTINCT u.Unit) > 1
+    ) mismatched
+    """,
+    """
+    SELECT u.IngredientID AS id
+    FROM (
+        SELECT IngredientID, LOWER(TRIM(Unit)) AS Unit
+        FROM RecipeIngredient WHERE Unit IS NOT NULL
+        UNION
+        SELECT IngredientID, LOWER(TRIM(Unit)) AS Unit
+        FROM InventoryItem WHERE Unit IS NOT NULL
+    ) u
+    GROUP BY u.IngredientID
+    HAVING COUNT(DISTINCT u.Unit) > 1
+    ORDER BY u.IngredientID
+    """,
+)
+
+
+# --------------- Dates & categories --------------------
+
+register_check(
+    "impossible_dates",
+    "Rows whose end date is before their start date",
+    ["InventoryItem", "MealPlan", "Recipe", "TimePeriod"],
+    """
+    SELECT (SELECT COUNT(*) FROM InventoryItem WHERE ExpirationDate < AddedDate)
+         + (SELECT COUNT(*) FROM MealPlan WHERE EndDate < StartDate)
+         + (SELECT COUNT(*) FROM Recipe WHERE LastUpdateAt < CreatedAt)
+         + (SELECT COUNT(*) FROM TimePeriod WHERE EndDate < StartDate) AS cnt
+    """,
+)
+
+register_check(
+    "duplicate_category_names",
+    "Categories sharing a name with another category",
+    ["Category"],
+    """
+    SELECT COALESCE(SUM(d.cnt - 1), 0) AS cnt
+    FROM (
+        SELECT COUNT(*) AS cnt
+        FROM Category
+        WHERE CategoryName IS NOT NULL
+        GROUP BY LOWER(TRIM(CategoryName))
+        HAVING COUNT(*) > 1
+    ) d
+    """,
+    """
+    SELECT c.CategoryID AS id
+    FROM Category c
+    JOIN (
+        SELECT LOWER(TRIM(CategoryName)) AS norm_name, MIN(CategoryID) AS keep_id
+        FROM Category
+        WHERE CategoryName IS NOT NULL
+        GROUP BY LOWER(TRIM(CategoryName))
+        HAVING COUNT(*) > 1
+    ) d ON LOWER(TRIM(c.CategoryName)) = d.norm_name AND c.CategoryID <> d.keep_id
+    ORDER BY c.CategoryID
+    """,
+)
@@ -0,0 +1,128 @@
+#------------------------------------------------------------
+# Runs registered data quality checks and persists the results
+# in DataQualityResult, so the report endpoint can serve the
+# latest numbers without re-scanning whole tables.
+#------------------------------------------------------------
+import threading
+import time
+
+from flask import current_app
+
+from backend.db_connection import db
+from backend.db_connection.change_markers import mark_tables_changed, table_generations
+from backend.data_quality.checks import CHECKS, SAMPLE_LIMIT
+
+
+_run_lock = threading.Lock()
+
+# check name -> {"generations": {...}, "ran_at": monotonic seconds}
+_last_runs: dict[str, dict] = {}
+
+
+def _is_stale(check, max_age_seconds) -> bool:
+    last = _last_runs.get(check["name"])
+    if last is None:
+        return True
+    if last["generations"] != table_generations(check["tables"]):
+        return True
+    # Changes made outside the API (manual SQL, bulk loads) leave no marker
+    return max_age_seconds > 0 and time.monotonic() - last["ran_at"] >= max_age_seconds
+
+
+def run_checks(names=None, force=False) -> list[str]:
+    """
+    Run the given checks (default: all registered checks) and persist results.
+    Unless force=True, checks whose tables have not changed since their last
+    run are skipped. Returns the names of the checks that actually ran.
+    """
+    names = list(names) if names else list(CHECKS)
+    max_age = current_app.config.get("DATA_QUALITY_MAX_AGE_SECONDS", 3600)
+
+    ran = []
+    with _run_lock:
+        conn = db.get_db()
+        cursor = conn.cursor()  # type: ignore
+        try:
+            for name in names:
+                check = CHECKS[name]
+                if not force and not _is_stale(check, max_age):
+                    continue
+
+                # Snapshot markers first: writes landing mid-run make the check stale again
+                generations = table_generations(check["tables"])
+                started = time.perf_counter()
+
+                cursor.execute(check["count_sql"])
+                issue_count = int(cursor.fetchone()["cnt"] or 0)
+
+                sample_ids = None
+                if check["sample_sql"] and issue_count:
+                    cursor.execute(
+                        f"SELECT s.id FROM ({check['sample_sql']}) s LIMIT {SAMPLE_LIMIT}"
+                    )
+                    sample_ids = ",".join(str(r["id"]) for r in cursor.fetchall())
+
+                duration_ms = (time.perf_counter() - started) * 1000
+                cursor.execute(
+                    """
+                    INSERT INTO DataQualityResult
+                        (CheckName, IssueCount, SampleIDs, CheckedAt, DurationMs)
+                    VALUES (%s, %s, %s, NOW(), %s) AS new
+                    ON DUPLICATE KEY UPDATE
+                        IssueCount = new.IssueCount,
+                        SampleIDs = new.SampleIDs,
+                        CheckedAt = new.CheckedAt,
+                        DurationMs = new.DurationMs
+                    """,
+                    (name, issue_count, sample_ids, round(duration_ms, 2)),
+                )
+                conn.commit()  # type: ignore
+                mark_tables_changed("DataQualityResult")
+
+                _last_runs[name] = {
+                    "generations": generations,
+                    "ran_at": time.monotonic(),
+                }
+                ran.append(name)
+        finally:
+            cursor.close()
+
+    if ran:
+        current_app.logger.info(f"Data quality checks ran: {', '.join(ran)}")
+    return ran
+
+
+def latest_results() -> list[dict]:
+    """Return the persisted result of every registered check, in registry order."""
+    conn = db.get_db()
+    cursor = conn.cursor()  # type: ignore
+    cursor.execute(
+        """
+        SELECT CheckName, IssueCount, SampleIDs, CheckedAt, DurationMs
+        FROM DataQualityResult
+        """
+    )
+    rows = {row["CheckName"]: row for row in cursor.fetchall()}
+    cursor.close()
+
+    results = []
+    for name, check in CHECKS.items():
+        row = rows.get(name)
+        if row is None:
+            continue
+        results.append(
+            {
+                "name": name,
+                "label": check["label"],
+                "issue_count": row["IssueCount"],
+                "sample_ids": row["SampleIDs"].split(",") if row["SampleIDs"] else [],
+                "checked_at": row["CheckedAt"],
+                "duration_ms": row["DurationMs"],
+            }
+        )
+    return results
+
+
+def run_scheduled_checks() -> None:
+    """Background entry point: only re-run checks with changed inputs."""
+    run_checks()
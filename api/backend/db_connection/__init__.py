@@ -2,9 +2,10 @@
 # This file creates a shared DB connection resource
 #------------------------------------------------------------
 from flaskext.mysql import MySQL
-from pymysql import cursors
+
+from backend.db_connection.instrumented_cursor import InstrumentedCursor, InstrumentedTupleCursor
 
 
 # the parameter instructs the connection to return data 
-# as a dictionary object. 
-db = MySQL(cursorclass=cursors.DictCursor)
\ No newline at end of file
+# as a dictionary object (timed, see instrumented_cursor). 
+db = MySQL(cursorclass=InstrumentedCursor)
@@ -0,0 +1,36 @@
+#------------------------------------------------------------
+# In-process change markers for tables written through the API.
+#
+# Write routes call mark_tables_changed(...) right after they
+# commit. Anything that caches derived data (data quality
+# checks, response caches, ...) can compare generations to
+# decide whether its cached view of a table is still current;
+# listeners hear about every change (e.g. to tell other
+# processes).
+#------------------------------------------------------------
+import threading
+
+
+_lock = threading.Lock()
+_generations: dict[str, int] = {}
+_listeners = []
+
+
+def add_change_listener(func) -> None:
+    """Call func(tables) after every mark_tables_changed(*tables)."""
+    _listeners.append(func)
+
+
+def mark_tables_changed(*tables: str) -> None:
+    """Bump the generation counter of every given table."""
+    with _lock:
+        for table in tables:
+            _generations[table] = _generations.get(table, 0) + 1
+    for func in _listeners:
+        func(tables)
+
+
+def table_generations(tables) -> dict[str, int]:
+    """Return the current generation of each table (0 = never written)."""
+    with _lock:
+        return {table: _generations.get(table, 0) for table in tables}
@@ -0,0 +1,54 @@
+#------------------------------------------------------------
+# Cursors that time every statement they send: the DictCursor
+# used by default, and a tuple cursor for results that go
+# straight to JSON (see backend.serialization.json_provider).
+#
+# Per app context (one per request, or per background job run)
+# it accumulates the statement count and time spent in MySQL
+# on flask.g; every statement is also recorded under its SQL
+# fingerprint, and slow ones are EXPLAINed into the slow-query
+# log (see backend.observability.sql_stats). Statements run by
+# a traced request also become spans of its trace.
+#------------------------------------------------------------
+import time
+
+from flask import g, has_app_context
+from pymysql import cursors
+
+from backend.observability import sql_stats, tracing
+
+
+def db_totals() -> tuple[int, float]:
+    """(statement count, seconds spent in MySQL) for the current app context."""
+    return g.get("db_queries", 0), g.get("db_seconds", 0.0)
+
+
+class _Timed:
+    # executemany() sends its statements through execute(), so this sees them all
+    def execute(self, query, args=None):
+        started = time.perf_counter()
+        started_ns = time.time_ns()
+        failed = True
+        try:
+            result = super().execute(query, args)
+            failed = False
+            return result
+        finally:
+            elapsed = time.perf_counter() - started
+            sql = query.decode(errors="replace") if isinstance(query, bytes) else query
+            sql_stats.record(sql, elapsed)
+            if has_app_context():
+                tracing.record_db_span(sql, started_ns, started_ns + int(elapsed * 1e9), failed)
+                g.db_queries = g.get("db_queries", 0) + 1
+                g.db_seconds = g.get("db_seconds", 0.0) + elapsed
+                threshold = sql_stats.slow_query_threshold_seconds()
+                if threshold and elapsed >= threshold:
+                    sql_stats.capture_slow_query(self, sql, args, elapsed)
+
+
+class InstrumentedCursor(_Timed, cursors.DictCursor):
+    pass
+
+
+class InstrumentedTupleCursor(_Timed, cursors.Cursor):
+    pass
@@ -0,0 +1,38 @@
+#------------------------------------------------------------
+# Sparse fieldsets: ?fields=Name,PrepTimeMinutes,...
+#
+# A route lists the fields it can return as {field: SQL
+# expression}. requested_fields() validates ?fields= against
+# that list and select_list() turns the chosen fields into the
+# statement's SELECT list, so columns nobody asked for (e.g. a
+# recipe's Instructions) are never read from MySQL. Without
+# ?fields= every field is returned, in the usual order.
+#------------------------------------------------------------
+from flask import request
+
+
+def requested_fields(available) -> list[str]:
+    """
+    The fields named in ?fields= (first occurrence order), or all of
+    `available` when it is absent. Raises ValueError for unknown names.
+    """
+    raw = request.args.get("fields")
+    if raw is None:
+        return list(available)
+    fields = list(dict.fromkeys(f.strip() for f in raw.split(",") if f.strip()))
+    if not fields:
+        raise ValueError("fields must name at least one field")
+    unknown = [f for f in fields if f not in available]
+    if unknown:
+        raise ValueError(
+            f"Unknown field(s): {', '.join(unknown)}. Available fields: {', '.join(available)}"
+        )
+    return fields
+
+
+def select_list(columns: dict, fields) -> str:
+    """SELECT list for the given fields; `columns` maps each field to its SQL expression."""
+    return ",\n".join(
+        columns[f] if columns[f] == f else f"{columns[f]} AS {f}"
+        for f in fields if f in columns
+    )
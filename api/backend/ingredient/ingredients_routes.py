@@ -1,5 +1,9 @@
 from flask import Blueprint, request, jsonify, current_app
-from backend.db_connection import db
+from backend.db_connection import db, InstrumentedTupleCursor
+from backend.db_connection.change_markers import mark_tables_changed
+from backend.serialization.json_provider import fetch_rows
+from backend.serialization.columnar import rows_route
+from backend.cache.response_cache import cached_response
 
 
 ingredients_bp = Blueprint("ingredients_bp", __name__)
@@ -33,6 +37,8 @@ def _get_single_value(row, key_if_dict, index_if_tuple=0):
 
 
 @ingredients_bp.route("/categories", methods=["GET"])
+@cached_response("Category")
+@rows_route
 def get_categories():
     """
     Return all categories.
@@ -43,7 +49,7 @@ def get_categories():
     """
     try:
         conn = db.get_db()
-        cursor = conn.cursor()  # type: ignore
+        cursor = conn.cursor(InstrumentedTupleCursor)  # type: ignore
         cursor.execute(
             """
             SELECT CategoryID, CategoryName
@@ -51,7 +57,7 @@ def get_categories():
             ORDER BY CategoryName
             """
         )
-        rows = cursor.fetchall()
+        rows = fetch_rows(cursor)
         cursor.close()
         return jsonify(rows), 200
     except Exception as e:
@@ -123,6 +129,7 @@ def create_category():
             (category_id, category_name),
         )
         conn.commit()  # type: ignore
+        mark_tables_changed("Category")
         cursor.close()
 
 
@@ -150,6 +157,8 @@ def create_category():
 
 
 @ingredients_bp.route("/ingredients", methods=["GET"])
+@cached_response("Ingredient", "Category")
+@rows_route
 def get_ingredients():
     """
     Get all ingredients, optionally filtered by category_id.
@@ -171,7 +180,7 @@ def get_ingredients():
 
 
         conn = db.get_db()
-        cursor = conn.cursor()  # type: ignore
+        cursor = conn.cursor(InstrumentedTupleCursor)  # type: ignore
 
 
         base_query = """
@@ -192,7 +201,7 @@ def get_ingredients():
 
 
         cursor.execute(base_query, tuple(params))
-        rows = cursor.fetchall()
+        rows = fetch_rows(cursor)
         cursor.close()
         return jsonify(rows), 200
     except Exception as e:
@@ -320,6 +329,7 @@ def create_ingredient():
 
 
         conn.commit()  # type: ignore
+        mark_tables_changed("Ingredient", "Category")
         cursor.close()
 
 
@@ -411,6 +421,7 @@ def update_ingredient(ingredient_id: int):
             (category_id, ingredient_id),
         )
         conn.commit()  # type: ignore
+        mark_tables_changed("Ingredient", "Category")
         affected = cursor.rowcount
         cursor.close()
 
@@ -444,6 +455,7 @@ def delete_ingredient(ingredient_id: int):
             (ingredient_id,),
         )
         conn.commit()  # type: ignore
+        mark_tables_changed("Ingredient")
         affected = cursor.rowcount
         cursor.close()
 
@@ -1,10 +1,38 @@
 from flask import Blueprint, request, jsonify, current_app
 from datetime import datetime
-from backend.db_connection import db
+from backend.db_connection import db, InstrumentedTupleCursor
+from backend.db_connection.change_markers import mark_tables_changed
+from backend.db_connection.projection import requested_fields, select_list
+from backend.serialization.json_provider import fetch_rows
+from backend.serialization.columnar import rows_route
 
 
 inventory_bp = Blueprint("inventory_bp", __name__)
 
+# ?fields= of the inventory list routes: field -> SQL expression
+INVENTORY_FIELDS = {
+    "UserID": "ii.UserID",
+    "IngredientID": "ii.IngredientID",
+    "AddedDate": "ii.AddedDate",
+    "Quantity": "ii.Quantity",
+    "Unit": "ii.Unit",
+    "ExpirationDate": "ii.ExpirationDate",
+    "Status": "ii.Status",
+    "CategoryID": "i.CategoryID",
+    "CategoryName": "c.CategoryName",
+}
+EXPIRING_FIELDS = {
+    **{k: v for k, v in INVENTORY_FIELDS.items() if k not in ("CategoryID", "CategoryName")},
+    "days_to_expire": "DATEDIFF(ii.ExpirationDate, CURDATE())",
+    "CategoryID": "i.CategoryID",
+    "CategoryName": "c.CategoryName",
+}
+
+
+def _category_join(fields) -> str:
+    # A LEFT JOIN on Category's key never changes the row count, so skip it when unused
+    return "LEFT JOIN Category c ON i.CategoryID = c.CategoryID" if "CategoryName" in fields else ""
+
 # ---------------------------------------------------------
 # Helper: normalize added_date to YYYY-MM-DD for MySQL
 # ---------------------------------------------------------
@@ -51,38 +79,36 @@ def _normalize_added_date(raw: str | None) -> str | None:
 # GET all inventory items for a user
 # ---------------------------------------------------------
 @inventory_bp.route("/inventory-items", methods=["GET"])
+@rows_route
 def get_inventory_items():
     """
     Get all inventory items for a given user.
     Expects query param: user_id
+    Optional: fields (e.g. IngredientID,Quantity,ExpirationDate)
     """
     try:
         user_id = request.args.get("user_id", type=int)
         if not user_id:
             return jsonify({"error": "user_id query parameter is required"}), 400
 
+        try:
+            fields = requested_fields(INVENTORY_FIELDS)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
 
         conn = db.get_db()
-        cursor = conn.cursor()  # type: ignore
-        query = """
-            SELECT
-                ii.UserID,
-                ii.IngredientID,
-                ii.AddedDate,
-                ii.Quantity,
-                ii.Unit,
-                ii.ExpirationDate,
-                ii.Status,
-                i.CategoryID,
-                c.CategoryName
+        cursor = conn.cursor(InstrumentedTupleCursor)  # type: ignore
+        query = f"""
+            SELECT {select_list(INVENTORY_FIELDS, fields)}
             FROM InventoryItem ii
             JOIN Ingredient i ON ii.IngredientID = i.IngredientID
-            LEFT JOIN Category c ON i.CategoryID = c.CategoryID
+            {_category_join(fields)}
             WHERE ii.UserID = %s
             ORDER BY ii.ExpirationDate IS NULL, ii.ExpirationDate
         """
         cursor.execute(query, (user_id,))
-        rows = cursor.fetchall()
+        rows = fetch_rows(cursor)
         cursor.close()
         return jsonify(rows), 200
     except Exception as e:
@@ -176,6 +202,7 @@ def create_inventory_item():
                 ),
             )
             conn.commit()  # type: ignore
+            mark_tables_changed("InventoryItem")
             cursor.close()
             return (
                 jsonify(
@@ -198,6 +225,7 @@ def create_inventory_item():
             (user_id, ingredient_id, quantity, unit, expiration_date, status),
         )
         conn.commit()  # type: ignore
+        mark_tables_changed("InventoryItem")
         cursor.close()
         return jsonify({"message": "Inventory item created"}), 201
 
@@ -268,6 +296,7 @@ def update_inventory_item(ingredient_id: int):
         """
         cursor.execute(query, tuple(params))
         conn.commit()  # type: ignore
+        mark_tables_changed("InventoryItem")
         affected = cursor.rowcount
         cursor.close()
 
@@ -324,6 +353,7 @@ def delete_inventory_item(ingredient_id: int):
         """
         cursor.execute(query, (user_id, ingredient_id, added_date))
         conn.commit()  # type: ignore
+        mark_tables_changed("InventoryItem")
         affected = cursor.rowcount
         cursor.close()
 
@@ -344,44 +374,41 @@ def delete_inventory_item(ingredient_id: int):
 # GET expiring inventory items
 # ---------------------------------------------------------
 @inventory_bp.route("/inventory-items/expiring", methods=["GET"])
+@rows_route
 def get_expiring_inventory_items():
     """
     Get inventory items for a user that are near or past their expiration date.
-    Query params: user_id (required), days_ahead (optional, default 7)
+    Query params: user_id (required), days_ahead (optional, default 7),
+    fields (optional)
     """
     try:
         user_id = request.args.get("user_id", type=int)
         if not user_id:
             return jsonify({"error": "user_id query parameter is required"}), 400
 
+        try:
+            fields = requested_fields(EXPIRING_FIELDS)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
 
         days_ahead = request.args.get("days_ahead", default=7, type=int)
 
 
         conn = db.get_db()
-        cursor = conn.cursor()  # type: ignore
-        query = """
-            SELECT
-                ii.UserID,
-                ii.IngredientID,
-                ii.AddedDate,
-                ii.Quantity,
-                ii.Unit,
-                ii.ExpirationDate,
-                ii.Status,
-                DATEDIFF(ii.ExpirationDate, CURDATE()) AS days_to_expire,
-                i.CategoryID,
-                c.CategoryName
+        cursor = conn.cursor(InstrumentedTupleCursor)  # type: ignore
+        query = f"""
+            SELECT {select_list(EXPIRING_FIELDS, fields)}
             FROM InventoryItem ii
             JOIN Ingredient i ON ii.IngredientID = i.IngredientID
-            LEFT JOIN Category c ON i.CategoryID = c.CategoryID
+            {_category_join(fields)}
             WHERE ii.UserID = %s
               AND ii.ExpirationDate IS NOT NULL
               AND ii.ExpirationDate <= DATE_ADD(CURDATE(), INTERVAL %s DAY)
             ORDER BY ii.ExpirationDate
         """
         cursor.execute(query, (user_id, days_ahead))
-        rows = cursor.fetchall()
+        rows = fetch_rows(cursor)
         cursor.close()
         return jsonify(rows), 200
     except Exception as e:
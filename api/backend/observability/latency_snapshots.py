@@ -0,0 +1,97 @@
+#------------------------------------------------------------
+# Periodically turns the request metrics into MetricSnapshot
+# points (latency p50/p95, request rate, 5xx share) so the
+# System Health page can chart the API's own performance.
+# Points go through the ingest buffer, so alert rules and
+# rollups apply to them like to any other metric.
+#------------------------------------------------------------
+import time
+from datetime import datetime
+
+from flask import current_app
+
+from backend.db_connection import db
+from backend.db_connection.change_markers import mark_tables_changed
+from backend.analytics.ingest import snapshot_buffer
+from backend.observability.metrics import quantile_from_buckets
+from backend.observability.middleware import REQUEST_LATENCY, REQUESTS_TOTAL
+
+
+# key -> (SystemMetric.Name, Description)
+SUMMARY_METRICS = {
+    "p50": ("API Latency p50 (ms)", "Median API request latency over the last interval."),
+    "p95": ("API Latency p95 (ms)", "95th percentile API request latency over the last interval."),
+    "rate": ("API Request Rate (req/s)", "API requests handled per second over the last interval."),
+    "errors": ("API Error Rate (%)", "Share of API responses with a 5xx status over the last interval."),
+}
+
+_metric_ids: dict[str, int] = {}
+_previous = None
+
+
+def _ensure_metric_ids(cursor, conn) -> dict[str, int]:
+    """Look up (and create on first use) the SystemMetric rows written to."""
+    if len(_metric_ids) == len(SUMMARY_METRICS):
+        return _metric_ids
+
+    names = [name for name, _ in SUMMARY_METRICS.values()]
+    placeholders = ", ".join(["%s"] * len(names))
+    cursor.execute(
+        f"SELECT MetricID, Name FROM SystemMetric WHERE Name IN ({placeholders})", tuple(names)
+    )
+    by_name = {row["Name"]: row["MetricID"] for row in cursor.fetchall()}
+
+    created = False
+    for key, (name, description) in SUMMARY_METRICS.items():
+        if name not in by_name:
+            cursor.execute("SELECT COALESCE(MAX(MetricID), 0) + 1 AS next_id FROM SystemMetric")
+            by_name[name] = cursor.fetchone()["next_id"]
+            cursor.execute(
+                "INSERT INTO SystemMetric (MetricID, Name, Description) VALUES (%s, %s, %s)",
+                (by_name[name], name, description),
+            )
+            created = True
+        _metric_ids[key] = by_name[name]
+
+    if created:
+        conn.commit()  # type: ignore
+        mark_tables_changed("SystemMetric")
+    return _metric_ids
+
+
+def write_latency_snapshots() -> None:
+    """Background entry point: summarize requests since the previous run."""
+    global _previous
+    counts, _ = REQUEST_LATENCY.totals()
+    total = REQUESTS_TOTAL.total()
+    errors = REQUESTS_TOTAL.total(lambda labels: labels["status"].startswith("5"))
+    now = time.monotonic()
+
+    previous, _previous = _previous, (counts, total, errors, now)
+    if previous is None:
+        return
+
+    interval_counts = [a - b for a, b in zip(counts, previous[0])]
+    interval_total = total - previous[1]
+    interval_errors = errors - previous[2]
+    elapsed = now - previous[3]
+
+    values = {"rate": round(interval_total / elapsed, 2) if elapsed > 0 else 0.0}
+    if interval_total:
+        values["errors"] = round(100.0 * interval_errors / interval_total, 2)
+        for key, q in (("p50", 0.5), ("p95", 0.95)):
+            seconds = quantile_from_buckets(REQUEST_LATENCY.buckets, interval_counts, q)
+            if seconds is not None:
+                values[key] = round(seconds * 1000, 2)
+
+    conn = db.get_db()
+    cursor = conn.cursor()  # type: ignore
+    try:
+        metric_ids = _ensure_metric_ids(cursor, conn)
+    finally:
+        cursor.close()
+
+    measured_at = datetime.now().replace(microsecond=0)
+    points = [(metric_ids[key], measured_at, value) for key, value in values.items()]
+    if not snapshot_buffer.offer(points):
+        current_app.logger.warning("API latency snapshots dropped: ingest buffer is full")
@@ -0,0 +1,176 @@
+#------------------------------------------------------------
+# Non-blocking, structured logging.
+#
+# Request threads only put records on a bounded queue (records
+# that do not fit are dropped and counted); a QueueListener
+# thread formats them as JSON lines and writes them to stdout.
+# Records logged during a request carry its request id, trace
+# id, method and route, and every request ends with one access
+# record holding status, latency and DB time. INFO and below
+# can be sampled on hot routes (LOG_SAMPLED_ROUTES) so they do
+# not flood the log.
+#------------------------------------------------------------
+import atexit
+import copy
+import json
+import logging
+import queue
+import random
+import sys
+import time
+import uuid
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+
+from flask import g, has_request_context, request
+from flask.logging import default_handler
+
+from backend.db_connection.instrumented_cursor import db_totals
+from backend.observability.metrics import Counter
+from backend.observability.middleware import route_label
+
+
+REQUEST_ID_HEADER = "X-Request-ID"
+
+# Fields copied from a record (request context or extra=...) into the JSON line
+CONTEXT_FIELDS = (
+    "request_id", "trace_id", "method", "route", "status", "latency_ms", "db_ms", "db_queries",
+)
+
+LOG_RECORDS_DROPPED = Counter(
+    "log_records_dropped_total",
+    "Log records dropped because the logging queue was full.",
+)
+
+_listener = None
+_traceback_formatter = logging.Formatter()
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for field in CONTEXT_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class RequestContextFilter(logging.Filter):
+    """Runs on the caller's thread before queuing: adds request fields, applies sampling."""
+
+    def __init__(self, sample_rate: float, sampled_routes):
+        super().__init__()
+        self.sample_rate = sample_rate
+        self.sampled_routes = set(sampled_routes)
+
+    def filter(self, record) -> bool:
+        if not has_request_context():
+            return True
+        route = route_label()
+        if (
+            record.levelno <= logging.INFO
+            and route in self.sampled_routes
+            and random.random() >= self.sample_rate
+        ):
+            return False
+        record.request_id = g.get("request_id")
+        record.trace_id = g.get("trace_id")
+        record.method = request.method
+        record.route = route
+        return True
+
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that drops (and counts) records instead of blocking when full."""
+
+    def prepare(self, record):
+        # Merge args and render tracebacks now; the JSON formatting happens later
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = record.exc_text or _traceback_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_RECORDS_DROPPED.inc()
+
+
+def _stop_listener() -> None:
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def configure_logging(app) -> None:
+    """Route the app's and libraries' logging through the background writer."""
+    global _listener
+    _stop_listener()
+
+    level = logging.getLevelName(app.config.get("LOG_LEVEL", "INFO").upper())
+    if not isinstance(level, int):
+        level = logging.INFO
+
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(JsonFormatter())
+
+    log_queue = queue.Queue(maxsize=app.config.get("LOG_QUEUE_SIZE", 10000))
+    handler = DroppingQueueHandler(log_queue)
+    handler.addFilter(RequestContextFilter(
+        app.config.get("LOG_INFO_SAMPLE_RATE", 1.0),
+        app.config.get("LOG_SAMPLED_ROUTES", ()),
+    ))
+
+    root = logging.getLogger()
+    for existing in [h for h in root.handlers if isinstance(h, DroppingQueueHandler)]:
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(level)
+
+    # Let app.logger records reach the root handler instead of Flask's stderr handler
+    app.logger.removeHandler(default_handler)
+    app.logger.setLevel(level)
+
+    _listener = QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_stop_listener)
+
+
+def init_app(app) -> None:
+    """Assign request ids and write one access record per request."""
+
+    @app.before_request
+    def _assign_request_id():
+        g.request_id = request.headers.get(REQUEST_ID_HEADER) or uuid.uuid4().hex
+        g.log_started = time.perf_counter()
+
+    @app.after_request
+    def _log_request(response):
+        started = g.get("log_started")
+        if started is None:
+            return response
+        db_queries, db_seconds = db_totals()
+        response.headers[REQUEST_ID_HEADER] = g.request_id
+        app.logger.info(
+            "request completed",
+            extra={
+                "status": response.status_code,
+                "latency_ms": round((time.perf_counter() - started) * 1000, 2),
+                "db_ms": round(db_seconds * 1000, 2),
+                "db_queries": db_queries,
+            },
+        )
+        return response
@@ -0,0 +1,76 @@
+#------------------------------------------------------------
+# Request instrumentation: latency, DB-time and query-count
+# histograms per route, status code counters, an in-flight
+# gauge and a Server-Timing header on every response.
+#------------------------------------------------------------
+import time
+
+from flask import g, request
+
+from backend.db_connection.instrumented_cursor import db_totals
+from backend.observability.metrics import Counter, Gauge, Histogram
+
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Time spent handling a request, by route.",
+    labels=("method", "route"),
+)
+REQUEST_DB_TIME = Histogram(
+    "http_request_db_seconds",
+    "Time spent in MySQL while handling a request, by route.",
+    labels=("method", "route"),
+)
+REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "SQL statements issued while handling a request, by route.",
+    labels=("method", "route"),
+    buckets=(1, 2, 3, 5, 10, 20, 50, 100, 250),
+)
+REQUESTS_TOTAL = Counter(
+    "http_requests_total",
+    "Requests handled, by route and status code.",
+    labels=("method", "route", "status"),
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "Requests currently being handled.",
+)
+
+
+def route_label() -> str:
+    """URL rule of the current request (not the raw path, to keep label sets small)."""
+    return request.url_rule.rule if request.url_rule is not None else "unmatched"
+
+
+def init_app(app) -> None:
+    @app.before_request
+    def _start_timer():
+        g.request_started = time.perf_counter()
+        REQUESTS_IN_FLIGHT.inc()
+
+    @app.after_request
+    def _record_request(response):
+        started = g.get("request_started")
+        if started is None:
+            return response
+        elapsed = time.perf_counter() - started
+        db_queries, db_seconds = db_totals()
+        route = route_label()
+
+        REQUEST_LATENCY.observe(elapsed, method=request.method, route=route)
+        REQUEST_DB_TIME.observe(db_seconds, method=request.method, route=route)
+        REQUEST_DB_QUERIES.observe(db_queries, method=request.method, route=route)
+        REQUESTS_TOTAL.inc(method=request.method, route=route, status=response.status_code)
+
+        response.headers.add(
+            "Server-Timing",
+            f'db;dur={db_seconds * 1000:.1f};desc="{db_queries} queries", '
+            f"total;dur={elapsed * 1000:.1f}",
+        )
+        return response
+
+    @app.teardown_request
+    def _end_request(exception=None):
+        if g.pop("request_started", None) is not None:
+            REQUESTS_IN_FLIGHT.dec()
@@ -0,0 +1,106 @@
+import os
+
+from flask import Blueprint, Response, request, jsonify, current_app, send_file
+
+from backend.cache.response_cache import response_cache
+from backend.serialization import compression
+from backend.observability.metrics import render_prometheus
+from backend.observability.sql_stats import summary
+from backend.observability.profiling import (
+    PROFILE_HEADER,
+    list_profiles,
+    profile_as_text,
+    profile_path,
+    token_matches,
+)
+
+observability_bp = Blueprint("observability_bp", __name__)
+
+
+@observability_bp.route("/metrics", methods=["GET"])
+def get_metrics():
+    """
+    Prometheus text exposition of the API's request and DB metrics.
+    """
+    return Response(render_prometheus(), mimetype="text/plain; version=0.0.4")
+
+
+@observability_bp.route("/metrics/sql", methods=["GET"])
+def get_sql_stats():
+    """
+    SQL statement fingerprints with count, total/max and p50/p95 latency (ms).
+    Query params:
+      - order_by (optional: total_ms | p95_ms | p50_ms | max_ms | count, default total_ms)
+      - limit (optional, default 20)
+    """
+    try:
+        order_by = request.args.get("order_by", "total_ms")
+        limit = request.args.get("limit", 20, type=int)
+        if order_by not in {"total_ms", "p95_ms", "p50_ms", "max_ms", "count"}:
+            return jsonify({"error": "order_by must be one of: total_ms, p95_ms, p50_ms, max_ms, count"}), 400
+        return jsonify(summary(limit=limit, order_by=order_by)), 200
+    except Exception as e:
+        current_app.logger.error(f"Error in get_sql_stats: {e}")
+        return jsonify({"error": str(e)}), 500
+
+
+@observability_bp.route("/metrics/cache", methods=["GET"])
+def get_cache_stats():
+    """
+    Response cache hits, misses and hit ratio per route (since startup).
+    """
+    return jsonify(response_cache.stats()), 200
+
+
+@observability_bp.route("/metrics/compression", methods=["GET"])
+def get_compression_stats():
+    """
+    Compressed responses, bytes in/out, ratio and CPU cost per encoding (since startup).
+    """
+    return jsonify(compression.stats()), 200
+
+
+def _profiles_dir():
+    return os.path.abspath(current_app.config.get("PROFILE_DIR", "logs/profiles"))
+
+
+@observability_bp.route("/admin/profiles", methods=["GET"])
+def get_profiles():
+    """
+    List stored request profiles, newest first.
+    Requires the X-Profile-Token header.
+    """
+    try:
+        if not token_matches(current_app, request.headers.get(PROFILE_HEADER)):
+            return jsonify({"error": "Missing or invalid profile token"}), 403
+        return jsonify(list_profiles(_profiles_dir())), 200
+    except Exception as e:
+        current_app.logger.error(f"Error in get_profiles: {e}")
+        return jsonify({"error": str(e)}), 500
+
+
+@observability_bp.route("/admin/profiles/<name>", methods=["GET"])
+def download_profile(name: str):
+    """
+    Download a stored profile (.prof, pstats format).
+    Query params:
+      - format (optional: text) -> top functions as plain text instead
+      - sort (optional, default cumulative) -> pstats sort key for format=text
+    Requires the X-Profile-Token header.
+    """
+    try:
+        if not token_matches(current_app, request.headers.get(PROFILE_HEADER)):
+            return jsonify({"error": "Missing or invalid profile token"}), 403
+        path = profile_path(_profiles_dir(), name)
+        if path is None:
+            return jsonify({"error": "Profile not found"}), 404
+
+        if request.args.get("format") == "text":
+            sort = request.args.get("sort", "cumulative")
+            if sort not in {"cumulative", "tottime", "calls", "ncalls"}:
+                return jsonify({"error": "sort must be one of: cumulative, tottime, calls, ncalls"}), 400
+            return Response(profile_as_text(path, sort=sort), mimetype="text/plain")
+        return send_file(path, mimetype="application/octet-stream", as_attachment=True, download_name=name)
+    except Exception as e:
+        current_app.logger.error(f"Error in download_profile: {e}")
+        return jsonify({"error": str(e)}), 500
@@ -0,0 +1,125 @@
+#------------------------------------------------------------
+# Opt-in per-request profiling.
+#
+# A request is profiled with cProfile when it carries the
+# X-Profile-Token header matching PROFILE_SECRET, or when it is
+# picked by PROFILE_SAMPLE_RATE (0..1). Only that request's
+# thread is profiled. The result is dumped as a .prof file
+# (pstats format: snakeviz, flameprof, python -m pstats) into
+# PROFILE_DIR, which keeps the newest PROFILE_MAX_FILES files.
+#------------------------------------------------------------
+import cProfile
+import hmac
+import io
+import os
+import pstats
+import random
+import re
+import threading
+import time
+from datetime import datetime
+
+from flask import g, request
+
+from backend.observability.middleware import route_label
+
+
+PROFILE_HEADER = "X-Profile-Token"
+_SAFE_NAME = re.compile(r"^[\w.-]+\.prof$")
+
+_rotate_lock = threading.Lock()
+
+
+def token_matches(app, token) -> bool:
+    secret = app.config.get("PROFILE_SECRET")
+    return bool(secret) and token is not None and hmac.compare_digest(token, secret)
+
+
+def _should_profile(app) -> bool:
+    if token_matches(app, request.headers.get(PROFILE_HEADER)):
+        return True
+    rate = app.config.get("PROFILE_SAMPLE_RATE", 0.0)
+    return rate > 0 and random.random() < rate
+
+
+def _file_name(elapsed_ms: float) -> str:
+    slug = re.sub(r"[^\w]+", "_", route_label()).strip("_") or "root"
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+    return f"{stamp}_{request.method}_{slug}_{int(elapsed_ms)}ms.prof"
+
+
+def _rotate(directory: str, keep: int) -> None:
+    with _rotate_lock:
+        files = sorted(f for f in os.listdir(directory) if f.endswith(".prof"))
+        for name in files[:-keep] if keep > 0 else []:
+            try:
+                os.remove(os.path.join(directory, name))
+            except OSError:
+                pass
+
+
+def list_profiles(directory: str) -> list[dict]:
+    if not os.path.isdir(directory):
+        return []
+    profiles = []
+    for name in sorted(os.listdir(directory), reverse=True):
+        if not name.endswith(".prof"):
+            continue
+        stat = os.stat(os.path.join(directory, name))
+        profiles.append({
+            "name": name,
+            "size_bytes": stat.st_size,
+            "created_at": datetime.fromtimestamp(stat.st_mtime).isoformat(timespec="seconds"),
+        })
+    return profiles
+
+
+def profile_path(directory: str, name: str) -> str | None:
+    """Absolute path of a stored profile, or None for unknown/unsafe names."""
+    if not _SAFE_NAME.match(name):
+        return None
+    path = os.path.join(directory, name)
+    return path if os.path.isfile(path) else None
+
+
+def profile_as_text(path: str, limit: int = 50, sort: str = "cumulative") -> str:
+    out = io.StringIO()
+    stats = pstats.Stats(path, stream=out)
+    stats.strip_dirs().sort_stats(sort).print_stats(limit)
+    return out.getvalue()
+
+
+def init_app(app) -> None:
+    if not app.config.get("PROFILE_SECRET") and app.config.get("PROFILE_SAMPLE_RATE", 0.0) <= 0:
+        return
+    directory = app.config.get("PROFILE_DIR", "logs/profiles")
+
+    @app.before_request
+    def _start_profile():
+        if _should_profile(app):
+            g.profiler = cProfile.Profile()
+            g.profile_started = time.perf_counter()
+            g.profiler.enable()
+
+    @app.after_request
+    def _save_profile(response):
+        profiler = g.pop("profiler", None)
+        if profiler is None:
+            return response
+        profiler.disable()
+        elapsed_ms = (time.perf_counter() - g.pop("profile_started")) * 1000
+        try:
+            os.makedirs(directory, exist_ok=True)
+            name = _file_name(elapsed_ms)
+            profiler.dump_stats(os.path.join(directory, name))
+            _rotate(directory, app.config.get("PROFILE_MAX_FILES", 50))
+            response.headers["X-Profile-Id"] = name
+        except OSError as e:
+            app.logger.error(f"Could not write request profile: {e}")
+        return response
+
+    @app.teardown_request
+    def _stop_profile(exception=None):
+        profiler = g.pop("profiler", None)
+        if profiler is not None:
+            profiler.disable()
@@ -0,0 +1,157 @@
+#------------------------------------------------------------
+# Per-statement SQL statistics fed by InstrumentedCursor.
+#
+# Statements are reduced to fingerprints (literals and
+# placeholders become ?, IN lists and multi-row VALUES
+# collapse) and timed per fingerprint, keeping a bounded
+# window of recent durations for p50/p95. Statements slower
+# than SLOW_QUERY_MS are written, with their EXPLAIN plan, to
+# the slow-query log as JSON lines.
+#------------------------------------------------------------
+import functools
+import json
+import logging
+import os
+import re
+import threading
+from collections import deque
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+
+from flask import current_app, has_app_context, has_request_context, request
+from pymysql import cursors
+
+
+# Recent durations kept per fingerprint for percentiles
+SAMPLE_SIZE = 512
+# Distinct fingerprints tracked; later ones are counted under OTHER
+MAX_FINGERPRINTS = 1000
+OTHER = "(other)"
+# Longest statement that is EXPLAINed / written to the slow log
+MAX_EXPLAIN_LENGTH = 65536
+MAX_LOGGED_SQL = 4000
+
+_EXPLAINABLE = ("SELECT", "WITH", "INSERT", "REPLACE", "UPDATE", "DELETE")
+
+_COMMENTS = re.compile(r"/\*.*?\*/|--[^\n]*|#[^\n]*", re.S)
+_STRINGS = re.compile(r"'(?:[^'\\]|\\.|'')*'|\"(?:[^\"\\]|\\.)*\"")
+_PLACEHOLDERS = re.compile(r"%\(\w+\)s|%s")
+_NUMBERS = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?(?:e[+-]?\d+)?\b", re.I)
+_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_ROWS = re.compile(r"\(\?\+\)(?:\s*,\s*\(\?\+\))+")
+_SPACES = re.compile(r"\s+")
+
+_lock = threading.Lock()
+_stats: dict[str, dict] = {}
+
+slow_query_logger = logging.getLogger("mealmind.slow_queries")
+
+
+@functools.lru_cache(maxsize=4096)
+def fingerprint(sql: str) -> str:
+    """Normalize a statement so that executions differing only in values match."""
+    text = _STRINGS.sub("?", sql)
+    text = _COMMENTS.sub(" ", text)
+    text = _PLACEHOLDERS.sub("?", text)
+    text = _NUMBERS.sub("?", text)
+    text = _LISTS.sub("(?+)", text)
+    text = _ROWS.sub("(?+), ...", text)
+    return _SPACES.sub(" ", text).strip()
+
+
+def record(sql: str, seconds: float) -> None:
+    key = fingerprint(sql)
+    with _lock:
+        entry = _stats.get(key)
+        if entry is None:
+            if len(_stats) >= MAX_FINGERPRINTS:
+                key = OTHER
+                entry = _stats.get(key)
+            if entry is None:
+                entry = _stats[key] = {
+                    "count": 0, "total": 0.0, "max": 0.0, "samples": deque(maxlen=SAMPLE_SIZE),
+                }
+        entry["count"] += 1
+        entry["total"] += seconds
+        entry["max"] = max(entry["max"], seconds)
+        entry["samples"].append(seconds)
+
+
+def _percentile(sorted_values, q: float) -> float:
+    index = min(int(round(q * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def summary(limit: int = 20, order_by: str = "total_ms") -> list[dict]:
+    """Fingerprints with count, total/max and p50/p95 (ms), largest first."""
+    with _lock:
+        items = [(key, dict(entry, samples=sorted(entry["samples"]))) for key, entry in _stats.items()]
+
+    rows = []
+    for key, entry in items:
+        samples = entry["samples"]
+        rows.append({
+            "fingerprint": key,
+            "count": entry["count"],
+            "total_ms": round(entry["total"] * 1000, 2),
+            "max_ms": round(entry["max"] * 1000, 2),
+            "p50_ms": round(_percentile(samples, 0.5) * 1000, 2),
+            "p95_ms": round(_percentile(samples, 0.95) * 1000, 2),
+        })
+    rows.sort(key=lambda r: r[order_by], reverse=True)
+    return rows[:limit]
+
+
+def log_summary() -> None:
+    """Background entry point: log the most expensive fingerprints."""
+    for row in summary(limit=10):
+        current_app.logger.info(
+            f"SQL x{row['count']} p50={row['p50_ms']}ms p95={row['p95_ms']}ms "
+            f"total={row['total_ms']}ms: {row['fingerprint'][:300]}"
+        )
+
+
+def slow_query_threshold_seconds() -> float:
+    if not has_app_context():
+        return 0.0
+    return current_app.config.get("SLOW_QUERY_MS", 0) / 1000
+
+
+def capture_slow_query(cursor, sql, args, seconds: float) -> None:
+    """Write a slow statement and its EXPLAIN plan to the slow-query log."""
+    try:
+        statement = cursor.mogrify(sql, args) if args is not None else sql
+    except Exception:
+        statement = sql
+
+    plan = None
+    if len(statement) <= MAX_EXPLAIN_LENGTH and statement.lstrip().upper().startswith(_EXPLAINABLE):
+        try:
+            # Plain cursor: the EXPLAIN itself must not be timed or explained again
+            with cursor.connection.cursor(cursors.DictCursor) as explain_cursor:
+                explain_cursor.execute(f"EXPLAIN {statement}")
+                plan = explain_cursor.fetchall()
+        except Exception as e:
+            plan = f"EXPLAIN failed: {e}"
+
+    slow_query_logger.warning(json.dumps({
+        "time": datetime.now().isoformat(timespec="seconds"),
+        "duration_ms": round(seconds * 1000, 2),
+        "route": request.url_rule.rule if has_request_context() and request.url_rule else None,
+        "fingerprint": fingerprint(sql),
+        "sql": statement[:MAX_LOGGED_SQL],
+        "explain": plan,
+    }, default=str))
+
+
+def init_app(app) -> None:
+    """Send the slow-query log to its own rotating file."""
+    path = app.config.get("SLOW_QUERY_LOG_PATH")
+    if not path or app.config.get("SLOW_QUERY_MS", 0) <= 0 or slow_query_logger.handlers:
+        return
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    handler = RotatingFileHandler(path, maxBytes=5 * 1024 * 1024, backupCount=3)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    slow_query_logger.addHandler(handler)
+    slow_query_logger.setLevel(logging.WARNING)
+    slow_query_logger.propagate = False
@@ -0,0 +1,242 @@
+#------------------------------------------------------------
+# Lightweight request tracing (W3C trace context).
+#
+# A request carrying a sampled `traceparent` header (the
+# Streamlit client sends one per API call) gets a server span,
+# and every SQL statement it runs becomes a child span. Requests
+# without the header start their own trace at TRACE_SAMPLE_RATE.
+# Finished traces are written by a background thread to
+# TRACE_EXPORT_PATH as OTLP/JSON lines (one
+# ExportTraceServiceRequest per request), the format of the
+# OpenTelemetry Collector file exporter.
+#------------------------------------------------------------
+import atexit
+import json
+import os
+import queue
+import random
+import re
+import secrets
+import threading
+import time
+
+from flask import g, has_app_context, request
+
+from backend.observability.metrics import Counter
+from backend.observability.sql_stats import fingerprint
+
+
+TRACEPARENT_HEADER = "traceparent"
+TRACERESPONSE_HEADER = "traceresponse"
+SERVICE_NAME = "mealmind-api"
+SCOPE_NAME = "mealmind.tracing"
+
+# OTLP span kinds and status codes
+KIND_SERVER = 2
+KIND_CLIENT = 3
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+# DB spans kept per request; the rest are only counted on the server span
+MAX_SPANS_PER_TRACE = 500
+MAX_STATEMENT_LENGTH = 1000
+
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+TRACES_DROPPED = Counter(
+    "traces_dropped_total",
+    "Finished request traces dropped because the export queue was full.",
+)
+
+_exporter = None
+
+
+def parse_traceparent(value):
+    """(trace_id, parent_span_id, sampled) from a traceparent header, or None if invalid."""
+    match = _TRACEPARENT.match((value or "").strip().lower())
+    if match is None:
+        return None
+    trace_id, parent_id, flags = match.groups()
+    if trace_id == "0" * 32 or parent_id == "0" * 16:
+        return None
+    return trace_id, parent_id, bool(int(flags, 16) & 1)
+
+
+def _attributes(values: dict) -> list[dict]:
+    attributes = []
+    for key, value in values.items():
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            encoded = {"boolValue": value}
+        elif isinstance(value, int):
+            encoded = {"intValue": str(value)}
+        elif isinstance(value, float):
+            encoded = {"doubleValue": value}
+        else:
+            encoded = {"stringValue": str(value)}
+        attributes.append({"key": key, "value": encoded})
+    return attributes
+
+
+def _span(trace_id, span_id, parent_id, name, kind, start_ns, end_ns, attributes, error) -> dict:
+    span = {
+        "traceId": trace_id,
+        "spanId": span_id,
+        "name": name,
+        "kind": kind,
+        "startTimeUnixNano": str(start_ns),
+        "endTimeUnixNano": str(end_ns),
+        "attributes": _attributes(attributes),
+        "status": {"code": STATUS_ERROR if error else STATUS_OK},
+    }
+    if parent_id:
+        span["parentSpanId"] = parent_id
+    return span
+
+
+def export_request(spans: list[dict]) -> dict:
+    """Wrap spans in an OTLP ExportTraceServiceRequest."""
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": _attributes({"service.name": SERVICE_NAME})},
+            "scopeSpans": [{"scope": {"name": SCOPE_NAME}, "spans": spans}],
+        }]
+    }
+
+
+class _FileExporter:
+    """Appends OTLP/JSON lines from a background thread so requests never wait on disk."""
+
+    def __init__(self, path: str, max_queued: int):
+        self.path = path
+        self._queue = queue.Queue(maxsize=max_queued)
+        self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+        self._thread.start()
+
+    def submit(self, spans: list[dict]) -> None:
+        try:
+            self._queue.put_nowait(spans)
+        except queue.Full:
+            TRACES_DROPPED.inc()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            if batch[0] is None:
+                return
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = None in batch
+            self._write([spans for spans in batch if spans is not None])
+            if stop:
+                return
+
+    def _write(self, batch: list[list[dict]]) -> None:
+        try:
+            with open(self.path, "a", encoding="utf-8") as out:
+                for spans in batch:
+                    out.write(json.dumps(export_request(spans), separators=(",", ":")) + "\n")
+        except OSError:
+            TRACES_DROPPED.inc(len(batch))
+
+    def close(self) -> None:
+        try:
+            self._queue.put(None, timeout=1)
+        except queue.Full:
+            return
+        self._thread.join(timeout=5)
+
+
+def record_db_span(sql: str, start_ns: int, end_ns: int, error: bool) -> None:
+    """Called by InstrumentedCursor for every statement."""
+    if not has_app_context():
+        return
+    trace = g.get("trace")
+    if trace is None:
+        return
+    if len(trace["spans"]) >= MAX_SPANS_PER_TRACE:
+        trace["dropped_spans"] += 1
+        return
+    statement = fingerprint(sql)
+    operation = statement.split(" ", 1)[0].upper() if statement else "SQL"
+    trace["spans"].append(_span(
+        trace["trace_id"], secrets.token_hex(8), trace["span_id"],
+        f"mysql {operation}", KIND_CLIENT, start_ns, end_ns,
+        {
+            "db.system": "mysql",
+            "db.operation": operation,
+            "db.statement": statement[:MAX_STATEMENT_LENGTH],
+        },
+        error,
+    ))
+
+
+def _start_trace(app):
+    incoming = parse_traceparent(request.headers.get(TRACEPARENT_HEADER))
+    if incoming is not None:
+        trace_id, parent_id, sampled = incoming
+    else:
+        rate = app.config.get("TRACE_SAMPLE_RATE", 0.0)
+        trace_id, parent_id, sampled = secrets.token_hex(16), None, rate > 0 and random.random() < rate
+    g.trace_id = trace_id
+    if not sampled:
+        return
+    g.trace = {
+        "trace_id": trace_id,
+        "span_id": secrets.token_hex(8),
+        "parent_id": parent_id,
+        "start_ns": time.time_ns(),
+        "spans": [],
+        "dropped_spans": 0,
+        "status": None,
+    }
+
+
+def init_app(app) -> None:
+    global _exporter
+    path = app.config.get("TRACE_EXPORT_PATH")
+    if not app.config.get("TRACING_ENABLED") or not path:
+        return
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    if _exporter is None:
+        _exporter = _FileExporter(path, app.config.get("TRACE_QUEUE_SIZE", 1000))
+        atexit.register(_exporter.close)
+
+    @app.before_request
+    def _begin_trace():
+        _start_trace(app)
+
+    @app.after_request
+    def _record_status(response):
+        trace = g.get("trace")
+        if trace is not None:
+            trace["status"] = response.status_code
+            response.headers[TRACERESPONSE_HEADER] = f"00-{trace['trace_id']}-{trace['span_id']}-01"
+        return response
+
+    @app.teardown_request
+    def _end_trace(exception=None):
+        trace = g.pop("trace", None)
+        if trace is None:
+            return
+        status = trace["status"] or 500
+        # Not middleware.route_label: that module imports the cursor, which imports this one
+        route = request.url_rule.rule if request.url_rule is not None else "unmatched"
+        server_span = _span(
+            trace["trace_id"], trace["span_id"], trace["parent_id"],
+            f"{request.method} {route}", KIND_SERVER, trace["start_ns"], time.time_ns(),
+            {
+                "http.request.method": request.method,
+                "http.route": route,
+                "url.path": request.path,
+                "http.response.status_code": status,
+                "mealmind.db_statements": g.get("db_queries", 0),
+                "mealmind.dropped_spans": trace["dropped_spans"] or None,
+            },
+            exception is not None or status >= 500,
+        )
+        _exporter.submit([server_span] + trace["spans"])
@@ -1,56 +1,27 @@
 from flask import Blueprint, request, jsonify, current_app
 from datetime import datetime, date, timedelta
-from backend.db_connection import db
+from backend.db_connection import db, InstrumentedTupleCursor
+from backend.db_connection.change_markers import mark_tables_changed
+from backend.db_connection.projection import requested_fields, select_list
+from backend.serialization.json_provider import fetch_rows
+from backend.serialization.columnar import rows_route
 
 
 profiles_plans_bp = Blueprint("profiles_plans_bp", __name__)
 
 
 # -------------------------------------------------------------------
-# Small helpers to make cursor results predictable (dicts + JSON-safe)
+# Small helpers to make cursor results predictable (dicts; dates and
+# Decimals are encoded by the app's JSON provider)
 # -------------------------------------------------------------------
 
 
-def _row_to_dict(columns, row):
-    """
-    Given a list of column names and a row (tuple or dict), return a clean dict
-    and convert date/datetime objects to ISO strings.
-    """
-    import datetime as _dt
-
-    if isinstance(row, dict):
-        out = {}
-        for k, v in row.items():
-            if isinstance(v, (_dt.date, _dt.datetime)):
-                out[k] = v.isoformat()
-            else:
-                out[k] = v
-        return out
-
-    out = {}
-    for idx, col in enumerate(columns):
-        v = row[idx]
-        if isinstance(v, (_dt.date, _dt.datetime)):
-            out[col] = v.isoformat()
-        else:
-            out[col] = v
-    return out
-
-
 def _fetch_one_dict(cursor):
-    row = cursor.fetchone()
-    if not row:
-        return None
-    columns = [col[0] for col in cursor.description]
-    return _row_to_dict(columns, row)
+    return cursor.fetchone() or None
 
 
 def _fetch_all_dict(cursor):
-    rows = cursor.fetchall()
-    if not rows:
-        return []
-    columns = [col[0] for col in cursor.description]
-    return [_row_to_dict(columns, row) for row in rows]
+    return cursor.fetchall() or []
 
 
 # -------------------------------------------------------------------
@@ -159,6 +130,7 @@ def create_diet_profile():
             (user_id, diet_types, notes),
         )
         conn.commit()  # type: ignore
+        mark_tables_changed("UsersBudgetProfile")
         cursor.close()
         return jsonify({"message": "Diet profile created"}), 201
     except Exception as e:
@@ -208,6 +180,7 @@ def update_diet_profile():
         """
         cursor.execute(query, tuple(params))
         conn.commit()  # type: ignore
+        mark_tables_changed("UsersBudgetProfile")
         # rowcount may be 0 if values are unchanged; that's still success
         cursor.close()
 
@@ -323,6 +296,7 @@ def create_budget_profile():
             (user_id, amount, currency),
         )
         conn.commit()  # type: ignore
+        mark_tables_changed("UserBudgetProfile")
         cursor.close()
         return jsonify({"message": "Budget profile created"}), 201
     except Exception as e:
@@ -374,6 +348,7 @@ def update_budget_profile():
         """
         cursor.execute(query, tuple(params))
         conn.commit()  # type: ignore
+        mark_tables_changed("UserBudgetProfile")
         # rowcount may be 0 if nothing actually changed; treat as success
         cursor.close()
 
@@ -387,14 +362,21 @@ def update_budget_profile():
 # MEAL PLANS (MealPlan, MealPlanEntry)
 # -------------------------------------------------------------------
 
+# ?fields= of GET /meal-plans
+MEAL_PLAN_FIELDS = {
+    name: name for name in ("MealPlanID", "UserID", "StartDate", "EndDate", "IsSaved")
+}
+
 
 @profiles_plans_bp.route("/meal-plans", methods=["GET"])
+@rows_route
 def get_meal_plans():
     """
     List meal plans for a user.
     Query params:
       - user_id (required)
       - current_only (optional, bool-like 'true'/'false')
+      - fields (optional, e.g. MealPlanID,StartDate)
 
     Returns a list of:
       {
@@ -414,10 +396,15 @@ def get_meal_plans():
             request.args.get("current_only", default="false").lower() == "true"
         )
 
+        try:
+            fields = requested_fields(MEAL_PLAN_FIELDS)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
         conn = db.get_db()
-        cursor = conn.cursor()  # type: ignore
-        query = """
-            SELECT MealPlanID, UserID, StartDate, EndDate, IsSaved
+        cursor = conn.cursor(InstrumentedTupleCursor)  # type: ignore
+        query = f"""
+            SELECT {select_list(MEAL_PLAN_FIELDS, fields)}
             FROM MealPlan
             WHERE UserID = %s
         """
@@ -427,7 +414,7 @@ def get_meal_plans():
 
         query += " ORDER BY StartDate DESC"
         cursor.execute(query, tuple(params))
-        rows = _fetch_all_dict(cursor)
+        rows = fetch_rows(cursor)
         cursor.close()
         return jsonify(rows), 200
     except Exception as e:
@@ -560,6 +547,7 @@ def create_meal_plan():
             )
 
         conn.commit()  # type: ignore
+        mark_tables_changed("MealPlan", "MealPlanEntry")
         cursor.close()
 
         return jsonify({"message": "Meal plan created", "meal_plan_id": meal_plan_id}), 201
@@ -657,6 +645,7 @@ def delete_meal_plan(meal_plan_id: int):
             (meal_plan_id,),
         )
         conn.commit()  # type: ignore
+        mark_tables_changed("MealPlan", "MealPlanEntry")
         affected = cursor.rowcount
         cursor.close()
 
@@ -1,32 +1,58 @@
 from flask import Blueprint, request, jsonify, current_app
-from backend.db_connection import db
+from backend.db_connection import db, InstrumentedTupleCursor
+from backend.db_connection.change_markers import mark_tables_changed
+from backend.db_connection.projection import requested_fields, select_list
+from backend.serialization.json_provider import fetch_rows
+from backend.serialization.columnar import rows_route
+from backend.cache.response_cache import cached_response
 
 recipes_bp = Blueprint("recipes_bp", __name__)
+# ?fields= of the recipe GET routes: field -> SQL expression
+RECIPE_LIST_FIELDS = {
+    "RecipeId": "r.RecipeId",
+    "Name": "r.Name",
+    "PrepTimeMinutes": "r.PrepTimeMinutes",
+    "DifficultyLevel": "r.DifficultyLevel",
+    "Status": "r.Status",
+    "CreatedAt": "r.CreatedAt",
+    "LastUpdateAt": "r.LastUpdateAt",
+    "IngredientCount": "COUNT(ri.IngredientID)",
+}
+RECIPE_DETAIL_FIELDS = {
+    name: name for name in (
+        "RecipeId", "Name", "PrepTimeMinutes", "DifficultyLevel",
+        "Instructions", "Status", "CreatedAt", "LastUpdateAt",
+    )
+}
+
 
 @recipes_bp.route("/recipes", methods=["GET"])
+@cached_response("Recipe", "RecipeIngredient", "Ingredient")
+@rows_route
 def get_recipes():
     """
     List recipes with optional filters.
-    Query params: category_id, difficulty, status
+    Query params: category_id, difficulty, status, fields (e.g. RecipeId,Name,PrepTimeMinutes)
     """
     try:
         category_id = request.args.get("category_id", type=int)
         difficulty = request.args.get("difficulty")
         status = request.args.get("status")
 
+        try:
+            fields = requested_fields(RECIPE_LIST_FIELDS)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        # The ingredient join is only needed for IngredientCount
+        counted = "IngredientCount" in fields
+
         conn = db.get_db()
-        cursor = conn.cursor() # type: ignore
-        query = """
-            SELECT r.RecipeId,
-                   r.Name,
-                   r.PrepTimeMinutes,
-                   r.DifficultyLevel,
-                   r.Status,
-                   r.CreatedAt,
-                   r.LastUpdateAt,
-                   COUNT(ri.IngredientID) AS IngredientCount
+        cursor = conn.cursor(InstrumentedTupleCursor) # type: ignore
+        query = f"""
+            SELECT {select_list(RECIPE_LIST_FIELDS, fields)}
             FROM Recipe r
-            LEFT JOIN RecipeIngredient ri ON r.RecipeId = ri.RecipeID
+            {"LEFT JOIN RecipeIngredient ri ON r.RecipeId = ri.RecipeID" if counted else ""}
             WHERE 1=1
         """
         params = []
@@ -46,9 +72,11 @@ def get_recipes():
             query += " AND r.Status = %s"
             params.append(status)
 
-        query += " GROUP BY r.RecipeId ORDER BY r.CreatedAt DESC"
+        if counted:
+            query += " GROUP BY r.RecipeId"
+        query += " ORDER BY r.CreatedAt DESC"
         cursor.execute(query, tuple(params))
-        rows = cursor.fetchall()
+        rows = fetch_rows(cursor)
         cursor.close()
         return jsonify(rows), 200
     except Exception as e:
@@ -94,6 +122,7 @@ def create_recipe():
             (recipe_id, name, prep_time, difficulty, instructions, status),
         )
         conn.commit() # type: ignore
+        mark_tables_changed("Recipe")
         cursor.close()
 
         return jsonify({"message": "Recipe created", "recipe_id": recipe_id}), 201
@@ -103,27 +132,39 @@ def create_recipe():
 
 
 @recipes_bp.route("/recipes/<int:recipe_id>", methods=["GET"])
+@cached_response("Recipe", "RecipeIngredient", "Ingredient", "Category")
 def get_recipe_detail(recipe_id: int):
     """
     Get full recipe details including ingredients.
+    Query params: fields (optional, e.g. Name,Instructions,ingredients)
     """
     try:
+        try:
+            fields = requested_fields([*RECIPE_DETAIL_FIELDS, "ingredients"])
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
         conn = db.get_db()
         cursor = conn.cursor() # type: ignore
 
+        # "1" keeps the existence check when only ingredients are requested
         cursor.execute(
-            """
-            SELECT RecipeId, Name, PrepTimeMinutes, DifficultyLevel,
-                   Instructions, Status, CreatedAt, LastUpdateAt
+            f"""
+            SELECT {select_list(RECIPE_DETAIL_FIELDS, fields) or "1"}
             FROM Recipe
             WHERE RecipeId = %s
             """,
             (recipe_id,),
         )
-        recipe = cursor.fetchone()
-        if not recipe:
+        row = cursor.fetchone()
+        if not row:
             cursor.close()
             return jsonify({"error": "Recipe not found"}), 404
+        recipe = {f: row[f] for f in fields if f in RECIPE_DETAIL_FIELDS}
+
+        if "ingredients" not in fields:
+            cursor.close()
+            return jsonify(recipe), 200
 
         cursor.execute(
             """
@@ -186,6 +227,7 @@ def update_recipe(recipe_id: int):
         """
         cursor.execute(query, tuple(params))
         conn.commit() # type: ignore
+        mark_tables_changed("Recipe")
         cursor.close()
 
         if cursor.rowcount == 0:
@@ -210,6 +252,7 @@ def deactivate_recipe(recipe_id: int):
             (recipe_id,),
         )
         conn.commit() # type: ignore
+        mark_tables_changed("Recipe")
         affected = cursor.rowcount
         cursor.close()
 
@@ -223,9 +266,12 @@ def deactivate_recipe(recipe_id: int):
 
 
 @recipes_bp.route("/recipes/suggestions", methods=["GET"])
+@cached_response("Recipe", "RecipeIngredient", "InventoryItem", daily=True)
+@rows_route
 def get_recipe_suggestions():
     """
-    Suggest recipes based on a user's inventory.
+    Suggest recipes based on a user's inventory, most matching ingredients
+    first, then quickest, then RecipeId.
     Query params: user_id (required), max_prep_time (optional, minutes), limit (optional)
     """
     try:
@@ -237,13 +283,13 @@ def get_recipe_suggestions():
         limit = request.args.get("limit", default=10, type=int)
 
         conn = db.get_db()
-        cursor = conn.cursor() # type: ignore
+        cursor = conn.cursor(InstrumentedTupleCursor) # type: ignore
         query = """
-            SELECT DISTINCT r.RecipeId,
-                            r.Name,
-                            r.PrepTimeMinutes,
-                            r.DifficultyLevel,
-                            r.Status
+            SELECT r.RecipeId,
+                   r.Name,
+                   r.PrepTimeMinutes,
+                   r.DifficultyLevel,
+                   r.Status
             FROM Recipe r
             JOIN RecipeIngredient ri ON r.RecipeId = ri.RecipeID
             JOIN InventoryItem ii
@@ -257,11 +303,16 @@ def get_recipe_suggestions():
             query += " AND CAST(r.PrepTimeMinutes AS UNSIGNED) <= %s"
             params.append(max_prep_time)
 
-        query += " LIMIT %s"
+        query += """
+            GROUP BY r.RecipeId
+            ORDER BY COUNT(DISTINCT ri.IngredientID) DESC,
+                     CAST(r.PrepTimeMinutes AS UNSIGNED), r.RecipeId
+            LIMIT %s
+        """
         params.append(limit)
 
         cursor.execute(query, tuple(params))
-        rows = cursor.fetchall()
+        rows = fetch_rows(cursor)
         cursor.close()
         return jsonify(rows), 200
     except Exception as e:
@@ -270,6 +321,7 @@ def get_recipe_suggestions():
 
 
 @recipes_bp.route("/favorite-recipes", methods=["GET"])
+@rows_route
 def get_favorite_recipes():
     """
     Get all favorite recipes for a user.
@@ -281,7 +333,7 @@ def get_favorite_recipes():
             return jsonify({"error": "user_id query parameter is required"}), 400
 
         conn = db.get_db()
-        cursor = conn.cursor() # type: ignore
+        cursor = conn.cursor(InstrumentedTupleCursor) # type: ignore
         query = """
             SELECT fr.UserID,
                    fr.RecipeID,
@@ -296,7 +348,7 @@ def get_favorite_recipes():
             ORDER BY fr.FavoritedDate DESC
         """
         cursor.execute(query, (user_id,))
-        rows = cursor.fetchall()
+        rows = fetch_rows(cursor)
         cursor.close()
         return jsonify(rows), 200
     except Exception as e:
@@ -328,6 +380,7 @@ def add_favorite_recipe():
         """
         cursor.execute(query, (user_id, recipe_id))
         conn.commit() # type: ignore
+        mark_tables_changed("FavoriteRecipe")
         cursor.close()
         return jsonify({"message": "Recipe added to favorites"}), 201
     except Exception as e:
@@ -354,6 +407,7 @@ def remove_favorite_recipe(recipe_id: int):
         """
         cursor.execute(query, (user_id, recipe_id))
         conn.commit() # type: ignore
+        mark_tables_changed("FavoriteRecipe")
         affected = cursor.rowcount
         cursor.close()
 
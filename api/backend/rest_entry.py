@@ -1,9 +1,22 @@
 from flask import Flask
 from dotenv import load_dotenv
 import os
-import logging
 
 from backend.db_connection import db
+from backend.tasks import scheduler
+from backend.data_quality.engine import run_scheduled_checks
+from backend.analytics.rollups import run_rollup_job
+from backend.analytics.ingest import snapshot_buffer
+from backend.analytics import alert_rules
+from backend.observability import middleware as request_metrics
+from backend.observability.latency_snapshots import write_latency_snapshots
+from backend.observability import sql_stats
+from backend.observability import profiling
+from backend.observability import logging_setup
+from backend.observability import tracing
+from backend.cache.response_cache import response_cache
+from backend.serialization.json_provider import FastJSONProvider
+from backend.serialization import columnar, compression
 
 # Blueprints
 from backend.simple.simple_routes import simple_routes
@@ -12,17 +25,26 @@ from backend.recipes.recipe_routes import recipes_bp
 from backend.profiles_plans.profile_plan_routes import profiles_plans_bp
 from backend.analytics.analytics_routes import analytics_bp
 from backend.ingredient.ingredients_routes import ingredients_bp
+from backend.observability.observability_routes import observability_bp
+from backend.dashboards.dashboard_routes import dashboards_bp
 
 
 def create_app():
     app = Flask(__name__)
-
-    app.logger.setLevel(logging.DEBUG)
-    app.logger.info("API startup")
+    app.json = FastJSONProvider(app)
 
     # Load environment variables from ../.env
     load_dotenv()
 
+    app.config["LOG_LEVEL"] = os.getenv("LOG_LEVEL", "INFO")
+    app.config["LOG_QUEUE_SIZE"] = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+    app.config["LOG_INFO_SAMPLE_RATE"] = float(os.getenv("LOG_INFO_SAMPLE_RATE", "1.0"))
+    app.config["LOG_SAMPLED_ROUTES"] = [
+        r.strip() for r in os.getenv("LOG_SAMPLED_ROUTES", "").split(",") if r.strip()
+    ]
+    logging_setup.configure_logging(app)
+    app.logger.info("API startup")
+
     app.config["SECRET_KEY"] = os.getenv("SECRET_KEY")
 
     app.config["MYSQL_DATABASE_USER"] = os.getenv("DB_USER").strip() # type: ignore
@@ -31,8 +53,68 @@ def create_app():
     app.config["MYSQL_DATABASE_PORT"] = int(os.getenv("DB_PORT").strip()) # type: ignore
     app.config["MYSQL_DATABASE_DB"] = os.getenv("DB_NAME").strip() # type: ignore
 
+    app.config["BACKGROUND_TASKS_ENABLED"] = os.getenv("BACKGROUND_TASKS_ENABLED", "true").lower() == "true"
+    app.config["DATA_QUALITY_INTERVAL_SECONDS"] = int(os.getenv("DATA_QUALITY_INTERVAL_SECONDS", "60"))
+    app.config["DATA_QUALITY_MAX_AGE_SECONDS"] = int(os.getenv("DATA_QUALITY_MAX_AGE_SECONDS", "3600"))
+
+    app.config["ROLLUP_INTERVAL_SECONDS"] = int(os.getenv("ROLLUP_INTERVAL_SECONDS", "60"))
+    app.config["ROLLUP_LATENESS_SECONDS"] = int(os.getenv("ROLLUP_LATENESS_SECONDS", "120"))
+    app.config["ROLLUP_RETENTION_DAYS_RAW"] = int(os.getenv("ROLLUP_RETENTION_DAYS_RAW", "7"))
+    app.config["ROLLUP_RETENTION_DAYS_1M"] = int(os.getenv("ROLLUP_RETENTION_DAYS_1M", "30"))
+    app.config["ROLLUP_RETENTION_DAYS_1H"] = int(os.getenv("ROLLUP_RETENTION_DAYS_1H", "365"))
+    app.config["ROLLUP_RETENTION_DAYS_1D"] = int(os.getenv("ROLLUP_RETENTION_DAYS_1D", "0"))
+
+    app.config["INGEST_BUFFER_MAX_POINTS"] = int(os.getenv("INGEST_BUFFER_MAX_POINTS", "100000"))
+    app.config["INGEST_FLUSH_POINTS"] = int(os.getenv("INGEST_FLUSH_POINTS", "5000"))
+    app.config["INGEST_FLUSH_INTERVAL_SECONDS"] = float(os.getenv("INGEST_FLUSH_INTERVAL_SECONDS", "1.0"))
+    app.config["INGEST_MAX_BATCH_POINTS"] = int(os.getenv("INGEST_MAX_BATCH_POINTS", "10000"))
+    app.config["INGEST_MAX_FLUSH_ATTEMPTS"] = int(os.getenv("INGEST_MAX_FLUSH_ATTEMPTS", "5"))
+    app.config["INGEST_MAX_BACKOFF_SECONDS"] = float(os.getenv("INGEST_MAX_BACKOFF_SECONDS", "30"))
+    app.config["INGEST_DEAD_LETTER_AFTER_SECONDS"] = float(os.getenv("INGEST_DEAD_LETTER_AFTER_SECONDS", "60"))
+    app.config["INGEST_DEAD_LETTER_PATH"] = os.getenv("INGEST_DEAD_LETTER_PATH", "logs/snapshot_dead_letters.jsonl")
+    app.config["INGEST_DEAD_LETTER_MAX_POINTS"] = int(os.getenv("INGEST_DEAD_LETTER_MAX_POINTS", "1000000"))
+
+    app.config["ALERT_ABSENCE_CHECK_SECONDS"] = int(os.getenv("ALERT_ABSENCE_CHECK_SECONDS", "30"))
+
+    app.config["API_METRICS_SNAPSHOT_SECONDS"] = int(os.getenv("API_METRICS_SNAPSHOT_SECONDS", "60"))
+    app.config["SLOW_QUERY_MS"] = int(os.getenv("SLOW_QUERY_MS", "200"))
+    app.config["SLOW_QUERY_LOG_PATH"] = os.getenv("SLOW_QUERY_LOG_PATH", "logs/slow_queries.log")
+    app.config["SQL_STATS_LOG_SECONDS"] = int(os.getenv("SQL_STATS_LOG_SECONDS", "300"))
+
+    app.config["PROFILE_SECRET"] = os.getenv("PROFILE_SECRET", "")
+    app.config["PROFILE_SAMPLE_RATE"] = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+    app.config["PROFILE_DIR"] = os.getenv("PROFILE_DIR", "logs/profiles")
+    app.config["PROFILE_MAX_FILES"] = int(os.getenv("PROFILE_MAX_FILES", "50"))
+
+    app.config["TRACING_ENABLED"] = os.getenv("TRACING_ENABLED", "true").lower() == "true"
+    app.config["TRACE_SAMPLE_RATE"] = float(os.getenv("TRACE_SAMPLE_RATE", "0"))
+    app.config["TRACE_EXPORT_PATH"] = os.getenv("TRACE_EXPORT_PATH", "logs/traces.jsonl")
+    app.config["TRACE_QUEUE_SIZE"] = int(os.getenv("TRACE_QUEUE_SIZE", "1000"))
+
+    app.config["DASHBOARD_CACHE_TTL_SECONDS"] = float(os.getenv("DASHBOARD_CACHE_TTL_SECONDS", "15"))
+    app.config["RESPONSE_CACHE_ENABLED"] = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+    app.config["RESPONSE_CACHE_TTL_SECONDS"] = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "60"))
+    app.config["RESPONSE_CACHE_MAX_ENTRIES"] = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1024"))
+    app.config["RESPONSE_CACHE_SQLITE_PATH"] = os.getenv("RESPONSE_CACHE_SQLITE_PATH", "")
+    app.config["RESPONSE_CACHE_STALE_SECONDS"] = float(os.getenv("RESPONSE_CACHE_STALE_SECONDS", "30"))
+    app.config["RESPONSE_CACHE_EARLY_BETA"] = float(os.getenv("RESPONSE_CACHE_EARLY_BETA", "1.0"))
+    app.config["RESPONSE_CACHE_COALESCE_TIMEOUT_SECONDS"] = float(os.getenv("RESPONSE_CACHE_COALESCE_TIMEOUT_SECONDS", "10"))
+
+    app.config["COMPRESSION_ENABLED"] = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+    app.config["COMPRESSION_ENCODINGS"] = os.getenv("COMPRESSION_ENCODINGS", "zstd,br,gzip")
+    app.config["COMPRESSION_MIN_BYTES"] = int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))
+    app.config["COMPRESSION_LEVELS"] = {
+        "gzip": int(os.getenv("COMPRESSION_GZIP_LEVEL", "6")),
+        "br": int(os.getenv("COMPRESSION_BROTLI_LEVEL", "4")),
+        "zstd": int(os.getenv("COMPRESSION_ZSTD_LEVEL", "3")),
+    }
+
     app.logger.info("create_app(): starting the database connection")
     db.init_app(app)
+    snapshot_buffer.init_app(app)
+    response_cache.init_app(app)
+    compression.init_app(app)
+    snapshot_buffer.add_flush_listener(alert_rules.evaluate)
 
     app.logger.info("create_app(): registering blueprints with Flask app object.")
     app.register_blueprint(simple_routes)              # /, /health
@@ -41,5 +123,33 @@ def create_app():
     app.register_blueprint(profiles_plans_bp)          # /diet-profile, /budget-profile, /meal-plans...
     app.register_blueprint(analytics_bp)               # /system-metrics, /waste-statistics, etc.
     app.register_blueprint(ingredients_bp)
+    app.register_blueprint(observability_bp)           # /metrics, /metrics/sql, /admin/profiles
+    app.register_blueprint(dashboards_bp)              # /dashboards/<persona>
+
+    app.logger.info("create_app(): installing request metrics.")
+    request_metrics.init_app(app)
+    logging_setup.init_app(app)
+    sql_stats.init_app(app)
+    profiling.init_app(app)
+    tracing.init_app(app)
+    columnar.init_app(app)
+
+    app.logger.info("create_app(): scheduling background tasks.")
+    scheduler.register_periodic_task(
+        app, "data-quality", app.config["DATA_QUALITY_INTERVAL_SECONDS"], run_scheduled_checks
+    )
+    scheduler.register_periodic_task(
+        app, "metric-rollups", app.config["ROLLUP_INTERVAL_SECONDS"], run_rollup_job
+    )
+    scheduler.register_periodic_task(
+        app, "alert-absence", app.config["ALERT_ABSENCE_CHECK_SECONDS"], alert_rules.check_absence
+    )
+    scheduler.register_periodic_task(
+        app, "api-latency-snapshots", app.config["API_METRICS_SNAPSHOT_SECONDS"], write_latency_snapshots
+    )
+    scheduler.register_periodic_task(
+        app, "sql-stats-log", app.config["SQL_STATS_LOG_SECONDS"], sql_stats.log_summary
+    )
+    scheduler.init_app(app)
 
     return app
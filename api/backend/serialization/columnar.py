@@ -0,0 +1,76 @@
+#------------------------------------------------------------
+# Columnar representations of list results.
+#
+# A route returning Rows (see json_provider.fetch_rows) is
+# answered in the format the client asks for, with ?format= or
+# the Accept header:
+#   rows      application/json                        [{col: v, ...}, ...]
+#   columnar  application/vnd.mealmind.columnar+json  {"columns": [...], "data": {col: [...]}}
+#   arrow     application/vnd.apache.arrow.stream     Arrow IPC stream (needs pyarrow)
+# Key names are written once instead of once per row, and
+# both columnar formats load straight into a DataFrame.
+# Routes that return Rows are marked with @rows_route; only
+# those answer 406 to an Arrow request without pyarrow.
+#------------------------------------------------------------
+from flask import current_app, has_request_context, jsonify, request
+
+try:
+    import pyarrow as pa
+except ImportError:  # optional: ?format=arrow answers 406 without it
+    pa = None
+
+
+JSON_MIMETYPE = "application/json"
+COLUMNAR_MIMETYPE = "application/vnd.mealmind.columnar+json"
+ARROW_MIMETYPE = "application/vnd.apache.arrow.stream"
+
+FORMATS = {"rows": JSON_MIMETYPE, "columnar": COLUMNAR_MIMETYPE, "arrow": ARROW_MIMETYPE}
+_BY_MIMETYPE = {mimetype: name for name, mimetype in FORMATS.items()}
+
+
+def requested_format() -> str:
+    """rows, columnar or arrow: ?format= first, then the Accept header."""
+    if not has_request_context():
+        return "rows"
+    fmt = request.args.get("format")
+    if fmt in FORMATS:
+        return fmt
+    # Plain JSON first, so */* (and no Accept header) keeps the row format
+    best = request.accept_mimetypes.best_match(list(FORMATS.values()), default=JSON_MIMETYPE)
+    return _BY_MIMETYPE[best]
+
+
+def to_columnar(rows) -> dict:
+    # zip(*tuples) transposes in C
+    columns = list(rows.columns)
+    values = map(list, zip(*rows.tuples)) if rows.tuples else ([] for _ in columns)
+    return {"columns": columns, "data": dict(zip(columns, values))}
+
+
+def to_arrow_ipc(rows) -> bytes:
+    columnar = to_columnar(rows)
+    table = pa.Table.from_arrays(
+        [pa.array(columnar["data"][col]) for col in columnar["columns"]],
+        names=columnar["columns"],
+    )
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def rows_route(view):
+    """Mark a view as returning Rows, i.e. able to answer in every format."""
+    # functools.wraps copies the attribute onto outer decorators
+    view.returns_rows = True
+    return view
+
+
+def init_app(app) -> None:
+    # Call after the observability middleware, so a 406 is still logged, timed and traced
+    @app.before_request
+    def _check_arrow_available():
+        if pa is None and requested_format() == "arrow":
+            view = current_app.view_functions.get(request.endpoint)
+            if getattr(view, "returns_rows", False):
+                return jsonify({"error": "Arrow output is not available on this server (pyarrow is not installed)"}), 406
@@ -0,0 +1,190 @@
+#------------------------------------------------------------
+# Response compression.
+#
+# JSON, text and Arrow responses are compressed with the first
+# encoding of COMPRESSION_ENCODINGS (zstd, br, gzip) that the
+# client's Accept-Encoding allows and that is available here
+# (zstd needs zstandard, br needs brotli; gzip is always there).
+# Bodies under COMPRESSION_MIN_BYTES are sent as they are, since
+# the framing costs more than it saves. Streamed responses are
+# compressed chunk by chunk and flushed after each chunk, so a
+# client still sees data as soon as it is produced.
+#
+# CPU time and bytes in/out per encoding are exported as
+# counters on /metrics and summarized at GET /metrics/compression.
+#------------------------------------------------------------
+import time
+import zlib
+
+from flask import request
+
+from backend.observability.metrics import Counter
+from backend.serialization.columnar import ARROW_MIMETYPE
+
+try:
+    import brotli
+except ImportError:  # optional: br is not offered without it
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional: zstd is not offered without it
+    zstandard = None
+
+
+COMPRESSION_CPU_SECONDS = Counter(
+    "api_response_compression_cpu_seconds_total",
+    "CPU seconds spent compressing responses, by encoding.",
+    labels=("encoding",),
+)
+COMPRESSION_BYTES = Counter(
+    "api_response_compression_bytes_total",
+    "Response bytes before (in) and after (out) compression, by encoding.",
+    labels=("encoding", "stage"),
+)
+COMPRESSED_RESPONSES = Counter(
+    "api_compressed_responses_total",
+    "Responses sent compressed, by encoding.",
+    labels=("encoding",),
+)
+
+DEFAULT_LEVELS = {"gzip": 6, "br": 4, "zstd": 3}
+
+
+# Each returns (compress(chunk), sync_flush(), finish()) for one response
+def _gzip(level):
+    c = zlib.compressobj(level, zlib.DEFLATED, 31)
+    return c.compress, lambda: c.flush(zlib.Z_SYNC_FLUSH), c.flush
+
+
+def _brotli(level):
+    c = brotli.Compressor(quality=level)
+    return c.process, c.flush, c.finish
+
+
+def _zstd(level):
+    c = zstandard.ZstdCompressor(level=level).compressobj()
+    return c.compress, lambda: c.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK), c.flush
+
+
+ENCODERS = {"gzip": _gzip}
+if brotli is not None:
+    ENCODERS["br"] = _brotli
+if zstandard is not None:
+    ENCODERS["zstd"] = _zstd
+
+
+def _compressible(mimetype) -> bool:
+    return mimetype.startswith("text/") or mimetype.endswith("json") or mimetype == ARROW_MIMETYPE
+
+
+def _choose_encoding(preference):
+    for encoding in preference:
+        if encoding in ENCODERS and request.accept_encodings[encoding] > 0:
+            return encoding
+    return None
+
+
+def _record(encoding, cpu_seconds, size_in, size_out) -> None:
+    COMPRESSION_CPU_SECONDS.inc(cpu_seconds, encoding=encoding)
+    COMPRESSION_BYTES.inc(size_in, encoding=encoding, stage="in")
+    COMPRESSION_BYTES.inc(size_out, encoding=encoding, stage="out")
+
+
+def compress_body(body: bytes, encoding: str, level: int) -> bytes:
+    compress, _, finish = ENCODERS[encoding](level)
+    return compress(body) + finish()
+
+
+def _compress_stream(chunks, encoding, level):
+    compress, flush, finish = ENCODERS[encoding](level)
+    try:
+        for chunk in chunks:
+            started = time.thread_time()
+            out = compress(chunk) + flush()
+            _record(encoding, time.thread_time() - started, len(chunk), len(out))
+            if out:
+                yield out
+        started = time.thread_time()
+        out = finish()
+        _record(encoding, time.thread_time() - started, 0, len(out))
+        yield out
+    finally:
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+
+
+def init_app(app) -> None:
+    if not app.config.get("COMPRESSION_ENABLED", True):
+        app.logger.info("Response compression disabled by configuration")
+        return
+
+    preference = [
+        e.strip() for e in app.config.get("COMPRESSION_ENCODINGS", "zstd,br,gzip").split(",")
+        if e.strip() in ENCODERS
+    ]
+    levels = {**DEFAULT_LEVELS, **app.config.get("COMPRESSION_LEVELS", {})}
+    min_bytes = app.config.get("COMPRESSION_MIN_BYTES", 1024)
+
+    # Registered before the other after_request hooks, so it runs after them
+    @app.after_request
+    def _compress_response(response):
+        if (
+            request.method == "HEAD"
+            or response.status_code < 200
+            or response.status_code in (204, 304)
+            or response.direct_passthrough
+            or "Content-Encoding" in response.headers
+            or not _compressible(response.mimetype)
+        ):
+            return response
+
+        response.vary.add("Accept-Encoding")
+        encoding = _choose_encoding(preference)
+        if encoding is None:
+            return response
+
+        if response.is_streamed:
+            response.response = _compress_stream(response.iter_encoded(), encoding, levels[encoding])
+            response.headers.pop("Content-Length", None)
+        else:
+            body = response.get_data()
+            if len(body) < min_bytes:
+                return response
+            started = time.thread_time()
+            compressed = compress_body(body, encoding, levels[encoding])
+            _record(encoding, time.thread_time() - started, len(body), len(compressed))
+            if len(compressed) >= len(body):
+                return response
+            response.set_data(compressed)
+
+        COMPRESSED_RESPONSES.inc(encoding=encoding)
+        response.headers["Content-Encoding"] = encoding
+        # Byte-for-byte the body differs from the uncompressed one: weak, as nginx does
+        tag, weak = response.get_etag()
+        if tag and not weak:
+            response.set_etag(tag, weak=True)
+        return response
+
+
+def _total(counter, **match):
+    return counter.total(lambda labels: all(labels[k] == v for k, v in match.items()))
+
+
+def stats() -> dict:
+    """Bytes in/out, ratio and CPU cost per encoding since startup."""
+    encodings = {}
+    for encoding in ENCODERS:
+        size_in = _total(COMPRESSION_BYTES, encoding=encoding, stage="in")
+        size_out = _total(COMPRESSION_BYTES, encoding=encoding, stage="out")
+        cpu = _total(COMPRESSION_CPU_SECONDS, encoding=encoding)
+        encodings[encoding] = {
+            "responses": _total(COMPRESSED_RESPONSES, encoding=encoding),
+            "bytes_in": size_in,
+            "bytes_out": size_out,
+            "ratio": round(size_in / size_out, 2) if size_out else None,
+            "cpu_seconds": round(cpu, 4),
+            "cpu_ms_per_mb": round(cpu * 1000 / (size_in / 1e6), 2) if size_in else None,
+        }
+    return {"available": list(ENCODERS), "encodings": encodings}
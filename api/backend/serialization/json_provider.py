@@ -0,0 +1,117 @@
+#------------------------------------------------------------
+# JSON encoding for every response (app.json, so jsonify()
+# and all blueprints go through it).
+#
+# Dates and datetimes are written as ISO 8601 strings and
+# Decimals as strings, in one pass over the result; keys keep
+# the order of the SELECT. List routes can hand over a Rows
+# (cursor tuples plus column names, see fetch_rows) instead of
+# building a dict per row; Rows can also be answered in a
+# columnar format (see backend.serialization.columnar). orjson
+# is used when it is installed; the stdlib encoder gives the
+# same output otherwise.
+#------------------------------------------------------------
+import datetime
+import decimal
+import json
+import numbers
+from itertools import repeat
+
+from flask.json.provider import DefaultJSONProvider
+
+from backend.serialization.columnar import (
+    ARROW_MIMETYPE,
+    COLUMNAR_MIMETYPE,
+    requested_format,
+    to_arrow_ipc,
+    to_columnar,
+)
+
+try:
+    import orjson
+except ImportError:  # optional: stdlib json below
+    orjson = None
+
+
+class Rows:
+    """A result set as the cursor returned it: column names and one tuple per row."""
+
+    __slots__ = ("columns", "tuples")
+
+    def __init__(self, columns, tuples):
+        self.columns = tuple(columns)
+        self.tuples = tuples
+
+    def __len__(self) -> int:
+        return len(self.tuples)
+
+    def __iter__(self):
+        return iter(self.as_dicts())
+
+    def as_dicts(self) -> list[dict]:
+        # map/zip keep the per-row work out of the interpreter loop
+        return list(map(dict, map(zip, repeat(self.columns), self.tuples)))
+
+
+def fetch_rows(cursor) -> Rows:
+    """fetchall() of a tuple cursor (InstrumentedTupleCursor) as Rows."""
+    columns = [col[0] for col in cursor.description or ()]
+    return Rows(columns, cursor.fetchall())
+
+
+def _default(o):
+    if isinstance(o, Rows):
+        return o.as_dicts()
+    if isinstance(o, decimal.Decimal):
+        return str(o)
+    if isinstance(o, datetime.date):
+        return o.isoformat()
+    if isinstance(o, datetime.timedelta):
+        return str(o)
+    # numpy scalars and other number types orjson does not know
+    if isinstance(o, numbers.Integral):
+        return int(o)
+    if isinstance(o, numbers.Real):
+        return float(o)
+    return DefaultJSONProvider.default(o)
+
+
+def encode_stdlib(obj) -> bytes:
+    return json.dumps(obj, default=_default, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def encode_orjson(obj) -> bytes:
+        return orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS)
+
+    encode = encode_orjson
+else:
+    encode_orjson = None
+    encode = encode_stdlib
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    default = staticmethod(_default)
+    sort_keys = False
+
+    def dumps(self, obj, **kwargs) -> str:
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return encode(obj).decode()
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        if not isinstance(obj, Rows):
+            return self._app.response_class(encode(obj), mimetype=self.mimetype)
+
+        fmt = requested_format()
+        if fmt == "columnar":
+            response = self._app.response_class(encode(to_columnar(obj)), mimetype=COLUMNAR_MIMETYPE)
+        elif fmt == "arrow":
+            response = self._app.response_class(to_arrow_ipc(obj), mimetype=ARROW_MIMETYPE)
+        else:
+            response = self._app.response_class(encode(obj), mimetype=self.mimetype)
+        response.vary.add("Accept")
+        return response
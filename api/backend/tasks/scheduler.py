@@ -0,0 +1,64 @@
+#------------------------------------------------------------
+# Tiny in-process scheduler for periodic background jobs.
+#
+# Tasks are registered per app in create_app() and started the
+# first time the app serves a request, so the reloader's parent
+# process (which never serves requests) does not run them.
+#------------------------------------------------------------
+import threading
+import time
+
+
+_start_lock = threading.Lock()
+
+
+def register_periodic_task(app, name: str, interval_seconds: float, func) -> None:
+    """
+    Run func() inside an app context every interval_seconds.
+    A non-positive interval disables the task.
+    """
+    if interval_seconds <= 0:
+        app.logger.info(f"Background task '{name}' disabled (interval <= 0)")
+        return
+    tasks = app.extensions.setdefault("background_tasks", [])
+    tasks.append({"name": name, "interval": interval_seconds, "func": func})
+
+
+def init_app(app) -> None:
+    """Hook the scheduler into the app so tasks start on the first request."""
+    if not app.config.get("BACKGROUND_TASKS_ENABLED", True):
+        app.logger.info("Background tasks disabled by configuration")
+        return
+
+    @app.before_request
+    def _start_background_tasks():
+        start_background_tasks(app)
+
+
+def start_background_tasks(app) -> None:
+    with _start_lock:
+        if app.extensions.get("background_tasks_started"):
+            return
+        app.extensions["background_tasks_started"] = True
+
+    for task in app.extensions.get("background_tasks", []):
+        thread = threading.Thread(
+            target=_run_forever,
+            args=(app, task),
+            name=f"task-{task['name']}",
+            daemon=True,
+        )
+        thread.start()
+        app.logger.info(
+            f"Started background task '{task['name']}' every {task['interval']}s"
+        )
+
+
+def _run_forever(app, task) -> None:
+    while True:
+        time.sleep(task["interval"])
+        try:
+            with app.app_context():
+                task["func"]()
+        except Exception as e:
+            app.logger.error(f"Background task '{task['name']}' failed: {e}")
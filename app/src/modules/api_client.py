@@ -0,0 +1,269 @@
+# modules/api_client.py
+#
+# Client used by every page to call the API. Same call signatures as
+# requests.get/post/put/delete; a url starting with "/" is resolved against
+# API_BASE_URL. Each call is traced (see modules.tracing) and carries a
+# `traceparent` header.
+#
+# All calls share one keep-alive requests.Session (st.cache_resource) with a
+# connection pool; connection errors and 502/503/504 answers of idempotent
+# calls are retried with exponential backoff.
+#
+# Successful GETs of the reference endpoints in CACHE_TTLS are served from
+# st.cache_data, keyed per user. A write through this client invalidates the
+# cached reads of the resource it touched (first path segment, plus the
+# resources in RELATED) for every user.
+#
+# GET responses that carry an ETag are remembered (last API_ETAG_ENTRIES
+# urls); the next GET of the same url and params sends If-None-Match, and a
+# 304 answer is turned back into the remembered 200 response.
+#
+# fan_out() sends independent calls of a page concurrently on a shared
+# thread pool, so the page waits for its slowest call instead of the sum.
+#
+# List routes answer ?format=columnar (or arrow) with one list per column;
+# frame() turns such a response into a DataFrame without per-row dicts.
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import pandas as pd
+import pyarrow as pa
+import requests
+import streamlit as st
+from requests.adapters import HTTPAdapter
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from urllib3.util.retry import Retry
+
+from modules import tracing
+
+API_BASE_URL = os.getenv("API_BASE_URL", "http://api:4000")
+API_TIMEOUT = float(os.getenv("API_TIMEOUT", "10"))
+API_RETRIES = int(os.getenv("API_RETRIES", "3"))
+API_RETRY_BACKOFF = float(os.getenv("API_RETRY_BACKOFF", "0.3"))
+API_POOL_SIZE = int(os.getenv("API_POOL_SIZE", "20"))
+API_FANOUT_WORKERS = int(os.getenv("API_FANOUT_WORKERS", "8"))
+API_ETAG_ENTRIES = int(os.getenv("API_ETAG_ENTRIES", "256"))
+
+ARROW_MIMETYPE = "application/vnd.apache.arrow.stream"
+
+# Cached GET paths and their TTL in seconds
+CACHE_TTLS = [
+    (re.compile(r"^/categories$"), 300),
+    (re.compile(r"^/ingredients$"), 300),
+    (re.compile(r"^/demographic-segments$"), 600),
+    (re.compile(r"^/recipes(/\d+)?$"), 60),
+]
+# Writes to a resource that also change the cached reads of others
+RELATED = {
+    "ingredients": ("categories",),
+    "categories": ("ingredients",),
+}
+
+_generations_lock = threading.Lock()
+_generations = {}
+
+_validators_lock = threading.Lock()
+_validators = OrderedDict()  # (url, params) -> (etag, response), least recently used first
+
+
+class _Uncacheable(Exception):
+    def __init__(self, response):
+        super().__init__(response.status_code)
+        self.response = response
+
+
+@st.cache_resource(show_spinner=False)
+def _session():
+    retry = Retry(
+        total=API_RETRIES,
+        backoff_factor=API_RETRY_BACKOFF,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=API_POOL_SIZE, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+@st.cache_resource(show_spinner=False)
+def _executor():
+    return ThreadPoolExecutor(max_workers=API_FANOUT_WORKERS, thread_name_prefix="api-fan-out")
+
+
+def _resource(path):
+    return path.strip("/").split("/", 1)[0]
+
+
+def _generation(resource):
+    with _generations_lock:
+        return _generations.get(resource, 0)
+
+
+def invalidate(*resources):
+    """Drop the cached reads of the given resources (e.g. "categories") for every user."""
+    with _generations_lock:
+        for resource in resources:
+            _generations[resource] = _generations.get(resource, 0) + 1
+
+
+def _current_user():
+    try:
+        return (st.session_state.get("user") or {}).get("id")
+    except Exception:
+        # Outside a Streamlit script run (e.g. a worker thread)
+        return None
+
+
+def _validator(key):
+    with _validators_lock:
+        known = _validators.get(key)
+        if known is not None:
+            _validators.move_to_end(key)
+        return known
+
+
+def _remember(key, resp):
+    with _validators_lock:
+        _validators[key] = (resp.headers["ETag"], resp)
+        _validators.move_to_end(key)
+        while len(_validators) > API_ETAG_ENTRIES:
+            _validators.popitem(last=False)
+
+
+def _send(method, url, **kwargs):
+    headers = dict(kwargs.pop("headers", None) or {})
+    kwargs.setdefault("timeout", API_TIMEOUT)
+
+    # Revalidate what we already have instead of downloading it again
+    key = known = None
+    if method == "GET" and "If-None-Match" not in headers:
+        key = (url, tuple(sorted((kwargs.get("params") or {}).items())))
+        known = _validator(key)
+        if known is not None:
+            headers["If-None-Match"] = known[0]
+
+    with tracing.client_span(method, url) as span:
+        if span is not None:
+            headers["traceparent"] = span["traceparent"]
+        resp = _session().request(method, url, headers=headers, **kwargs)
+        if span is not None:
+            span["status"] = resp.status_code
+
+    if key is not None:
+        if resp.status_code == 304 and known is not None:
+            return known[1]
+        if resp.status_code == 200 and "ETag" in resp.headers:
+            _remember(key, resp)
+    return resp
+
+
+@st.cache_data(ttl=max(ttl for _, ttl in CACHE_TTLS), max_entries=2000, show_spinner=False)
+def _cached_get(url, params, user, generation, ttl_bucket, _timeout):
+    # user, generation and ttl_bucket only select the entry (_timeout is not hashed)
+    resp = _send("GET", url, params=dict(params), timeout=_timeout)
+    if resp.status_code != 200:
+        raise _Uncacheable(resp)
+    return resp
+
+
+def request(method, url, **kwargs):
+    path = url if url.startswith("/") else None
+    if path is not None:
+        url = API_BASE_URL + path
+    method = method.upper()
+
+    if method == "GET" and path is not None and not kwargs.keys() - {"params", "timeout"}:
+        ttl = next((ttl for pattern, ttl in CACHE_TTLS if pattern.match(path)), None)
+        if ttl is not None:
+            params = tuple(sorted((kwargs.get("params") or {}).items()))
+            try:
+                return _cached_get(
+                    url, params, _current_user(), _generation(_resource(path)),
+                    int(time.time() // ttl), kwargs.get("timeout", API_TIMEOUT),
+                )
+            except _Uncacheable as e:
+                return e.response
+
+    resp = _send(method, url, **kwargs)
+    if method != "GET" and path is not None:
+        resource = _resource(path)
+        invalidate(resource, *RELATED.get(resource, ()))
+    return resp
+
+
+def get(url, params=None, **kwargs):
+    return request("GET", url, params=params, **kwargs)
+
+
+def post(url, data=None, json=None, **kwargs):
+    return request("POST", url, data=data, json=json, **kwargs)
+
+
+def put(url, data=None, **kwargs):
+    return request("PUT", url, data=data, **kwargs)
+
+
+def delete(url, **kwargs):
+    return request("DELETE", url, **kwargs)
+
+
+def frame(resp):
+    """DataFrame of a ?format=columnar or ?format=arrow response."""
+    if resp.headers.get("Content-Type", "").startswith(ARROW_MIMETYPE):
+        return pa.ipc.open_stream(resp.content).read_pandas()
+    body = resp.json()
+    return pd.DataFrame(body["data"], columns=body["columns"])
+
+
+class FanOut:
+    """Outcome of fan_out(): a response or an exception per call name."""
+
+    def __init__(self):
+        self.responses = {}
+        self.errors = {}
+
+    def result(self, name):
+        """The response of a call, or raise the exception it failed with."""
+        if name in self.errors:
+            raise self.errors[name]
+        return self.responses[name]
+
+
+def fan_out(calls, timeout=None):
+    """
+    Send independent calls concurrently and wait for all of them, or at most
+    `timeout` seconds. `calls` maps a name to (method, url, kwargs); kwargs
+    are those of request(), including the per-call `timeout`. A call that
+    fails or is still running at the deadline does not affect the others:
+    its exception (TimeoutError when late) is kept in FanOut.errors.
+    """
+    ctx = get_script_run_ctx()
+
+    def run(method, url, kwargs):
+        # Give the worker this run's session state (user, page trace)
+        add_script_run_ctx(threading.current_thread(), ctx)
+        return request(method, url, **kwargs)
+
+    futures = {
+        name: _executor().submit(run, method, url, dict(kwargs))
+        for name, (method, url, kwargs) in calls.items()
+    }
+    done, _ = wait(futures.values(), timeout=timeout)
+
+    outcome = FanOut()
+    for name, future in futures.items():
+        if future not in done:
+            future.cancel()
+            outcome.errors[name] = TimeoutError(f"{name} did not finish within {timeout}s")
+        elif future.exception() is not None:
+            outcome.errors[name] = future.exception()
+        else:
+            outcome.responses[name] = future.result()
+    return outcome
@@ -1,6 +1,8 @@
 # modules/nav.py
 import streamlit as st
 
+from modules import tracing
+
 def _ensure_auth_or_redirect():
     if "authenticated" not in st.session_state or not st.session_state["authenticated"]:
         # Don’t explode on About or Home
@@ -46,7 +48,10 @@ def _analyst_links():
     st.sidebar.page_link("pages/33_Samuel_User_Behavior.py", label="User Behavior", icon="👥")
 
 
-def SideBarLinks(show_home=True):
+def SideBarLinks(page, show_home=True):
+    # Every page calls this first with its own name, so it marks the start of a page run
+    tracing.start_page_trace(page)
+
     st.sidebar.image("assets/meal_mind.png", width=150)
 
     if show_home:
@@ -0,0 +1,152 @@
+# modules/tracing.py
+#
+# Client side of the API tracing: every page run gets a trace id, and every
+# API call made through modules.api_client becomes a client span whose id is
+# sent to the API in a W3C `traceparent` header. The API continues the trace
+# with its own server and SQL spans, so both files can be loaded together.
+#
+# Spans are appended to TRACE_EXPORT_PATH as OTLP/JSON lines (the format of
+# the OpenTelemetry Collector file exporter). The page span covering all of
+# a run's API calls is written when the next run of the session starts.
+import json
+import os
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+import streamlit as st
+
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "true").lower() == "true"
+TRACE_EXPORT_PATH = os.getenv("TRACE_EXPORT_PATH", "logs/client_traces.jsonl")
+SERVICE_NAME = "mealmind-app"
+
+KIND_INTERNAL = 1
+KIND_CLIENT = 3
+
+_write_lock = threading.Lock()
+_trace_lock = threading.Lock()
+
+
+def _attributes(values):
+    attributes = []
+    for key, value in values.items():
+        if value is None:
+            continue
+        if isinstance(value, int) and not isinstance(value, bool):
+            attributes.append({"key": key, "value": {"intValue": str(value)}})
+        else:
+            attributes.append({"key": key, "value": {"stringValue": str(value)}})
+    return attributes
+
+
+def _export(spans):
+    line = json.dumps({
+        "resourceSpans": [{
+            "resource": {"attributes": _attributes({"service.name": SERVICE_NAME})},
+            "scopeSpans": [{"scope": {"name": "mealmind.tracing"}, "spans": spans}],
+        }]
+    }, separators=(",", ":"))
+    try:
+        with _write_lock:
+            os.makedirs(os.path.dirname(TRACE_EXPORT_PATH) or ".", exist_ok=True)
+            with open(TRACE_EXPORT_PATH, "a", encoding="utf-8") as out:
+                out.write(line + "\n")
+    except OSError:
+        pass
+
+
+def _span(trace, span_id, parent_id, name, kind, start_ns, end_ns, attributes, error):
+    span = {
+        "traceId": trace["trace_id"],
+        "spanId": span_id,
+        "name": name,
+        "kind": kind,
+        "startTimeUnixNano": str(start_ns),
+        "endTimeUnixNano": str(end_ns),
+        "attributes": _attributes(attributes),
+        "status": {"code": 2 if error else 1},
+    }
+    if parent_id:
+        span["parentSpanId"] = parent_id
+    return span
+
+
+def _finish_page_trace(trace):
+    if trace is None or not trace["calls"]:
+        return
+    _export([_span(
+        trace, trace["span_id"], None, f"page {trace['page']}", KIND_INTERNAL,
+        trace["start_ns"], trace["end_ns"],
+        {"mealmind.page": trace["page"], "mealmind.api_calls": trace["calls"]},
+        False,
+    )])
+
+
+def start_page_trace(page):
+    """Start a new trace for this run of `page` (called once per page run)."""
+    if not TRACING_ENABLED:
+        return None
+    _finish_page_trace(st.session_state.get("_page_trace"))
+    trace = {
+        "trace_id": secrets.token_hex(16),
+        "span_id": secrets.token_hex(8),
+        "page": page,
+        "start_ns": time.time_ns(),
+        "end_ns": time.time_ns(),
+        "calls": 0,
+    }
+    st.session_state["_page_trace"] = trace
+    return trace
+
+
+def current_trace():
+    """The trace of the current page run, started on first use if needed."""
+    if not TRACING_ENABLED:
+        return None
+    try:
+        trace = st.session_state.get("_page_trace")
+    except Exception:
+        # Outside a Streamlit script run (e.g. a worker thread)
+        return None
+    return trace or start_page_trace("unknown")
+
+
+@contextmanager
+def client_span(method, url, trace=None):
+    """
+    Time one API call. Yields a dict holding the `traceparent` header value;
+    set its "status" to the response status code. Yields None when tracing
+    is off.
+    """
+    trace = trace or current_trace()
+    if trace is None:
+        yield None
+        return
+    span_id = secrets.token_hex(8)
+    call = {"traceparent": f"00-{trace['trace_id']}-{span_id}-01", "status": None}
+    start_ns = time.time_ns()
+    error = True
+    try:
+        yield call
+        error = call["status"] is None or call["status"] >= 500
+    finally:
+        end_ns = time.time_ns()
+        parts = urlsplit(url)
+        # api_client.fan_out() finishes spans of one trace on several threads
+        with _trace_lock:
+            trace["calls"] += 1
+            trace["end_ns"] = max(trace["end_ns"], end_ns)
+        _export([_span(
+            trace, span_id, trace["span_id"], f"{method} {parts.path}", KIND_CLIENT,
+            start_ns, end_ns,
+            {
+                "http.request.method": method,
+                "url.full": url,
+                "server.address": parts.hostname,
+                "http.response.status_code": call["status"],
+                "mealmind.page": trace["page"],
+            },
+            error,
+        )])
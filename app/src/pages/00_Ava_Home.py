@@ -1,9 +1,10 @@
 import streamlit as st
+from modules import api_client
 from modules.nav import SideBarLinks
 
 
 st.set_page_config(page_title="Ava – Student Dashboard", page_icon="🧑‍🎓")
-SideBarLinks()
+SideBarLinks("00_Ava_Home")
 
 
 user = st.session_state.get("user", {"first_name": "Ava"})
@@ -16,6 +17,43 @@ st.write(
 )
 
 
+# --- At a glance (one call: GET /dashboards/student) ---
+dashboard = {}
+try:
+    resp = api_client.get("/dashboards/student", params={"user_id": user.get("id", 1)}, timeout=5)
+    if resp.status_code == 200:
+        dashboard = resp.json()
+    else:
+        st.warning(f"Could not load your dashboard: {resp.text}")
+except Exception as e:
+    st.warning(f"Could not load your dashboard: {e}")
+
+
+if dashboard:
+    m1, m2 = st.columns(2)
+    m1.metric("Items in your fridge", dashboard.get("inventory_count", 0))
+    m2.metric(
+        f"Expiring within {dashboard.get('expiring_days', 7)} days",
+        dashboard.get("expiring_count", 0),
+    )
+
+
+    s1, s2 = st.columns(2)
+    with s1:
+        st.write("**You could cook**")
+        for rec in dashboard.get("suggestions", []):
+            st.write(f"• {rec.get('Name')} ({rec.get('PrepTimeMinutes')} min)")
+        if not dashboard.get("suggestions"):
+            st.caption("Add items to your fridge to get suggestions.")
+    with s2:
+        st.write("**Your favorites**")
+        for fav in dashboard.get("favorites", []):
+            st.write(f"• {fav.get('Name')}")
+        if not dashboard.get("favorites"):
+            st.caption("No favorites yet.")
+    st.write("---")
+
+
 col1, col2 = st.columns(2)
 
 
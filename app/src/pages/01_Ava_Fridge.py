@@ -1,12 +1,11 @@
 import streamlit as st
-import requests
+from modules import api_client
 from modules.nav import SideBarLinks
 
 
 
 
-SideBarLinks()
-API_BASE_URL = "http://api:4000"
+SideBarLinks("01_Ava_Fridge")
 user = st.session_state.get("user", {"id": 1})
 user_id = user.get("id", 1)
 
@@ -17,6 +16,23 @@ st.caption("See what you have, what’s expiring, and keep quantities accurate."
 
 
 
+# ---------- Page data, fetched concurrently ----------
+
+
+
+
+page_data = api_client.fan_out({
+    "expiring": (
+        "GET", "/inventory-items/expiring", {"params": {"user_id": user_id, "days_ahead": 7}, "timeout": 5}
+    ),
+    "inventory": ("GET", "/inventory-items", {"params": {"user_id": user_id}, "timeout": 5}),
+    "categories": ("GET", "/categories", {"timeout": 5}),
+    "ingredients": ("GET", "/ingredients", {"timeout": 5}),
+})
+
+
+
+
 # ---------- Helpers for ingredient + category metadata ----------
 
 
@@ -24,7 +40,7 @@ st.caption("See what you have, what’s expiring, and keep quantities accurate."
 
 def fetch_categories():
     try:
-        resp = requests.get(f"{API_BASE_URL}/categories", timeout=5)
+        resp = page_data.result("categories")
         if resp.status_code == 200:
             return resp.json()
     except Exception:
@@ -36,7 +52,7 @@ def fetch_categories():
 
 def fetch_ingredients():
     try:
-        resp = requests.get(f"{API_BASE_URL}/ingredients", timeout=5)
+        resp = page_data.result("ingredients")
         if resp.status_code == 200:
             return resp.json()
     except Exception:
@@ -55,11 +71,7 @@ st.subheader("Expiration Alerts")
 
 
 try:
-    resp = requests.get(
-        f"{API_BASE_URL}/inventory-items/expiring",
-        params={"user_id": user_id, "days_ahead": 7},
-        timeout=5,
-    )
+    resp = page_data.result("expiring")
     if resp.status_code == 200:
         expiring = resp.json()
         if not expiring:
@@ -97,8 +109,8 @@ try:
                         key=f"used_{ingredient_id}_{added_date}_{exp_date}",
                     ):
                         try:
-                            del_resp = requests.delete(
-                                f"{API_BASE_URL}/inventory-items/{ingredient_id}",
+                            del_resp = api_client.delete(
+                                f"/inventory-items/{ingredient_id}",
                                 params={
                                     "user_id": user_id,
                                     "added_date": added_date,
@@ -224,8 +236,8 @@ with st.form("add_inventory"):
 
                 if payload_ing:
                     try:
-                        uresp = requests.put(
-                            f"{API_BASE_URL}/ingredients/{ingredient_id}",
+                        uresp = api_client.put(
+                            f"/ingredients/{ingredient_id}",
                             json=payload_ing,
                             timeout=5,
                         )
@@ -252,8 +264,8 @@ with st.form("add_inventory"):
 
 
                 try:
-                    iresp = requests.post(
-                        f"{API_BASE_URL}/ingredients",
+                    iresp = api_client.post(
+                        "/ingredients",
                         json=ing_payload,
                         timeout=5,
                     )
@@ -281,8 +293,8 @@ with st.form("add_inventory"):
                     "expiration_date": str(exp_date),
                 }
                 try:
-                    resp = requests.post(
-                        f"{API_BASE_URL}/inventory-items", json=payload, timeout=5
+                    resp = api_client.post(
+                        "/inventory-items", json=payload, timeout=5
                     )
                     if resp.status_code in (200, 201):
                         # Use backend message if present, otherwise a generic success
@@ -316,11 +328,7 @@ st.subheader("All Items in My Fridge")
 
 
 try:
-    resp = requests.get(
-        f"{API_BASE_URL}/inventory-items",
-        params={"user_id": user_id},
-        timeout=5,
-    )
+    resp = page_data.result("inventory")
     if resp.status_code == 200:
         items = resp.json()
         if not items:
@@ -366,8 +374,8 @@ try:
                     if st.button("Save", key=f"save_{row_key}"):
                         payload = {"quantity": new_qty}
                         try:
-                            uresp = requests.put(
-                                f"{API_BASE_URL}/inventory-items/{ingredient_id}",
+                            uresp = api_client.put(
+                                f"/inventory-items/{ingredient_id}",
                                 params={
                                     "user_id": user_id,
                                     "added_date": added_date,
@@ -387,8 +395,8 @@ try:
 
                     if st.button("Remove", key=f"del_{row_key}"):
                         try:
-                            dresp = requests.delete(
-                                f"{API_BASE_URL}/inventory-items/{ingredient_id}",
+                            dresp = api_client.delete(
+                                f"/inventory-items/{ingredient_id}",
                                 params={
                                     "user_id": user_id,
                                     "added_date": added_date,
@@ -1,12 +1,11 @@
 import streamlit as st
-import requests
+from modules import api_client
 from modules.nav import SideBarLinks
 
 
 
 
-SideBarLinks()
-API_BASE_URL = "http://api:4000"
+SideBarLinks("02_Ava_Quick_Recipes")
 user = st.session_state.get("user", {"id": 1})
 user_id = user.get("id", 1)
 
@@ -71,7 +70,7 @@ def render_ingredients_list(ingredients):
 def show_recipe_details(recipe_id):
     """Fetch and display full recipe details (ingredients + instructions)."""
     try:
-        dresp = requests.get(f"{API_BASE_URL}/recipes/{recipe_id}", timeout=5)
+        dresp = api_client.get(f"/recipes/{recipe_id}", timeout=5)
         if dresp.status_code == 200:
             details = dresp.json()
 
@@ -99,8 +98,8 @@ def show_recipe_details(recipe_id):
 if st.session_state.get("run_suggestions"):
     # --- Call the suggestions API ---
     try:
-        resp = requests.get(
-            f"{API_BASE_URL}/recipes/suggestions",
+        resp = api_client.get(
+            "/recipes/suggestions",
             params={
                 "user_id": user_id,
                 "max_prep_time": max_prep,  # matches backend
@@ -127,8 +126,8 @@ if st.session_state.get("run_suggestions"):
 
                 # Check Ava's inventory so we can tell *why*.
                 try:
-                    inv_resp = requests.get(
-                        f"{API_BASE_URL}/inventory-items",
+                    inv_resp = api_client.get(
+                        "/inventory-items",
                         params={"user_id": user_id},
                         timeout=5,
                     )
@@ -156,8 +155,8 @@ if st.session_state.get("run_suggestions"):
                 st.write("---")
                 st.subheader("Some example recipes you can browse")
                 try:
-                    fallback_resp = requests.get(
-                        f"{API_BASE_URL}/recipes",
+                    fallback_resp = api_client.get(
+                        "/recipes",
                         params={"status": "Active"},
                         timeout=8,
                     )
@@ -233,8 +232,8 @@ if st.session_state.get("run_suggestions"):
                         # Favorites use the existing API: POST /favorite-recipes
                         if st.button("Favorite", key=f"fav_{rid}"):
                             try:
-                                fresp = requests.post(
-                                    f"{API_BASE_URL}/favorite-recipes",
+                                fresp = api_client.post(
+                                    "/favorite-recipes",
                                     json={"user_id": user_id, "recipe_id": rid},
                                     timeout=5,
                                 )
@@ -258,8 +257,8 @@ st.subheader("My Favorite Recipes")
 
 
 try:
-    fresp = requests.get(
-        f"{API_BASE_URL}/favorite-recipes",
+    fresp = api_client.get(
+        "/favorite-recipes",
         params={"user_id": user_id},
         timeout=5,
     )
@@ -276,8 +275,8 @@ try:
             with cols[1]:
                 if st.button("Remove", key=f"unfav_{rid}"):
                     try:
-                        d = requests.delete(
-                            f"{API_BASE_URL}/favorite-recipes/{rid}",
+                        d = api_client.delete(
+                            f"/favorite-recipes/{rid}",
                             params={"user_id": user_id},
                             timeout=5,
                         )
@@ -1,13 +1,12 @@
 import streamlit as st
-import requests
+from modules import api_client
 from datetime import date, timedelta
 from modules.nav import SideBarLinks
 
 
 
 
-SideBarLinks()
-API_BASE_URL = "http://api:4000"
+SideBarLinks("03_Ava_Groceries")
 user = st.session_state.get("user", {"id": 1})
 user_id = user.get("id", 1)
 
@@ -20,7 +19,7 @@ st.caption("Log what you bought so you don’t double-buy or waste it.")
 
 def fetch_categories():
     try:
-        resp = requests.get(f"{API_BASE_URL}/categories", timeout=5)
+        resp = api_client.get("/categories", timeout=5)
         if resp.status_code == 200:
             return resp.json()
     except Exception:
@@ -32,7 +31,7 @@ def fetch_categories():
 
 def fetch_ingredients():
     try:
-        resp = requests.get(f"{API_BASE_URL}/ingredients", timeout=5)
+        resp = api_client.get("/ingredients", timeout=5)
         if resp.status_code == 200:
             return resp.json()
     except Exception:
@@ -137,8 +136,8 @@ with st.form("groceries_form"):
 
                 if payload_ing:
                     try:
-                        uresp = requests.put(
-                            f"{API_BASE_URL}/ingredients/{ingredient_id}",
+                        uresp = api_client.put(
+                            f"/ingredients/{ingredient_id}",
                             json=payload_ing,
                             timeout=5,
                         )
@@ -164,8 +163,8 @@ with st.form("groceries_form"):
 
 
                 try:
-                    iresp = requests.post(
-                        f"{API_BASE_URL}/ingredients",
+                    iresp = api_client.post(
+                        "/ingredients",
                         json=ing_payload,
                         timeout=5,
                     )
@@ -194,8 +193,8 @@ with st.form("groceries_form"):
                     "expiration_date": str(exp_date),
                 }
                 try:
-                    resp = requests.post(
-                        f"{API_BASE_URL}/inventory-items", json=payload, timeout=5
+                    resp = api_client.post(
+                        "/inventory-items", json=payload, timeout=5
                     )
                     if resp.status_code in (200, 201):
                         msg = "Grocery item added to your inventory."
@@ -230,8 +229,8 @@ st.subheader("Recently Added Items")
 
 
 try:
-    resp = requests.get(
-        f"{API_BASE_URL}/inventory-items",
+    resp = api_client.get(
+        "/inventory-items",
         params={"user_id": user_id},
         timeout=5,
     )
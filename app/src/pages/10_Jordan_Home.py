@@ -1,11 +1,12 @@
 import streamlit as st
+from modules import api_client
 from modules.nav import SideBarLinks
 
 # Page config for this persona's home
 st.set_page_config(page_title="Jordan – Health Dashboard", page_icon="💪")
 
 # Sidebar navigation (respects logged-in role)
-SideBarLinks()
+SideBarLinks("10_Jordan_Home")
 
 # Mock user from session (set in Home.py when "Jordan" logs in)
 user = st.session_state.get("user", {"first_name": "Jordan"})
@@ -17,6 +18,35 @@ st.write(
     "nutrition, and budget."
 )
 
+# At a glance (one call: GET /dashboards/health)
+dashboard = {}
+try:
+    resp = api_client.get("/dashboards/health", params={"user_id": user.get("id", 3)}, timeout=5)
+    if resp.status_code == 200:
+        dashboard = resp.json()
+    else:
+        st.warning(f"Could not load your dashboard: {resp.text}")
+except Exception as e:
+    st.warning(f"Could not load your dashboard: {e}")
+
+if dashboard:
+    m1, m2, m3 = st.columns(3)
+    budget = dashboard.get("weekly_budget_amount")
+    m1.metric("Weekly budget", f"{budget} {dashboard.get('currency') or ''}" if budget is not None else "Not set")
+    m2.metric("Diet", dashboard.get("diet_types") or "Not set")
+    m3.metric("Meal plans", dashboard.get("meal_plan_count", 0))
+
+    plan = dashboard.get("latest_meal_plan")
+    if plan:
+        st.caption(
+            f"Latest plan: {plan.get('StartDate')} → {plan.get('EndDate')} "
+            f"({plan.get('EntryCount', 0)} meals)"
+        )
+    quick = dashboard.get("quick_recipes", [])
+    if quick:
+        st.write("**Quickest recipes right now:** " + ", ".join(r.get("Name") or "Unnamed" for r in quick))
+    st.write("---")
+
 col1, col2 = st.columns(2)
 
 with col1:
@@ -1,10 +1,9 @@
 import streamlit as st
-import requests
+from modules import api_client
 from modules.nav import SideBarLinks
 
 
-SideBarLinks()
-API_BASE_URL = "http://api:4000"
+SideBarLinks("11_Jordan_Preferences")
 user = st.session_state.get("user", {"id": 3})
 user_id = user.get("id", 3)
 
@@ -20,13 +19,16 @@ has_diet = False
 has_budget = False
 
 
+# Both profiles are fetched concurrently
+profiles = api_client.fan_out({
+    "diet": ("GET", "/diet-profile", {"params": {"user_id": user_id}, "timeout": 5}),
+    "budget": ("GET", "/budget-profile", {"params": {"user_id": user_id}, "timeout": 5}),
+})
+
+
 # Diet profile (UsersBudgetProfile: UserID, DietTypes, Notes)
 try:
-    dresp = requests.get(
-        f"{API_BASE_URL}/diet-profile",
-        params={"user_id": user_id},
-        timeout=5,
-    )
+    dresp = profiles.result("diet")
     if dresp.status_code == 200:
         diet_profile = dresp.json()
         has_diet = True
@@ -36,11 +38,7 @@ except Exception:
 
 # Budget profile (UserBudgetProfile: UserID, WeeklyBudgetAmount, Currency)
 try:
-    bresp = requests.get(
-        f"{API_BASE_URL}/budget-profile",
-        params={"user_id": user_id},
-        timeout=5,
-    )
+    bresp = profiles.result("budget")
     if bresp.status_code == 200:
         budget_profile = bresp.json()
         has_budget = True
@@ -165,14 +163,14 @@ if st.button("Save Preferences", type="primary", use_container_width=True):
     try:
         # Diet profile: POST if new, else PUT
         if has_diet:
-            dsave = requests.put(
-                f"{API_BASE_URL}/diet-profile",
+            dsave = api_client.put(
+                "/diet-profile",
                 json=diet_payload,
                 timeout=5,
             )
         else:
-            dsave = requests.post(
-                f"{API_BASE_URL}/diet-profile",
+            dsave = api_client.post(
+                "/diet-profile",
                 json=diet_payload,
                 timeout=5,
             )
@@ -180,14 +178,14 @@ if st.button("Save Preferences", type="primary", use_container_width=True):
 
         # Budget profile: POST if new, else PUT
         if has_budget:
-            bsave = requests.put(
-                f"{API_BASE_URL}/budget-profile",
+            bsave = api_client.put(
+                "/budget-profile",
                 json=budget_payload,
                 timeout=5,
             )
         else:
-            bsave = requests.post(
-                f"{API_BASE_URL}/budget-profile",
+            bsave = api_client.post(
+                "/budget-profile",
                 json=budget_payload,
                 timeout=5,
             )
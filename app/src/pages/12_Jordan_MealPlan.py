@@ -1,13 +1,12 @@
 import streamlit as st
-import requests
+from modules import api_client
 from datetime import date
 from modules.nav import SideBarLinks
 
 
 
 
-SideBarLinks()
-API_BASE_URL = "http://api:4000"
+SideBarLinks("12_Jordan_MealPlan")
 user = st.session_state.get("user", {"id": 3})
 user_id = user.get("id", 3)
 
@@ -45,7 +44,7 @@ if st.button("Generate Meal Plan", type="primary", use_container_width=True):
         "include_leftovers": include_leftovers,
     }
     try:
-        resp = requests.post(f"{API_BASE_URL}/meal-plans", json=payload, timeout=8)
+        resp = api_client.post("/meal-plans", json=payload, timeout=8)
         if resp.status_code in (200, 201):
             plan = resp.json()
             st.session_state["current_plan"] = plan
@@ -65,8 +64,8 @@ st.subheader("My Saved Meal Plans")
 
 
 try:
-    list_resp = requests.get(
-        f"{API_BASE_URL}/meal-plans", params={"user_id": user_id}, timeout=5
+    list_resp = api_client.get(
+        "/meal-plans", params={"user_id": user_id}, timeout=5
     )
     if list_resp.status_code == 200:
         plans = list_resp.json()
@@ -88,8 +87,8 @@ try:
 
 
             # Load full details
-            detail_resp = requests.get(
-                f"{API_BASE_URL}/meal-plans/{plan_id}",
+            detail_resp = api_client.get(
+                f"/meal-plans/{plan_id}",
                 timeout=5,
             )
             if detail_resp.status_code == 200:
@@ -120,8 +119,8 @@ try:
                     key=f"delete_plan_{plan_id}",
                 ):
                     try:
-                        dresp = requests.delete(
-                            f"{API_BASE_URL}/meal-plans/{plan_id}",
+                        dresp = api_client.delete(
+                            f"/meal-plans/{plan_id}",
                             timeout=5,
                         )
                         if dresp.status_code == 200:
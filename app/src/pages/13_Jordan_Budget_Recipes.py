@@ -1,12 +1,11 @@
 import streamlit as st
-import requests
+from modules import api_client
 from modules.nav import SideBarLinks
 
 
 
 
-SideBarLinks()
-API_BASE_URL = "http://api:4000"
+SideBarLinks("13_Jordan_Budget_Recipes")
 
 
 
@@ -36,13 +35,15 @@ if "budget_search" in st.session_state:
     params = {
         # NOTE: backend /recipes currently ignores max_cost
         "status": "Active",
+        # Only what the cards show: skips the ingredient-count join
+        "fields": "RecipeId,Name,PrepTimeMinutes,DifficultyLevel",
     }
     if st.session_state["budget_search"]["difficulty"] != "Any":
         params["difficulty"] = st.session_state["budget_search"]["difficulty"]
 
 
     try:
-        resp = requests.get(f"{API_BASE_URL}/recipes", params=params, timeout=8)
+        resp = api_client.get("/recipes", params=params, timeout=8)
         if resp.status_code == 200:
             recipes = resp.json()
             if not recipes:
@@ -69,7 +70,11 @@ if "budget_search" in st.session_state:
                 with cols[1]:
                     if st.button("See instructions", key=f"inst_{rid}"):
                         try:
-                            dresp = requests.get(f"{API_BASE_URL}/recipes/{rid}", timeout=5)
+                            dresp = api_client.get(
+                                f"/recipes/{rid}",
+                                params={"fields": "Instructions,ingredients"},
+                                timeout=5,
+                            )
                             if dresp.status_code == 200:
                                 detail = dresp.json()
 
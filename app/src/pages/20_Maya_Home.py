@@ -1,8 +1,9 @@
 import streamlit as st
+from modules import api_client
 from modules.nav import SideBarLinks
 
 st.set_page_config(page_title="Maya – Admin Dashboard", page_icon="🖥️")
-SideBarLinks()
+SideBarLinks("20_Maya_Home")
 
 user = st.session_state.get("user", {"first_name": "Maya"})
 first_name = user.get("first_name", "Maya")
@@ -10,6 +11,28 @@ first_name = user.get("first_name", "Maya")
 st.title(f"Welcome, {first_name} (System Admin)")
 st.write("Keep data clean, recipes up to date, and the system healthy.")
 
+# At a glance (one call: GET /dashboards/admin)
+dashboard = {}
+try:
+    resp = api_client.get("/dashboards/admin", timeout=5)
+    if resp.status_code == 200:
+        dashboard = resp.json()
+    else:
+        st.warning(f"Could not load the dashboard: {resp.text}")
+except Exception as e:
+    st.warning(f"Could not load the dashboard: {e}")
+
+if dashboard:
+    m1, m2, m3 = st.columns(3)
+    m1.metric("Open alerts", dashboard.get("open_alert_count", 0))
+    m2.metric("Data quality issues", dashboard.get("data_quality_issues", 0))
+    by_status = dashboard.get("recipes_by_status", {})
+    m3.metric("Active recipes", by_status.get("Active", 0))
+
+    for alert in dashboard.get("recent_open_alerts", []):
+        st.write(f"• **{alert.get('Severity')}** – {alert.get('Message')} ({alert.get('CreatedAt')})")
+    st.write("---")
+
 col1, col2 = st.columns(2)
 
 with col1:
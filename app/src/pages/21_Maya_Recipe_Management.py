@@ -1,11 +1,10 @@
 import streamlit as st
-import requests
+from modules import api_client
 from modules.nav import SideBarLinks
 
 st.set_page_config(page_title="Maya – Recipe Management", page_icon="📖")
-SideBarLinks()
+SideBarLinks("21_Maya_Recipe_Management")
 
-API_BASE_URL = "http://api:4000"
 
 st.title("📖 Recipe Management")
 st.caption("Add, update, remove, and restore recipes in the central database.")
@@ -38,8 +37,8 @@ with tab_add:
                     "status": "Active",
                 }
                 try:
-                    resp = requests.post(
-                        f"{API_BASE_URL}/recipes", json=payload, timeout=8
+                    resp = api_client.post(
+                        "/recipes", json=payload, timeout=8
                     )
                     if resp.status_code in (200, 201):
                         st.success("Recipe created.")
@@ -68,8 +67,8 @@ with tab_update:
             params["status"] = "Inactive"
         # "All" → no status param
 
-        list_resp = requests.get(
-            f"{API_BASE_URL}/recipes",
+        list_resp = api_client.get(
+            "/recipes",
             params=params,
             timeout=8,
         )
@@ -152,8 +151,8 @@ with tab_update:
                             payload["instructions"] = new_instructions
 
                         try:
-                            uresp = requests.put(
-                                f"{API_BASE_URL}/recipes/{rid}",
+                            uresp = api_client.put(
+                                f"/recipes/{rid}",
                                 json=payload,
                                 timeout=8,
                             )
@@ -174,8 +173,8 @@ with tab_delete:
 
     try:
         # Show only active recipes for deletion
-        list_resp = requests.get(
-            f"{API_BASE_URL}/recipes",
+        list_resp = api_client.get(
+            "/recipes",
             params={"status": "Active"},
             timeout=8,
         )
@@ -205,8 +204,8 @@ with tab_delete:
 
                 if st.button("Delete this recipe", type="primary"):
                     try:
-                        dresp = requests.delete(
-                            f"{API_BASE_URL}/recipes/{rid}", timeout=5
+                        dresp = api_client.delete(
+                            f"/recipes/{rid}", timeout=5
                         )
                         if dresp.status_code == 200:
                             st.success("Recipe removed.")
@@ -225,8 +224,8 @@ with tab_restore:
     st.subheader("Restore Inactive Recipe")
 
     try:
-        list_resp = requests.get(
-            f"{API_BASE_URL}/recipes",
+        list_resp = api_client.get(
+            "/recipes",
             params={"status": "Inactive"},
             timeout=8,
         )
@@ -257,8 +256,8 @@ with tab_restore:
                 if st.button("Restore this recipe", type="primary"):
                     try:
                         payload = {"status": "Active"}
-                        uresp = requests.put(
-                            f"{API_BASE_URL}/recipes/{rid}",
+                        uresp = api_client.put(
+                            f"/recipes/{rid}",
                             json=payload,
                             timeout=8,
                         )
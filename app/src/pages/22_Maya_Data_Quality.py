@@ -1,13 +1,12 @@
 import streamlit as st
-import requests
+from modules import api_client
 from modules.nav import SideBarLinks
 
 
 st.set_page_config(page_title="Maya – Data Quality", page_icon="✅")
-SideBarLinks()
+SideBarLinks("22_Maya_Data_Quality")
 
 
-API_BASE_URL = "http://api:4000"
 
 
 st.title("✅ Data Quality Monitor")
@@ -16,35 +15,57 @@ st.caption("Spot orphaned records, missing data, and unused ingredients.")
 
 try:
     # Backend route: @analytics_bp.route("/data-quality-reports", methods=["GET"])
-    resp = requests.get(f"{API_BASE_URL}/data-quality-reports", timeout=8)
+    resp = api_client.get("/data-quality-reports", timeout=8)
     if resp.status_code == 200:
         report = resp.json()
-        orphan_items = report.get("orphan_inventory_items", 0)
-        recipes_without_ing = report.get("recipes_without_ingredients", 0)
-        unused_ing = report.get("unused_ingredients", 0)
+        checks = report.get("checks", [])
 
 
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            st.metric("Orphan inventory items", orphan_items)
-        with col2:
-            st.metric("Recipes missing ingredients", recipes_without_ing)
-        with col3:
-            st.metric("Unused ingredients", unused_ing)
+        cols = st.columns(3)
+        for i, check in enumerate(checks):
+            with cols[i % 3]:
+                st.metric(check.get("label", check.get("name")), check.get("issue_count", 0))
+                st.caption(f"Checked: {check.get('checked_at')}")
 
 
         st.write("---")
-        if orphan_items == recipes_without_ing == unused_ing == 0:
+        failing = [c for c in checks if c.get("issue_count")]
+        if not failing:
             st.success("No data quality issues detected. 🎉")
         else:
             st.warning("There are data quality issues to review.")
-            if orphan_items:
-                st.write(f"- {orphan_items} inventory rows reference missing ingredients.")
-            if recipes_without_ing:
-                st.write(f"- {recipes_without_ing} recipes have no ingredients.")
-            if unused_ing:
-                st.write(f"- {unused_ing} ingredients are never used in any recipe.")
+            for check in failing:
+                line = f"- **{check.get('label')}**: {check.get('issue_count')}"
+                if check.get("sample_ids"):
+                    line += f" (e.g. IDs {', '.join(check['sample_ids'][:5])})"
+                st.write(line)
+
+
+        st.write("---")
+        st.subheader("Re-run checks")
+        selected = st.multiselect(
+            "Checks to re-run (leave empty for all)",
+            [c.get("name") for c in checks],
+            format_func=lambda n: next(
+                (c.get("label") for c in checks if c.get("name") == n), n
+            ),
+        )
+        if st.button("Re-run now", type="primary"):
+            try:
+                # Backend route: @analytics_bp.route("/data-quality-reports/recheck", methods=["POST"])
+                rresp = api_client.post(
+                    "/data-quality-reports/recheck",
+                    json={"checks": selected},
+                    timeout=30,
+                )
+                if rresp.status_code == 200:
+                    st.success("Checks re-run.")
+                    st.rerun()
+                else:
+                    st.error(f"Recheck failed: {rresp.text}")
+            except Exception as e:
+                st.error(f"Error re-running checks: {e}")
     else:
         st.error(f"Error fetching report: {resp.text}")
 except Exception as e:
-    st.error(f"Error connecting to API: {e}")
\ No newline at end of file
+    st.error(f"Error connecting to API: {e}")
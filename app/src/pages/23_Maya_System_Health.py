@@ -1,13 +1,13 @@
 import streamlit as st
-import requests
+from modules import api_client
+from datetime import date, timedelta
 from modules.nav import SideBarLinks
 
 
 st.set_page_config(page_title="Maya – System Health", page_icon="📊")
-SideBarLinks()
+SideBarLinks("23_Maya_System_Health")
 
 
-API_BASE_URL = "http://api:4000"
 
 
 st.title("📊 System Health Monitor")
@@ -18,9 +18,10 @@ st.caption("View metrics and manage system alerts.")
 st.subheader("Key System Metrics")
 
 
+metrics = []
 try:
     # Backend route: @analytics_bp.route("/system-metrics", methods=["GET"])
-    mresp = requests.get(f"{API_BASE_URL}/system-metrics", timeout=8)
+    mresp = api_client.get("/system-metrics", timeout=8)
     if mresp.status_code == 200:
         metrics = mresp.json()
         if metrics:
@@ -37,6 +38,95 @@ except Exception as e:
     st.error(f"Error contacting API: {e}")
 
 
+st.write("---")
+st.subheader("Metric History")
+
+
+if metrics:
+    metric_options = {f"{m.get('MetricID')} – {m.get('Name')}": m for m in metrics}
+    hcol1, hcol2, hcol3 = st.columns(3)
+    with hcol1:
+        metric_label = st.selectbox("Metric", list(metric_options.keys()))
+    with hcol2:
+        days_back = st.selectbox("Range", [1, 7, 30], index=1, format_func=lambda d: f"Last {d} days")
+    with hcol3:
+        resolution = st.selectbox("Resolution", ["auto", "1m", "1h", "1d"])
+
+    history_metric_id = metric_options[metric_label].get("MetricID")
+    try:
+        # Backend route: @analytics_bp.route("/system-metrics/<int:metric_id>/snapshots", methods=["GET"])
+        hresp = api_client.get(
+            f"/system-metrics/{history_metric_id}/snapshots",
+            params={
+                "start": str(date.today() - timedelta(days=days_back)),
+                "bucket": resolution,
+            },
+            timeout=8,
+        )
+        if hresp.status_code == 200:
+            buckets = hresp.json()
+            if not buckets:
+                st.info("No snapshots in this range.")
+            else:
+                st.line_chart(
+                    {
+                        "Time": [b.get("BucketStart") for b in buckets],
+                        "Avg": [b.get("Avg") for b in buckets],
+                        "Max": [b.get("Max") for b in buckets],
+                    },
+                    x="Time",
+                    y=["Avg", "Max"],
+                )
+        else:
+            st.error(f"History error: {hresp.text}")
+    except Exception as e:
+        st.error(f"Error loading metric history: {e}")
+
+
+st.write("---")
+st.subheader("Anomalies")
+
+
+acol1, acol2 = st.columns(2)
+with acol1:
+    anomaly_bucket = st.selectbox("Bucket size", ["1h", "1m", "1d"])
+with acol2:
+    anomaly_threshold = st.slider("Minimum score", 1.0, 10.0, 3.0, 0.5)
+
+try:
+    # Backend route: @analytics_bp.route("/system-metrics/anomalies", methods=["GET"])
+    anresp = api_client.get(
+        "/system-metrics/anomalies",
+        params={"bucket": anomaly_bucket, "threshold": anomaly_threshold, "limit": 20},
+        timeout=15,
+    )
+    if anresp.status_code == 200:
+        anomalies = anresp.json().get("anomalies", [])
+        if not anomalies:
+            st.success("No anomalies in the latest buckets.")
+        else:
+            names = {m.get("MetricID"): m.get("Name") for m in metrics}
+            st.dataframe(
+                [
+                    {
+                        "Metric": names.get(a["MetricID"], a["MetricID"]),
+                        "Bucket": a.get("BucketStart"),
+                        "Value": a.get("Value"),
+                        "Expected": a.get("Expected"),
+                        "Score": a.get("Score"),
+                        "Detector": a.get("Detector"),
+                    }
+                    for a in anomalies
+                ],
+                use_container_width=True,
+                hide_index=True,
+            )
+    else:
+        st.error(f"Anomaly error: {anresp.text}")
+except Exception as e:
+    st.error(f"Error loading anomalies: {e}")
+
+
 st.write("---")
 
 
@@ -46,8 +136,8 @@ st.subheader("Active Alerts")
 
 try:
     # Backend route: @analytics_bp.route("/system-alerts", methods=["GET"])
-    aresp = requests.get(
-        f"{API_BASE_URL}/system-alerts",
+    aresp = api_client.get(
+        "/system-alerts",
         params={"status": "open"},
         timeout=8,
     )
@@ -69,11 +159,15 @@ try:
                     st.caption(f"Created: {created}")
                 with cols[1]:
                     st.caption(f"Metric ID: {alert.get('MetricID')}")
+                    if (alert.get("OccurrenceCount") or 0) > 1:
+                        st.caption(
+                            f"Seen {alert['OccurrenceCount']}x, last at {alert.get('LastSeenAt')}"
+                        )
                 with cols[2]:
                     if st.button("Acknowledge", key=f"ack_{aid}"):
                         try:
-                            uresp = requests.put(
-                                f"{API_BASE_URL}/system-alerts/{aid}",
+                            uresp = api_client.put(
+                                f"/system-alerts/{aid}",
                                 json={"status": "acknowledged"},
                                 timeout=5,
                             )
@@ -86,8 +180,8 @@ try:
                             st.error(f"Error: {e}")
                     if st.button("Resolve", key=f"res_{aid}"):
                         try:
-                            uresp = requests.put(
-                                f"{API_BASE_URL}/system-alerts/{aid}",
+                            uresp = api_client.put(
+                                f"/system-alerts/{aid}",
                                 json={"status": "resolved"},
                                 timeout=5,
                             )
@@ -130,8 +224,8 @@ with st.form("new_alert"):
             }
             try:
                 # Backend route: @analytics_bp.route("/system-alerts", methods=["POST"])
-                resp = requests.post(
-                    f"{API_BASE_URL}/system-alerts",
+                resp = api_client.post(
+                    "/system-alerts",
                     json=payload,
                     timeout=8,
                 )
@@ -1,8 +1,9 @@
 import streamlit as st
+from modules import api_client
 from modules.nav import SideBarLinks
 
 st.set_page_config(page_title="Samuel – Analyst Dashboard", page_icon="📊")
-SideBarLinks()
+SideBarLinks("30_Samuel_Home")
 
 user = st.session_state.get("user", {"first_name": "Samuel"})
 first_name = user.get("first_name", "Samuel")
@@ -10,6 +11,37 @@ first_name = user.get("first_name", "Samuel")
 st.title(f"Welcome, {first_name} (Data Analyst)")
 st.write("Analyze food waste, recipe usage, and user segments to guide improvements.")
 
+# At a glance (one call: GET /dashboards/analyst)
+dashboard = {}
+try:
+    resp = api_client.get("/dashboards/analyst", timeout=5)
+    if resp.status_code == 200:
+        dashboard = resp.json()
+    else:
+        st.warning(f"Could not load the dashboard: {resp.text}")
+except Exception as e:
+    st.warning(f"Could not load the dashboard: {e}")
+
+if dashboard:
+    m1, m2, m3 = st.columns(3)
+    m1.metric("Total waste", dashboard.get("total_waste") or 0)
+    m2.metric("Recipe uses", dashboard.get("total_recipe_usage") or 0)
+    m3.metric("Segments", dashboard.get("segment_count", 0))
+
+    t1, t2 = st.columns(2)
+    with t1:
+        st.write("**Most wasted ingredients**")
+        for row in dashboard.get("top_wasted_ingredients", []):
+            st.write(
+                f"• Ingredient #{row.get('IngredientID')} ({row.get('CategoryName') or 'Uncategorized'}): "
+                f"{row.get('TotalWastedAmount')}"
+            )
+    with t2:
+        st.write("**Most used recipes**")
+        for row in dashboard.get("top_recipes", []):
+            st.write(f"• {row.get('Name')}: {row.get('TotalUsageCount')}")
+    st.write("---")
+
 col1, col2 = st.columns(2)
 with col1:
     st.subheader("Analytics you can explore")
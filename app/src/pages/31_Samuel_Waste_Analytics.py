@@ -1,12 +1,12 @@
+import pandas as pd
 import streamlit as st
-import requests
+from modules import api_client
 from modules.nav import SideBarLinks
 
 
 
 
-SideBarLinks()
-API_BASE_URL = "http://api:4000"
+SideBarLinks("31_Samuel_Waste_Analytics")
 
 
 
@@ -37,37 +37,32 @@ if st.button("Load waste statistics", type="primary", use_container_width=True):
 
     try:
         # Back end route is /waste-statistics (no /analytics prefix)
-        resp = requests.get(f"{API_BASE_URL}/waste-statistics", params=params, timeout=8)
+        resp = api_client.get(
+            "/waste-statistics", params={**params, "format": "columnar"}, timeout=8
+        )
         if resp.status_code == 200:
-            data = resp.json()
-            if not data:
+            data = api_client.frame(resp)
+            if data.empty:
                 st.info("No waste data for this selection.")
                 st.stop()
 
-
-            # Build chart data (top 10 ingredients)
-            labels = []
-            values = []
-            for row in data[:10]:
-                ing_label = row.get("IngredientName") or f"ID {row.get('IngredientID')}"
-                total = float(row.get("TotalWastedAmount", 0) or 0)
-                labels.append(ing_label)
-                values.append(total)
+            ids = data["IngredientID"].astype(str)
+            names = data["IngredientName"] if "IngredientName" in data else pd.Series(None, index=data.index)
+            totals = pd.to_numeric(data["TotalWastedAmount"], errors="coerce").fillna(0)
 
 
+            # Build chart data (top 10 ingredients)
             chart_data = {
-                "Ingredient": labels,
-                "TotalWastedAmount": values,
+                "Ingredient": names.fillna("ID " + ids).head(10),
+                "TotalWastedAmount": totals.head(10),
             }
             st.bar_chart(chart_data, x="Ingredient", y="TotalWastedAmount")
 
 
             st.write("---")
             st.subheader("Details")
-            for row in data:
-                ing_label = row.get("IngredientName") or f"Ingredient {row.get('IngredientID')}"
-                total = float(row.get("TotalWastedAmount", 0) or 0)
-                rate = row.get("AvgWasteRatePercent")
+            rates = data["AvgWasteRatePercent"] if "AvgWasteRatePercent" in data else pd.Series(None, index=data.index)
+            for ing_label, total, rate in zip(names.fillna("Ingredient " + ids), totals, rates):
                 st.write(
                     f"- **{ing_label}** – wasted {total:.2f} units "
                     f"(avg rate: {rate}%)"
@@ -1,12 +1,12 @@
+import pandas as pd
 import streamlit as st
-import requests
+from modules import api_client
 from modules.nav import SideBarLinks
 
 
 
 
-SideBarLinks()
-API_BASE_URL = "http://api:4000"
+SideBarLinks("32_Samuel_Recipe_Trends")
 
 
 
@@ -41,30 +41,21 @@ if st.button("Load recipe usage statistics", type="primary", use_container_width
 
     try:
         # Backend route is /recipe-usage-statistics (no /analytics prefix)
-        resp = requests.get(
-            f"{API_BASE_URL}/recipe-usage-statistics", params=params, timeout=8
+        resp = api_client.get(
+            "/recipe-usage-statistics", params={**params, "format": "columnar"}, timeout=8
         )
         if resp.status_code == 200:
-            data = resp.json()
-            if not data:
+            data = api_client.frame(resp)
+            if data.empty:
                 st.info("No usage data available for this selection.")
                 st.stop()
 
 
             # Aggregate by recipe name using TotalUsageCount
-            recipes = []
-            counts = []
-            for row in data:
-                name = row.get("Name") or f"Recipe {row.get('RecipeID')}"
-                total_usage = float(row.get("TotalUsageCount", 0) or 0)
-                recipes.append(name)
-                counts.append(total_usage)
-
-
             st.subheader("Usage by Recipe (Top)")
             chart_data = {
-                "Recipe": recipes,
-                "TotalUsageCount": counts,
+                "Recipe": data["Name"].fillna("Recipe " + data["RecipeID"].astype(str)),
+                "TotalUsageCount": pd.to_numeric(data["TotalUsageCount"], errors="coerce").fillna(0),
             }
             # Use recipe names as x-axis labels
             st.bar_chart(chart_data, x="Recipe", y="TotalUsageCount")
@@ -72,8 +63,7 @@ if st.button("Load recipe usage statistics", type="primary", use_container_width
 
             st.write("---")
             st.subheader("Raw rows")
-            for row in data[:20]:
-                st.write(row)
+            st.dataframe(data.head(20), use_container_width=True)
         else:
             st.error(f"Error: {resp.text}")
     except Exception as e:
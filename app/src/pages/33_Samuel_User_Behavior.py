@@ -1,12 +1,11 @@
 import streamlit as st
-import requests
+from modules import api_client
 from modules.nav import SideBarLinks
 
 
 
 
-SideBarLinks()
-API_BASE_URL = "http://api:4000"
+SideBarLinks("33_Samuel_User_Behavior")
 
 
 
@@ -23,7 +22,7 @@ st.subheader("Available Demographic Segments")
 segments = []
 try:
     # Backend route is /demographic-segments (no /analytics prefix)
-    resp = requests.get(f"{API_BASE_URL}/demographic-segments", timeout=8)
+    resp = api_client.get("/demographic-segments", timeout=8)
     if resp.status_code == 200:
         segments = resp.json()
         if segments:
@@ -75,12 +74,19 @@ if st.button("Generate report", type="primary", use_container_width=True):
         summary_params["period_id"] = period_id
 
 
+    # Summary and every segment's statistics are fetched concurrently
+    calls = {"summary": ("GET", "/analytics/reports", {"params": summary_params, "timeout": 10})}
+    for seg_id in selected_ids:
+        seg_params = {"segment_id": seg_id}
+        if period_id > 0:
+            seg_params["period_id"] = period_id
+        calls[("waste", seg_id)] = ("GET", "/waste-statistics", {"params": seg_params, "timeout": 10})
+        calls[("usage", seg_id)] = ("GET", "/recipe-usage-statistics", {"params": seg_params, "timeout": 10})
+    report = api_client.fan_out(calls)
+
+
     try:
-        summary_resp = requests.get(
-            f"{API_BASE_URL}/analytics/reports",
-            params=summary_params,
-            timeout=10,
-        )
+        summary_resp = report.result("summary")
         if summary_resp.status_code == 200:
             overall = summary_resp.json()
             st.subheader("Overall Summary (All Segments)")
@@ -110,20 +116,10 @@ if st.button("Generate report", type="primary", use_container_width=True):
             st.markdown(f"### Segment {seg_id} – {seg.get('Name')}")
 
 
-            base_params = {}
-            if period_id > 0:
-                base_params["period_id"] = period_id
-            base_params["segment_id"] = seg_id
-
-
             # --- Waste statistics for this segment (GET /waste-statistics) ---
             total_waste = 0.0
             try:
-                wresp = requests.get(
-                    f"{API_BASE_URL}/waste-statistics",
-                    params=base_params,
-                    timeout=10,
-                )
+                wresp = report.result(("waste", seg_id))
                 if wresp.status_code == 200:
                     wdata = wresp.json()
                     total_waste = sum(
@@ -142,11 +138,7 @@ if st.button("Generate report", type="primary", use_container_width=True):
             total_usage = 0
             total_unique_users = 0
             try:
-                uresp = requests.get(
-                    f"{API_BASE_URL}/recipe-usage-statistics",
-                    params=base_params,
-                    timeout=10,
-                )
+                uresp = report.result(("usage", seg_id))
                 if uresp.status_code == 200:
                     udata = uresp.json()
                     total_usage = sum(
@@ -2,7 +2,7 @@ import streamlit as st
 from modules.nav import SideBarLinks
 
 
-SideBarLinks(show_home=True)
+SideBarLinks("34_About", show_home=True)
 
 st.title("About MealMind")
 
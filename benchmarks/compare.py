@@ -0,0 +1,85 @@
+#------------------------------------------------------------
+# Diff two benchmark reports and flag regressions.
+#
+# A route/concurrency pair regresses when its p95 latency grows
+# or its throughput drops by more than the tolerance, when it
+# issues more SQL statements per request, or when it starts
+# failing.
+#
+#   python -m benchmarks.compare benchmarks/baselines/scale-100.json benchmarks/results/<report>.json
+#------------------------------------------------------------
+import argparse
+import json
+import sys
+
+
+DEFAULT_TOLERANCE = 0.2
+
+
+def _key(result) -> tuple:
+    return result["method"], result["path"], result["concurrency"]
+
+
+def find_regressions(baseline: dict, current: dict, tolerance: float = DEFAULT_TOLERANCE) -> list[dict]:
+    before = {_key(r): r for r in baseline.get("results", [])}
+    regressions = []
+    for result in current.get("results", []):
+        old = before.get(_key(result))
+        if old is None:
+            continue
+        checks = []
+        if old["p95_ms"] and result["p95_ms"] > old["p95_ms"] * (1 + tolerance):
+            checks.append(("p95_ms", old["p95_ms"], result["p95_ms"]))
+        if old["throughput_rps"] and result["throughput_rps"] is not None and \
+                result["throughput_rps"] < old["throughput_rps"] * (1 - tolerance):
+            checks.append(("throughput_rps", old["throughput_rps"], result["throughput_rps"]))
+        if old["queries_per_request"] is not None and result["queries_per_request"] is not None and \
+                result["queries_per_request"] > old["queries_per_request"]:
+            checks.append(("queries_per_request", old["queries_per_request"], result["queries_per_request"]))
+        if result["errors"] > old["errors"]:
+            checks.append(("errors", old["errors"], result["errors"]))
+
+        for metric, was, now in checks:
+            regressions.append({
+                "method": result["method"],
+                "path": result["path"],
+                "concurrency": result["concurrency"],
+                "metric": metric,
+                "baseline": was,
+                "current": now,
+                "change": round((now - was) / was, 3) if was else None,
+            })
+    return regressions
+
+
+def print_regressions(regressions: list[dict]) -> None:
+    print(f"{len(regressions)} regression(s):")
+    for r in regressions:
+        change = f" ({r['change']:+.0%})" if r["change"] is not None else ""
+        print(
+            f"  {r['method']:<6} {r['path']:<42} c={r['concurrency']:<3} "
+            f"{r['metric']}: {r['baseline']} -> {r['current']}{change}"
+        )
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Compare a benchmark report with a baseline.")
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.current, encoding="utf-8") as f:
+        current = json.load(f)
+
+    regressions = find_regressions(baseline, current, args.tolerance)
+    if regressions:
+        print_regressions(regressions)
+        sys.exit(1)
+    print("No regressions.")
+
+
+if __name__ == "__main__":
+    main()
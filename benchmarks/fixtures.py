@@ -0,0 +1,551 @@
+#------------------------------------------------------------
+# Bulk fixture loading and named snapshots for benchmark and
+# test databases.
+#
+# `load` ingests a directory written by
+# `generate_mock_data.py --format tsv|csv --out DIR` in the
+# FK-safe order of its manifest.json: secondary indexes and
+# foreign keys are dropped first, rows go in through
+# LOAD DATA LOCAL INFILE (or batched multi-row INSERTs when the
+# server does not allow local infile; --enable-local-infile
+# turns the server-wide setting on instead), then the indexes and
+# keys are rebuilt and every table's row count is checked
+# against the manifest.
+#
+# `save` copies a loaded database into a snapshot schema on the
+# same server. `prepare` clones that snapshot once more into a
+# spare schema, and `restore` swaps the spare tables in with one
+# atomic RENAME TABLE (foreign keys are dropped and re-added
+# without validation around it), so a restore moves no rows
+# whatever the data size. The next spare is then cloned by a
+# detached `prepare` process; a restore that finds no spare
+# clones one first and so costs one full copy.
+#
+#   python -m benchmarks.fixtures load /tmp/mealmind-10000 --database mealmind_bench
+#   python -m benchmarks.fixtures save scale10000 --database mealmind_bench
+#   python -m benchmarks.fixtures prepare scale10000 --database mealmind_bench
+#   python -m benchmarks.fixtures restore scale10000 --database mealmind_bench
+#------------------------------------------------------------
+import argparse
+import csv
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+
+import pymysql
+
+from benchmarks.seed import ROOT, add_connection_args, connect
+
+
+SNAPSHOT_SEPARATOR = "__snap_"
+# Spare copy a restore swaps in, the schema it is built in, and where the replaced tables go
+CLONE_SEPARATOR = "__clone_"
+BUILD_SEPARATOR = "__build_"
+REPLACED_SEPARATOR = "__old_"
+_SNAPSHOT_NAME = re.compile(r"^\w{1,32}$")
+
+# Rows per INSERT when LOAD DATA LOCAL INFILE is not available
+INSERT_BATCH_ROWS = 5000
+
+_LOAD_OPTIONS = {
+    "tsv": "FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' LINES TERMINATED BY '\\n'",
+    "csv": "FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' ESCAPED BY '\\\\' LINES TERMINATED BY '\\n'",
+}
+_TSV_ESCAPES = re.compile(r"\\(.)")
+_TSV_UNESCAPED = {"t": "\t", "n": "\n", "\\": "\\", "0": "\0"}
+
+
+def quote(name: str) -> str:
+    return "`" + name.replace("`", "``") + "`"
+
+
+def base_tables(cursor, database: str) -> list[str]:
+    cursor.execute(
+        "SELECT TABLE_NAME FROM information_schema.TABLES "
+        "WHERE TABLE_SCHEMA = %s AND TABLE_TYPE = 'BASE TABLE' ORDER BY TABLE_NAME",
+        (database,),
+    )
+    return [row[0] for row in cursor.fetchall()]
+
+
+def row_counts(cursor, database: str, tables) -> dict:
+    counts = {}
+    for table in tables:
+        cursor.execute(f"SELECT COUNT(*) FROM {quote(database)}.{quote(table)}")
+        counts[table] = cursor.fetchone()[0]
+    return counts
+
+
+def estimated_row_counts(cursor, database: str, tables) -> dict:
+    """InnoDB's row estimates: no table scan, unlike row_counts()."""
+    cursor.execute(
+        "SELECT TABLE_NAME, TABLE_ROWS FROM information_schema.TABLES WHERE TABLE_SCHEMA = %s",
+        (database,),
+    )
+    estimates = {name: int(rows or 0) for name, rows in cursor.fetchall()}
+    return {table: estimates.get(table, 0) for table in tables}
+
+
+# ------------- DEFERRED INDEXES -------------
+
+def secondary_indexes(cursor, database: str, table: str) -> list[dict]:
+    cursor.execute(
+        "SELECT INDEX_NAME, NON_UNIQUE, COLUMN_NAME, SUB_PART FROM information_schema.STATISTICS "
+        "WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s AND INDEX_NAME <> 'PRIMARY' "
+        "ORDER BY INDEX_NAME, SEQ_IN_INDEX",
+        (database, table),
+    )
+    indexes = {}
+    for name, non_unique, column, sub_part in cursor.fetchall():
+        index = indexes.setdefault(name, {"name": name, "unique": not non_unique, "columns": []})
+        index["columns"].append(quote(column) + (f"({sub_part})" if sub_part else ""))
+    return list(indexes.values())
+
+
+def foreign_keys(cursor, database: str, table: str) -> list[dict]:
+    cursor.execute(
+        "SELECT k.CONSTRAINT_NAME, k.COLUMN_NAME, k.REFERENCED_TABLE_NAME, k.REFERENCED_COLUMN_NAME, "
+        "       r.UPDATE_RULE, r.DELETE_RULE "
+        "FROM information_schema.KEY_COLUMN_USAGE k "
+        "JOIN information_schema.REFERENTIAL_CONSTRAINTS r "
+        "  ON r.CONSTRAINT_SCHEMA = k.CONSTRAINT_SCHEMA AND r.CONSTRAINT_NAME = k.CONSTRAINT_NAME "
+        " AND r.TABLE_NAME = k.TABLE_NAME "
+        "WHERE k.TABLE_SCHEMA = %s AND k.TABLE_NAME = %s AND k.REFERENCED_TABLE_NAME IS NOT NULL "
+        "ORDER BY k.CONSTRAINT_NAME, k.ORDINAL_POSITION",
+        (database, table),
+    )
+    keys = {}
+    for name, column, ref_table, ref_column, on_update, on_delete in cursor.fetchall():
+        key = keys.setdefault(name, {
+            "name": name, "columns": [], "ref_table": ref_table, "ref_columns": [],
+            "on_update": on_update, "on_delete": on_delete,
+        })
+        key["columns"].append(quote(column))
+        key["ref_columns"].append(quote(ref_column))
+    return list(keys.values())
+
+
+def _drop_foreign_keys(cursor, database: str, saved: dict) -> None:
+    for table, definitions in saved.items():
+        if definitions["foreign_keys"]:
+            drops = ", ".join(f"DROP FOREIGN KEY {quote(k['name'])}" for k in definitions["foreign_keys"])
+            cursor.execute(f"ALTER TABLE {quote(database)}.{quote(table)} {drops}")
+
+
+def drop_foreign_keys(cursor, database: str, tables) -> dict:
+    """Drop only the foreign keys (a metadata change); rebuild_indexes() re-adds them."""
+    saved = {
+        table: {"indexes": [], "foreign_keys": foreign_keys(cursor, database, table)}
+        for table in tables
+    }
+    _drop_foreign_keys(cursor, database, saved)
+    return saved
+
+
+def drop_secondary_indexes(cursor, database: str, tables) -> dict:
+    """Drop foreign keys and secondary indexes; returns their definitions for rebuild_indexes()."""
+    saved = {
+        table: {
+            "indexes": secondary_indexes(cursor, database, table),
+            "foreign_keys": foreign_keys(cursor, database, table),
+        }
+        for table in tables
+    }
+    # Every foreign key first: InnoDB refuses to drop an index a constraint still uses
+    _drop_foreign_keys(cursor, database, saved)
+    for table, definitions in saved.items():
+        if definitions["indexes"]:
+            drops = ", ".join(f"DROP INDEX {quote(i['name'])}" for i in definitions["indexes"])
+            cursor.execute(f"ALTER TABLE {quote(database)}.{quote(table)} {drops}")
+    return saved
+
+
+def rebuild_indexes(cursor, database: str, saved: dict) -> None:
+    """Re-create what drop_secondary_indexes() removed (FKs are not re-validated)."""
+    for table, definitions in saved.items():
+        if definitions["indexes"]:
+            adds = ", ".join(
+                f"ADD {'UNIQUE ' if i['unique'] else ''}INDEX {quote(i['name'])} ({', '.join(i['columns'])})"
+                for i in definitions["indexes"]
+            )
+            cursor.execute(f"ALTER TABLE {quote(database)}.{quote(table)} {adds}")
+    cursor.execute("SELECT @@SESSION.foreign_key_checks")
+    previous = cursor.fetchone()[0]
+    cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+    try:
+        for table, definitions in saved.items():
+            if definitions["foreign_keys"]:
+                adds = ", ".join(
+                    f"ADD CONSTRAINT {quote(k['name'])} FOREIGN KEY ({', '.join(k['columns'])}) "
+                    f"REFERENCES {quote(k['ref_table'])} ({', '.join(k['ref_columns'])}) "
+                    f"ON UPDATE {k['on_update']} ON DELETE {k['on_delete']}"
+                    for k in definitions["foreign_keys"]
+                )
+                cursor.execute(f"ALTER TABLE {quote(database)}.{quote(table)} {adds}")
+    finally:
+        cursor.execute("SET FOREIGN_KEY_CHECKS = %s", (previous,))
+
+
+def bulk_session(cursor) -> tuple:
+    """Turn FK and unique checks off; returns the previous values for end_bulk_session()."""
+    cursor.execute("SELECT @@SESSION.foreign_key_checks, @@SESSION.unique_checks")
+    previous = cursor.fetchone()
+    cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+    cursor.execute("SET UNIQUE_CHECKS = 0")
+    return previous
+
+
+def end_bulk_session(cursor, previous) -> None:
+    cursor.execute("SET FOREIGN_KEY_CHECKS = %s, UNIQUE_CHECKS = %s", previous)
+
+
+# ------------- LOADING -------------
+
+def local_infile_enabled(cursor, enable: bool = False) -> bool:
+    """
+    Whether LOAD DATA LOCAL INFILE can be used. The server-wide setting is only
+    turned on when `enable` is set; otherwise loading falls back to INSERTs.
+    """
+    cursor.execute("SELECT @@GLOBAL.local_infile")
+    if cursor.fetchone()[0]:
+        return True
+    if not enable:
+        return False
+    try:
+        cursor.execute("SET GLOBAL local_infile = 1")
+        return True
+    except pymysql.MySQLError:
+        return False
+
+
+def _unescape(match) -> str:
+    return _TSV_UNESCAPED.get(match.group(1), match.group(1))
+
+
+def _read_rows(path: str, fmt: str):
+    with open(path, encoding="utf-8", newline="") as f:
+        if fmt == "csv":
+            reader = csv.reader(f)
+            next(reader, None)
+            for row in reader:
+                yield [None if v == "\\N" else v for v in row]
+        else:
+            next(f, None)
+            for line in f:
+                yield [
+                    None if v == "\\N" else _TSV_ESCAPES.sub(_unescape, v)
+                    for v in line.rstrip("\n").split("\t")
+                ]
+
+
+def load_table(conn, cursor, database: str, table: dict, directory: str, fmt: str, use_infile: bool) -> None:
+    path = os.path.abspath(os.path.join(directory, table["file"]))
+    columns = ", ".join(quote(c) for c in table["columns"])
+    target = f"{quote(database)}.{quote(table['name'])}"
+    if use_infile:
+        cursor.execute(
+            f"LOAD DATA LOCAL INFILE %s INTO TABLE {target} CHARACTER SET utf8mb4 "
+            f"{_LOAD_OPTIONS[fmt]} IGNORE 1 LINES ({columns})",
+            (path,),
+        )
+    else:
+        placeholders = ", ".join(["%s"] * len(table["columns"]))
+        statement = f"INSERT INTO {target} ({columns}) VALUES ({placeholders})"
+        batch = []
+        for row in _read_rows(path, fmt):
+            batch.append(row)
+            if len(batch) >= INSERT_BATCH_ROWS:
+                cursor.executemany(statement, batch)
+                batch = []
+        if batch:
+            cursor.executemany(statement, batch)
+    conn.commit()
+
+
+def load_fixtures(args, directory: str, enable_local_infile: bool = False) -> dict:
+    """
+    Load a generator output directory into args.database; returns actual row counts.
+    enable_local_infile allows turning the server's global local_infile on.
+    """
+    with open(os.path.join(directory, "manifest.json"), encoding="utf-8") as f:
+        manifest = json.load(f)
+    fmt = manifest["format"]
+    if fmt not in _LOAD_OPTIONS:
+        raise ValueError(f"cannot bulk-load {fmt!r} fixtures; generate them with --format tsv or csv")
+
+    conn = connect(args, args.database, local_infile=True)
+    try:
+        with conn.cursor() as cursor:
+            use_infile = local_infile_enabled(cursor, enable_local_infile)
+            tables = [t["name"] for t in manifest["tables"]]
+            previous = bulk_session(cursor)
+            try:
+                saved = drop_secondary_indexes(cursor, args.database, tables)
+                try:
+                    for table in manifest["tables"]:
+                        started = time.perf_counter()
+                        load_table(conn, cursor, args.database, table, directory, fmt, use_infile)
+                        print(f"  {table['name']:<22} {table['rows']:>12} rows  {time.perf_counter() - started:7.1f}s")
+                finally:
+                    started = time.perf_counter()
+                    rebuild_indexes(cursor, args.database, saved)
+                    print(f"  indexes and foreign keys rebuilt in {time.perf_counter() - started:.1f}s")
+            finally:
+                end_bulk_session(cursor, previous)
+            counts = row_counts(cursor, args.database, tables)
+    finally:
+        conn.close()
+
+    mismatched = [
+        f"{t['name']}: expected {t['rows']}, found {counts[t['name']]}"
+        for t in manifest["tables"] if counts[t["name"]] != t["rows"]
+    ]
+    if mismatched:
+        details = ", ".join(mismatched)
+        raise RuntimeError(f"row counts do not match the manifest ({details})")
+    return counts
+
+
+# ------------- SNAPSHOTS -------------
+
+def snapshot_schema(database: str, name: str, separator: str = SNAPSHOT_SEPARATOR) -> str:
+    if not _SNAPSHOT_NAME.match(name):
+        raise ValueError("snapshot names are 1-32 letters, digits or underscores")
+    return f"{database}{separator}{name}"
+
+
+def _lock_clone(cursor, clone: str) -> None:
+    """Serialize building and swapping in a snapshot's spare copy (released when the connection closes)."""
+    cursor.execute("SELECT GET_LOCK(%s, -1)", (clone,))
+    if cursor.fetchone()[0] != 1:
+        raise RuntimeError(f"could not lock {clone}")
+
+
+def _clone_ready(cursor, clone: str, tables) -> bool:
+    return set(base_tables(cursor, clone)) == set(tables)
+
+
+def _build_clone(conn, cursor, database: str, name: str, tables) -> None:
+    """
+    Copy the snapshot into its spare schema. The copy is made in a build schema
+    and renamed into place at the end, so an interrupted build never looks ready.
+    """
+    snapshot = snapshot_schema(database, name)
+    clone = snapshot_schema(database, name, CLONE_SEPARATOR)
+    build = snapshot_schema(database, name, BUILD_SEPARATOR)
+    cursor.execute(f"DROP DATABASE IF EXISTS {quote(build)}")
+    cursor.execute(f"DROP DATABASE IF EXISTS {quote(clone)}")
+    cursor.execute(f"CREATE DATABASE {quote(build)}")
+    previous = bulk_session(cursor)
+    try:
+        for table in tables:
+            cursor.execute(f"CREATE TABLE {quote(build)}.{quote(table)} LIKE {quote(snapshot)}.{quote(table)}")
+            cursor.execute(
+                f"INSERT INTO {quote(build)}.{quote(table)} SELECT * FROM {quote(snapshot)}.{quote(table)}"
+            )
+            conn.commit()
+    finally:
+        end_bulk_session(cursor, previous)
+    counts = row_counts(cursor, build, tables)
+    expected = row_counts(cursor, snapshot, tables)
+    if counts != expected:
+        raise RuntimeError(f"cloned row counts {counts} do not match snapshot {expected}")
+    cursor.execute(f"CREATE DATABASE {quote(clone)}")
+    cursor.execute(
+        "RENAME TABLE "
+        + ", ".join(f"{quote(build)}.{quote(t)} TO {quote(clone)}.{quote(t)}" for t in tables)
+    )
+    cursor.execute(f"DROP DATABASE {quote(build)}")
+
+
+def save_snapshot(args, name: str) -> dict:
+    snapshot = snapshot_schema(args.database, name)
+    conn = connect(args)
+    try:
+        with conn.cursor() as cursor:
+            tables = base_tables(cursor, args.database)
+            cursor.execute(f"DROP DATABASE IF EXISTS {quote(snapshot)}")
+            # A spare copy of the snapshot this replaces is stale
+            cursor.execute(f"DROP DATABASE IF EXISTS {quote(snapshot_schema(args.database, name, CLONE_SEPARATOR))}")
+            cursor.execute(f"CREATE DATABASE {quote(snapshot)}")
+            previous = bulk_session(cursor)
+            try:
+                for table in tables:
+                    # LIKE copies columns and indexes but not foreign keys, which a snapshot does not need
+                    cursor.execute(
+                        f"CREATE TABLE {quote(snapshot)}.{quote(table)} LIKE {quote(args.database)}.{quote(table)}"
+                    )
+                    cursor.execute(
+                        f"INSERT INTO {quote(snapshot)}.{quote(table)} SELECT * FROM {quote(args.database)}.{quote(table)}"
+                    )
+                    conn.commit()
+            finally:
+                end_bulk_session(cursor, previous)
+            return row_counts(cursor, snapshot, tables)
+    finally:
+        conn.close()
+
+
+def prepare_snapshot(args, name: str) -> bool:
+    """Clone the snapshot's spare copy unless one is ready; returns whether a copy was made."""
+    snapshot = snapshot_schema(args.database, name)
+    clone = snapshot_schema(args.database, name, CLONE_SEPARATOR)
+    conn = connect(args)
+    try:
+        with conn.cursor() as cursor:
+            tables = base_tables(cursor, snapshot)
+            if not tables:
+                raise ValueError(f"snapshot {name!r} does not exist for {args.database}")
+            _lock_clone(cursor, clone)
+            if _clone_ready(cursor, clone, tables):
+                return False
+            _build_clone(conn, cursor, args.database, name, tables)
+            return True
+    finally:
+        conn.close()
+
+
+def prepare_in_background(args, name: str) -> None:
+    """Start a detached `prepare` so the next restore of this snapshot is a swap again."""
+    subprocess.Popen(
+        [
+            sys.executable, "-m", "benchmarks.fixtures",
+            "--host", args.host, "--port", str(args.port), "--user", args.user,
+            "--database", args.database, "prepare", name,
+        ],
+        cwd=ROOT,
+        # add_connection_args reads the password from here, keeping it off the command line
+        env=dict(os.environ, MYSQL_ROOT_PASSWORD=args.password),
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+
+def restore_snapshot(args, name: str, reclone: bool = True) -> dict:
+    """
+    Swap the snapshot's spare copy in for the database's tables; returns InnoDB's
+    row estimates. The copy's row counts were checked when it was cloned. With
+    reclone the next spare copy is cloned by a background process; callers that
+    time queries right after a restore pass False and call prepare_snapshot()
+    once they are done.
+    """
+    snapshot = snapshot_schema(args.database, name)
+    clone = snapshot_schema(args.database, name, CLONE_SEPARATOR)
+    replaced = snapshot_schema(args.database, name, REPLACED_SEPARATOR)
+    # rebuild_indexes() names referenced tables without a schema
+    conn = connect(args, args.database)
+    try:
+        with conn.cursor() as cursor:
+            tables = base_tables(cursor, snapshot)
+            if not tables:
+                raise ValueError(f"snapshot {name!r} does not exist for {args.database}")
+            _lock_clone(cursor, clone)
+            if not _clone_ready(cursor, clone, tables):
+                print(f"  no spare copy of {name!r} prepared; cloning it first")
+                _build_clone(conn, cursor, args.database, name, tables)
+
+            current = [t for t in base_tables(cursor, args.database) if t in tables]
+            previous = bulk_session(cursor)
+            try:
+                # RENAME TABLE does not carry foreign keys across schemas; they are re-added by name
+                saved = drop_foreign_keys(cursor, args.database, current)
+                try:
+                    cursor.execute(f"DROP DATABASE IF EXISTS {quote(replaced)}")
+                    cursor.execute(f"CREATE DATABASE {quote(replaced)}")
+                    # One statement, so the swap is atomic
+                    cursor.execute(
+                        "RENAME TABLE "
+                        + ", ".join(
+                            [f"{quote(args.database)}.{quote(t)} TO {quote(replaced)}.{quote(t)}" for t in current]
+                            + [f"{quote(clone)}.{quote(t)} TO {quote(args.database)}.{quote(t)}" for t in tables]
+                        )
+                    )
+                finally:
+                    rebuild_indexes(cursor, args.database, saved)
+            finally:
+                end_bulk_session(cursor, previous)
+            cursor.execute(f"DROP DATABASE {quote(replaced)}")
+            cursor.execute(f"DROP DATABASE {quote(clone)}")
+            counts = estimated_row_counts(cursor, args.database, tables)
+    finally:
+        conn.close()
+
+    if reclone:
+        prepare_in_background(args, name)
+    return counts
+
+
+def list_snapshots(args) -> list[tuple[str, int]]:
+    conn = connect(args)
+    try:
+        with conn.cursor() as cursor:
+            prefix = f"{args.database}{SNAPSHOT_SEPARATOR}"
+            cursor.execute(
+                "SELECT TABLE_SCHEMA, SUM(TABLE_ROWS) FROM information_schema.TABLES "
+                "WHERE TABLE_SCHEMA LIKE %s GROUP BY TABLE_SCHEMA ORDER BY TABLE_SCHEMA",
+                (prefix.replace("_", "\\_") + "%",),
+            )
+            return [(schema[len(prefix):], int(rows or 0)) for schema, rows in cursor.fetchall()]
+    finally:
+        conn.close()
+
+
+def drop_snapshot(args, name: str) -> None:
+    conn = connect(args)
+    try:
+        with conn.cursor() as cursor:
+            for separator in (SNAPSHOT_SEPARATOR, CLONE_SEPARATOR, BUILD_SEPARATOR):
+                cursor.execute(f"DROP DATABASE IF EXISTS {quote(snapshot_schema(args.database, name, separator))}")
+    finally:
+        conn.close()
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Load fixtures and manage snapshots of a benchmark database.")
+    add_connection_args(parser)
+    commands = parser.add_subparsers(dest="command", required=True)
+    load = commands.add_parser("load", help="bulk-load a generate_mock_data.py --out directory")
+    load.add_argument("directory")
+    load.add_argument("--enable-local-infile", action="store_true",
+                      help="allow SET GLOBAL local_infile = 1 if the server has it off (server-wide)")
+    for command in ("save", "restore", "drop"):
+        commands.add_parser(command, help=f"{command} a named snapshot").add_argument("name")
+    prepare = commands.add_parser("prepare", help="clone a snapshot's spare copy now (restore also does it, in the background)")
+    prepare.add_argument("name")
+    commands.add_parser("list", help="list snapshots of --database")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    try:
+        if args.command == "load":
+            counts = load_fixtures(args, args.directory, args.enable_local_infile)
+        elif args.command == "save":
+            counts = save_snapshot(args, args.name)
+        elif args.command == "restore":
+            counts = restore_snapshot(args, args.name)
+        elif args.command == "prepare":
+            cloned = prepare_snapshot(args, args.name)
+            print(f"prepare: {'cloned' if cloned else 'already ready'} ({time.perf_counter() - started:.1f}s)")
+            return
+        elif args.command == "drop":
+            drop_snapshot(args, args.name)
+            return
+        else:
+            for name, rows in list_snapshots(args):
+                print(f"{name:<32} ~{rows} rows")
+            return
+    except (ValueError, RuntimeError, pymysql.MySQLError) as e:
+        sys.exit(f"{args.command} failed: {e}")
+
+    approximate = "~" if args.command == "restore" else ""
+    print(f"{args.command}: {approximate}{sum(counts.values())} rows in {len(counts)} tables "
+          f"({time.perf_counter() - started:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
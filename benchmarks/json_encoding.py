@@ -0,0 +1,139 @@
+#------------------------------------------------------------
+# Micro-benchmark of response encoding on large result sets.
+#
+# Encodes --rows synthetic rows shaped like the list routes'
+# results (ints, strings, Decimals, dates, datetimes, NULLs)
+# the old way - a dict per row from the DictCursor, Flask's
+# default provider, optionally the ISO re-walk the profile
+# routes did - and through backend.serialization.json_provider
+# from cursor tuples, with the stdlib encoder and with orjson
+# when it is installed - and in the columnar formats
+# (?format=columnar, and Arrow IPC with pyarrow installed),
+# whose payload size is reported next to the row format's.
+# No database is needed.
+#
+#   python -m benchmarks.json_encoding --rows 10000
+#------------------------------------------------------------
+import argparse
+import datetime
+import json
+import statistics
+import sys
+import time
+from decimal import Decimal
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from benchmarks.run import API_PATH
+
+
+COLUMNS = ("InventoryItemID", "UserID", "IngredientID", "Name", "Quantity", "Unit",
+           "AddedDate", "ExpirationDate", "LastUpdateAt", "Notes")
+
+
+def make_tuples(count: int) -> list[tuple]:
+    start = datetime.date(2025, 1, 1)
+    stamp = datetime.datetime(2025, 1, 1, 8, 30)
+    return [
+        (
+            i, i % 500 + 1, i % 2000 + 1, f"Ingredient {i % 2000}", Decimal(i % 97) / 4, "g",
+            start + datetime.timedelta(days=i % 365),
+            None if i % 5 == 0 else start + datetime.timedelta(days=i % 365 + 7),
+            stamp + datetime.timedelta(minutes=i),
+            None if i % 3 else "keep refrigerated",
+        )
+        for i in range(count)
+    ]
+
+
+def _dict_cursor_rows(tuples):
+    # What pymysql's DictCursor does per row (_conv_row)
+    def conv(row):
+        return dict(zip(COLUMNS, row))
+    return [conv(row) for row in tuples]
+
+
+def _iso_rewalk(rows):
+    # The per-value date conversion profile_plan_routes._row_to_dict did
+    out = []
+    for row in rows:
+        clean = {}
+        for k, v in row.items():
+            clean[k] = v.isoformat() if isinstance(v, (datetime.date, datetime.datetime)) else v
+        out.append(clean)
+    return out
+
+
+def variants(app):
+    from backend.serialization import columnar
+    from backend.serialization.json_provider import FastJSONProvider, Rows, encode, encode_orjson, encode_stdlib
+    import backend.serialization.json_provider as json_provider
+
+    default = DefaultJSONProvider(app)
+    fast = FastJSONProvider(app)
+
+    def with_encoder(encoder):
+        def run(tuples):
+            previous, json_provider.encode = json_provider.encode, encoder
+            try:
+                return fast.response(Rows(COLUMNS, tuples)).get_data()
+            finally:
+                json_provider.encode = previous
+        return run
+
+    found = {
+        "dictcursor + flask default": lambda t: default.response(_dict_cursor_rows(t)).get_data(),
+        "dictcursor + iso re-walk + flask default": lambda t: default.response(_iso_rewalk(_dict_cursor_rows(t))).get_data(),
+        "tuples + provider (stdlib json)": with_encoder(encode_stdlib),
+    }
+    if encode_orjson is not None:
+        found["tuples + provider (orjson)"] = with_encoder(encode_orjson)
+    found["tuples + columnar json"] = lambda t: encode(columnar.to_columnar(Rows(COLUMNS, t)))
+    if columnar.pa is not None:
+        found["tuples + arrow ipc"] = lambda t: columnar.to_arrow_ipc(Rows(COLUMNS, t))
+    return found
+
+
+def measure(func, tuples, repeats: int) -> dict:
+    func(tuples)  # warm up
+    times = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        body = func(tuples)
+        times.append(time.perf_counter() - started)
+    return {
+        "median_ms": round(statistics.median(times) * 1000, 2),
+        "min_ms": round(min(times) * 1000, 2),
+        "bytes": len(body),
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark JSON encoding of large result sets.")
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--out", help="also write the results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, API_PATH)
+    app = Flask(__name__)
+    tuples = make_tuples(args.rows)
+
+    results = {}
+    with app.app_context():
+        for name, func in variants(app).items():
+            results[name] = measure(func, tuples, args.repeats)
+
+    baseline = results["dictcursor + flask default"]["median_ms"]
+    print(f"{args.rows} rows, median of {args.repeats}:")
+    for name, r in results.items():
+        print(f"  {name:<42} {r['median_ms']:>9.2f} ms  {baseline / r['median_ms']:>5.1f}x  {r['bytes']:>10} bytes")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"rows": args.rows, "repeats": args.repeats, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,317 @@
+#------------------------------------------------------------
+# Per-route SQL query budgets (N+1 detection).
+#
+# Sends every blueprint GET route once through the Flask test
+# client against a seeded database and records how many SQL
+# statements it ran (from the Server-Timing header), how many
+# commands it sent to MySQL (round trips, COMMIT and PING
+# included) and how many connections it opened. A route fails
+# when it has no entry in BUDGETS, reports no statement count,
+# exceeds its statement budget, opens more than one connection
+# (none when its budget is 0), sends more round trips than its
+# statements plus SESSION_ROUND_TRIPS per connection, or runs
+# more statements or round trips for a larger result:
+#
+#   * routes in SIZE_PROBES are also sent for the parent id with
+#     the fewest and the one with the most child rows;
+#   * with several --snapshot names every route is measured on
+#     each restored snapshot (e.g. scale 1 and scale 100).
+#
+#   python -m benchmarks.query_budget --snapshot scale1,scale100
+#------------------------------------------------------------
+import argparse
+import json
+import os
+import re
+import sys
+import threading
+from contextlib import contextmanager
+
+from pymysql.connections import Connection
+
+from benchmarks import fixtures
+from benchmarks.run import DEFAULT_QUERY, ROUTE_QUERY, SKIPPED_ENDPOINTS, SKIPPED_PREFIXES, concrete_paths, \
+    create_test_app
+from benchmarks.seed import add_connection_args, connect
+
+
+# Maximum SQL statements per request, by URL rule
+BUDGETS = {
+    "/": 0,
+    "/health": 0,
+    "/metrics": 0,
+    "/metrics/cache": 0,
+    "/metrics/compression": 0,
+    "/metrics/sql": 0,
+    "/alert-rules": 1,
+    "/analytics/reports": 2,
+    "/dashboards/<persona>": 3,
+    "/budget-profile": 1,
+    "/categories": 1,
+    "/data-quality-reports": 1,
+    "/demographic-segments": 1,
+    "/diet-profile": 1,
+    "/favorite-recipes": 1,
+    "/ingredients": 1,
+    "/inventory-items": 1,
+    "/inventory-items/expiring": 1,
+    "/meal-plans": 1,
+    "/meal-plans/<int:meal_plan_id>": 2,
+    "/recipe-usage-statistics": 1,
+    "/recipes": 1,
+    "/recipes/<int:recipe_id>": 2,
+    "/recipes/suggestions": 1,
+    "/system-alerts": 1,
+    "/system-alerts/<int:alert_id>": 1,
+    "/system-metrics": 1,
+    "/system-metrics/<int:metric_id>/snapshots": 1,
+    # watermarks, metric ids, history, targets and one matrix per season
+    "/system-metrics/anomalies": 8,
+    "/system-metrics/snapshots:batch/stats": 0,
+    "/system-metrics/snapshots:batch/dead-letters": 0,
+}
+
+# Commands a connection may send besides the counted statements (e.g. SET
+# AUTOCOMMIT = 0 when it opens, a COMMIT)
+SESSION_ROUND_TRIPS = 2
+
+
+def connect_budget(budget: int) -> int:
+    """Connections a request may open: the one per request db.get_db() makes, if it queries at all."""
+    return 1 if budget > 0 else 0
+
+
+def round_trip_budget(budget: int) -> int:
+    return budget + SESSION_ROUND_TRIPS * connect_budget(budget)
+
+
+# Routes whose result size depends on one parameter: (parameter, SQL
+# returning (value, child rows) per value). The route is sent for the
+# smallest and the largest value and must run the same statements.
+SIZE_PROBES = {
+    "/meal-plans/<int:meal_plan_id>": (
+        "meal_plan_id", "SELECT MealPlanID, COUNT(*) AS n FROM MealPlanEntry GROUP BY MealPlanID"),
+    "/recipes/<int:recipe_id>": (
+        "recipe_id", "SELECT RecipeID, COUNT(*) AS n FROM RecipeIngredient GROUP BY RecipeID"),
+    "/system-metrics/<int:metric_id>/snapshots": (
+        "metric_id", "SELECT MetricID, COUNT(*) AS n FROM MetricSnapshot GROUP BY MetricID"),
+    "/meal-plans": (
+        "user_id", "SELECT UserID, COUNT(*) AS n FROM MealPlan GROUP BY UserID"),
+    "/favorite-recipes": (
+        "user_id", "SELECT UserID, COUNT(*) AS n FROM FavoriteRecipe GROUP BY UserID"),
+    "/inventory-items": (
+        "user_id", "SELECT UserID, COUNT(*) AS n FROM InventoryItem GROUP BY UserID"),
+}
+
+# Budgets are for uncached requests: server-side caches are turned off
+UNCACHED_ENV = {
+    "DASHBOARD_CACHE_TTL_SECONDS": "0",
+    "RESPONSE_CACHE_ENABLED": "false",
+}
+
+_QUERIES = re.compile(r'desc="(\d+) queries"')
+_PATH_PARAM = re.compile(r"<(?:int:)?(\w+)>")
+
+
+class RoundTripCounter:
+    """Counts commands sent and connections opened by pymysql while active."""
+
+    def __init__(self):
+        self.commands = 0
+        self.connects = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def active(self):
+        # Every client command (COM_QUERY, COM_PING, ...) goes through _execute_command
+        execute_command, connect_ = Connection._execute_command, Connection.connect
+        counter = self
+
+        def counted_execute_command(conn, command, sql):
+            with counter._lock:
+                counter.commands += 1
+            return execute_command(conn, command, sql)
+
+        def counted_connect(conn, *args, **kwargs):
+            with counter._lock:
+                counter.connects += 1
+            return connect_(conn, *args, **kwargs)
+
+        Connection._execute_command, Connection.connect = counted_execute_command, counted_connect
+        try:
+            yield self
+        finally:
+            Connection._execute_command, Connection.connect = execute_command, connect_
+
+    def reset(self) -> None:
+        with self._lock:
+            self.commands = self.connects = 0
+
+
+def result_size(body) -> int | None:
+    """Rows in a JSON body: list length, or the summed length of a dict's list values."""
+    if isinstance(body, list):
+        return len(body)
+    if isinstance(body, dict):
+        return sum(len(v) for v in body.values() if isinstance(v, list))
+    return None
+
+
+def probe_values(args, sql: str) -> list[tuple[int, int]]:
+    """[(value, child rows)] for the smallest and the largest parent of a SIZE_PROBES query."""
+    conn = connect(args, args.database)
+    try:
+        with conn.cursor() as cursor:
+            values = []
+            for order in ("n, 1", "n DESC, 1"):
+                cursor.execute(f"SELECT * FROM ({sql}) AS sizes ORDER BY {order} LIMIT 1")
+                row = cursor.fetchone()
+                if row and row not in values:
+                    values.append(row)
+            return values
+    finally:
+        conn.close()
+
+
+def build_requests(app, args) -> list[dict]:
+    """One request per GET rule, plus the smallest/largest variants of SIZE_PROBES rules."""
+    planned = []
+    for rule in sorted(app.url_map.iter_rules(), key=lambda r: r.rule):
+        if rule.endpoint in SKIPPED_ENDPOINTS or rule.rule.startswith(SKIPPED_PREFIXES):
+            continue
+        if "GET" not in rule.methods or (args.routes and not re.search(args.routes, rule.rule)):
+            continue
+        query = dict(ROUTE_QUERY.get(rule.rule, DEFAULT_QUERY))
+        variants = [({}, None)]
+        if rule.rule in SIZE_PROBES:
+            param, sql = SIZE_PROBES[rule.rule]
+            variants = [({param: value}, rows) for value, rows in probe_values(args, sql)] or variants
+
+        names = set(_PATH_PARAM.findall(rule.rule))
+        for overrides, rows in variants:
+            params = {**query, **{k: v for k, v in overrides.items() if k not in names}}
+            for path in concrete_paths(rule.rule, overrides):
+                planned.append({"rule": rule.rule, "path": path, "query": params, "child_rows": rows})
+    return planned
+
+
+def measure(app, planned: list[dict]) -> list[dict]:
+    client = app.test_client()
+    counter = RoundTripCounter()
+    results = []
+    with counter.active():
+        for request in planned:
+            # Unmeasured first call: lazy one-time work (e.g. first data quality run) is not a per-request cost
+            client.get(request["path"], query_string=request["query"])
+            counter.reset()
+            response = client.get(request["path"], query_string=request["query"])
+            match = _QUERIES.search(response.headers.get("Server-Timing", ""))
+            results.append({
+                **request,
+                "status": response.status_code,
+                "statements": int(match.group(1)) if match else None,
+                "round_trips": counter.commands,
+                "connects": counter.connects,
+                "result_size": result_size(response.get_json(silent=True)),
+            })
+    return results
+
+
+def find_violations(runs: dict[str, list[dict]]) -> list[dict]:
+    """Budget overruns, unbudgeted or uncounted routes and query counts that grow with result size."""
+    violations = []
+    by_rule: dict[str, list[tuple[str, dict]]] = {}
+    for snapshot, results in runs.items():
+        for result in results:
+            by_rule.setdefault(result["rule"], []).append((snapshot, result))
+
+    for rule, measured in by_rule.items():
+        budget = BUDGETS.get(rule)
+        if budget is None:
+            violations.append({"rule": rule, "problem": "no budget in benchmarks.query_budget.BUDGETS"})
+            continue
+        for snapshot, result in measured:
+            problems = []
+            if result["status"] >= 500:
+                problems.append(f"HTTP {result['status']}")
+            elif result["statements"] is None:
+                problems.append("no statement count in the Server-Timing header")
+            elif result["statements"] > budget:
+                problems.append(f"{result['statements']} statements > budget {budget}")
+            if result["connects"] > connect_budget(budget):
+                problems.append(f"{result['connects']} connections opened > budget {connect_budget(budget)}")
+            if result["round_trips"] > round_trip_budget(budget):
+                problems.append(f"{result['round_trips']} round trips > budget {round_trip_budget(budget)}")
+            violations += [
+                {"rule": rule, "snapshot": snapshot, "path": result["path"], "problem": problem}
+                for problem in problems
+            ]
+
+        ok = [r for _, r in measured if r["status"] < 400 and r["statements"] is not None]
+        for count in ("statements", "round_trips"):
+            if not ok:
+                break
+            smallest = min(ok, key=lambda r: (r["result_size"] or 0, r[count]))
+            largest = max(ok, key=lambda r: (r["result_size"] or 0, -r[count]))
+            if (largest["result_size"] or 0) > (smallest["result_size"] or 0) and largest[count] > smallest[count]:
+                label = count.replace("_", " ")
+                violations.append({
+                    "rule": rule,
+                    "problem": (
+                        f"{label} grow with result size: {smallest[count]} for "
+                        f"{smallest['result_size']} rows ({smallest['path']}), {largest[count]} for "
+                        f"{largest['result_size']} rows ({largest['path']})"
+                    ),
+                })
+    return violations
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Check per-route SQL query budgets of the MealMind API.")
+    add_connection_args(parser)
+    parser.add_argument("--snapshot", default=None,
+                        help="comma-separated snapshots (benchmarks.fixtures) to restore and measure in turn; "
+                             "default: --database as it is")
+    parser.add_argument("--routes", default=None, help="only check rules matching this regex")
+    parser.add_argument("--out", default=None, help="also write the measurements as JSON")
+    args = parser.parse_args(argv)
+
+    os.environ.update(UNCACHED_ENV)
+    app = create_test_app(args)
+    snapshots = [s for s in (args.snapshot or "").split(",") if s] or [None]
+
+    runs = {}
+    for snapshot in snapshots:
+        if snapshot:
+            fixtures.restore_snapshot(args, snapshot)
+        runs[snapshot or args.database] = results = measure(app, build_requests(app, args))
+
+        print(f"== {snapshot or args.database}")
+        for r in results:
+            budget = BUDGETS.get(r["rule"])
+            print(
+                f"GET    {r['path']:<42} {r['status']}  statements {r['statements']} "
+                f"(budget {'-' if budget is None else budget})  "
+                f"round trips {r['round_trips']} (budget {'-' if budget is None else round_trip_budget(budget)})  "
+                f"connects {r['connects']} (budget {'-' if budget is None else connect_budget(budget)})  "
+                f"rows {r['result_size']}"
+            )
+
+    violations = find_violations(runs)
+    if args.out:
+        os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"runs": runs, "violations": violations}, f, indent=2, default=str)
+        print(f"Wrote {args.out}")
+
+    if violations:
+        print(f"{len(violations)} query budget violation(s):")
+        for v in violations:
+            where = f" [{v['snapshot']}]" if v.get("snapshot") else ""
+            print(f"  {v['rule']}{where}: {v['problem']}")
+        sys.exit(1)
+    print("All routes within their query budgets.")
+
+
+if __name__ == "__main__":
+    main()
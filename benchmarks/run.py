@@ -0,0 +1,290 @@
+#------------------------------------------------------------
+# Endpoint macro-benchmarks.
+#
+# Drives every blueprint GET route (and, with --writes, a few
+# write scenarios against a database freshly restored from a
+# snapshot) through the Flask test client or over HTTP, at each
+# concurrency level of the sweep, and writes
+# a JSON report with throughput, p50/p95/p99 latency, error
+# counts and SQL statements per request (read from the API's
+# Server-Timing header). With --baseline the report is diffed
+# against a stored one and regressions fail the run.
+#
+#   python -m benchmarks.run --scale 100 --concurrency 1,4,16
+#   python -m benchmarks.run --target http://localhost:4000 --baseline benchmarks/baselines/scale-100.json
+#------------------------------------------------------------
+import argparse
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from benchmarks import compare, fixtures
+from benchmarks.seed import ROOT, add_connection_args
+
+
+API_PATH = os.path.join(ROOT, "api")
+
+# Routes that are not part of the product surface
+SKIPPED_ENDPOINTS = {"static"}
+SKIPPED_PREFIXES = ("/admin/",)
+
+# Value used for every <int:...> path segment (ids start at 1 at every scale)
+PATH_ID = 1
+# Values of named path segments; such a route is driven once per value
+PATH_VALUES = {"persona": ("student", "health", "admin", "analyst")}
+
+# Query parameters sent with every GET; routes ignore the ones they do not use
+DEFAULT_QUERY = {"user_id": 1}
+ROUTE_QUERY = {
+    "/system-metrics/anomalies": {"bucket": "1h"},
+    "/inventory-items/expiring": {"user_id": 1, "days_ahead": 7},
+    "/recipes/suggestions": {"user_id": 1, "max_prep_time": 30},
+}
+
+def write_scenarios() -> list[tuple[str, str, dict]]:
+    """
+    Write scenarios (run with --writes). The profile PUTs are idempotent, but
+    the snapshot batch appends 100 MetricSnapshot rows per call, so --writes
+    needs --restore to start every run from the same data.
+    """
+    # Recent points: ingest refuses points behind the rollup watermark
+    measured_at = datetime.now().isoformat(timespec="seconds")
+    return [
+        ("PUT", "/diet-profile", {"user_id": 1, "diet_types": "Vegetarian", "notes": "benchmark"}),
+        ("PUT", "/budget-profile", {"user_id": 1, "weekly_budget_amount": 75}),
+        ("POST", "/system-metrics/snapshots:batch", {
+            "points": [{"metric_id": 1, "measured_at": measured_at, "value": 1.0}] * 100,
+        }),
+    ]
+
+_QUERIES = re.compile(r'desc="(\d+) queries"')
+_PATH_PARAM = re.compile(r"<(?:int:)?(\w+)>")
+
+
+def concrete_paths(rule: str, values: dict | None = None) -> list[str]:
+    """Paths to request for a URL rule: `values`, else PATH_VALUES, else PATH_ID per segment."""
+    paths = [rule]
+    for match in _PATH_PARAM.finditer(rule):
+        name = match.group(1)
+        if values and name in values:
+            options = (values[name],)
+        else:
+            options = PATH_VALUES.get(name, (PATH_ID,))
+        paths = [p.replace(match.group(0), str(v), 1) for p in paths for v in options]
+    return paths
+
+
+def discover_routes(app) -> list[tuple[str, str, dict | None, dict | None]]:
+    """(method, path, query, json body) for every GET rule of every blueprint."""
+    scenarios = []
+    for rule in sorted(app.url_map.iter_rules(), key=lambda r: r.rule):
+        if rule.endpoint in SKIPPED_ENDPOINTS or rule.rule.startswith(SKIPPED_PREFIXES):
+            continue
+        if "GET" not in rule.methods:
+            continue
+        for path in concrete_paths(rule.rule):
+            scenarios.append(("GET", path, ROUTE_QUERY.get(rule.rule, DEFAULT_QUERY), None))
+    return scenarios
+
+
+def create_test_app(args):
+    sys.path.insert(0, API_PATH)
+    os.environ.update({
+        "DB_HOST": args.host,
+        "DB_PORT": str(args.port),
+        "DB_USER": args.user,
+        "MYSQL_ROOT_PASSWORD": args.password,
+        "DB_NAME": args.database,
+        "BACKGROUND_TASKS_ENABLED": "false",
+        "LOG_LEVEL": "WARNING",
+        "SLOW_QUERY_MS": "0",
+        "TRACING_ENABLED": "false",
+    })
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+    from backend.rest_entry import create_app
+    return create_app()
+
+
+class TestClientTarget:
+    def __init__(self, app):
+        self.app = app
+        self._local = threading.local()
+
+    def send(self, method, path, query, body):
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._local.client = self.app.test_client()
+        response = client.open(path, method=method, query_string=query, json=body)
+        return response.status_code, response.headers.get("Server-Timing", "")
+
+
+class HttpTarget:
+    def __init__(self, base_url):
+        import requests
+        self._requests = requests
+        self.base_url = base_url.rstrip("/")
+        self._local = threading.local()
+
+    def send(self, method, path, query, body):
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = self._requests.Session()
+        response = session.request(method, self.base_url + path, params=query, json=body, timeout=60)
+        return response.status_code, response.headers.get("Server-Timing", "")
+
+
+def percentile(sorted_values, q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(int(round(q * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def run_scenario(target, scenario, concurrency: int, requests_per_level: int, warmup: int) -> dict:
+    method, path, query, body = scenario
+    for _ in range(warmup):
+        target.send(method, path, query, body)
+
+    def one_request(_):
+        started = time.perf_counter()
+        try:
+            status, server_timing = target.send(method, path, query, body)
+        except Exception:
+            return time.perf_counter() - started, None, None
+        match = _QUERIES.search(server_timing)
+        return time.perf_counter() - started, status, int(match.group(1)) if match else None
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        samples = list(pool.map(one_request, range(requests_per_level)))
+    wall = time.perf_counter() - started
+
+    latencies = sorted(s[0] for s in samples)
+    queries = [s[2] for s in samples if s[2] is not None]
+    statuses = {}
+    for _, status, _ in samples:
+        key = str(status) if status is not None else "exception"
+        statuses[key] = statuses.get(key, 0) + 1
+    return {
+        "method": method,
+        "path": path,
+        "concurrency": concurrency,
+        "requests": len(samples),
+        "errors": sum(1 for _, status, _ in samples if status is None or status >= 400),
+        "statuses": statuses,
+        "throughput_rps": round(len(samples) / wall, 2) if wall > 0 else None,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+        "queries_per_request": round(sum(queries) / len(queries), 2) if queries else None,
+    }
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the MealMind API endpoints.")
+    add_connection_args(parser)
+    parser.add_argument("--target", default="testclient",
+                        help='"testclient" (in-process app on --database) or the API base URL')
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="scale the database was seeded at (recorded in the report)")
+    parser.add_argument("--concurrency", default="1,4,16", help="comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=200, help="requests per route and level")
+    parser.add_argument("--warmup", type=int, default=5, help="unmeasured requests per route first")
+    parser.add_argument("--routes", default=None, help="only benchmark paths matching this regex")
+    parser.add_argument("--writes", action="store_true",
+                        help="also run the write scenarios (needs --restore, they change the data)")
+    parser.add_argument("--restore", default=None,
+                        help="reset --database from this snapshot (benchmarks.fixtures) before running")
+    parser.add_argument("--out", default=None, help="report path (default benchmarks/results/...)")
+    parser.add_argument("--baseline", default=None, help="baseline report to diff against")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="also store this report as benchmarks/baselines/scale-<N>.json")
+    parser.add_argument("--tolerance", type=float, default=compare.DEFAULT_TOLERANCE,
+                        help="allowed relative p95/throughput change before flagging (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+    if args.writes and not args.restore:
+        parser.error("--writes changes the data; pass --restore NAME so every run starts from the same snapshot")
+
+    if args.restore:
+        # No background re-clone: it would compete with the timed requests
+        fixtures.restore_snapshot(args, args.restore, reclone=False)
+
+    # The API is imported in both modes: its URL map is the list of routes to drive
+    app = create_test_app(args)
+    target = TestClientTarget(app) if args.target == "testclient" else HttpTarget(args.target)
+
+    scenarios = discover_routes(app)
+    if args.writes:
+        scenarios += [(method, path, None, body) for method, path, body in write_scenarios()]
+    if args.routes:
+        scenarios = [s for s in scenarios if re.search(args.routes, s[1])]
+    levels = [int(c) for c in args.concurrency.split(",") if c.strip()]
+
+    results = []
+    for scenario in scenarios:
+        for level in levels:
+            result = run_scenario(target, scenario, level, args.requests, args.warmup)
+            results.append(result)
+            print(
+                f"{result['method']:<6} {result['path']:<42} c={level:<3} "
+                f"{result['throughput_rps']:>9} rps  p50 {result['p50_ms']:>8} ms  "
+                f"p95 {result['p95_ms']:>8} ms  p99 {result['p99_ms']:>8} ms  "
+                f"q/req {result['queries_per_request']}  errors {result['errors']}"
+            )
+
+    report = {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "target": args.target,
+            "database": args.database,
+            "scale": args.scale,
+            "concurrency": levels,
+            "requests_per_level": args.requests,
+            "python": platform.python_version(),
+        },
+        "results": results,
+    }
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            report["regressions"] = compare.find_regressions(json.load(f), report, args.tolerance)
+
+    paths = [args.out or os.path.join(
+        ROOT, "benchmarks", "results", f"scale-{args.scale:g}-{datetime.now():%Y%m%d-%H%M%S}.json"
+    )]
+    if args.save_baseline:
+        paths.append(os.path.join(ROOT, "benchmarks", "baselines", f"scale-{args.scale:g}.json"))
+    for path in paths:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote {path}")
+
+    if args.restore:
+        # Spare copy for the next --restore, cloned now that timing is over
+        fixtures.prepare_snapshot(args, args.restore)
+
+    if report.get("regressions"):
+        compare.print_regressions(report["regressions"])
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#------------------------------------------------------------
+# Seed a benchmark database at a given scale.
+#
+# Recreates the schema from database-files/01_mealmind_db.sql
+# under the chosen database name, generates TSV fixtures with
+# generate_mock_data.py --scale N (cached under
+# benchmarks/fixtures/) and bulk-loads them (see
+# benchmarks.fixtures). --snapshot saves the result so later
+# runs can reset with `benchmarks.fixtures restore`.
+#
+#   python -m benchmarks.seed --scale 100 --database mealmind_bench --snapshot scale100
+#------------------------------------------------------------
+import argparse
+import os
+import subprocess
+import sys
+import time
+from datetime import date
+
+import pymysql
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCHEMA_PATH = os.path.join(ROOT, "database-files", "01_mealmind_db.sql")
+GENERATOR_PATH = os.path.join(ROOT, "generate_mock_data.py")
+FIXTURES_PATH = os.path.join(ROOT, "benchmarks", "fixtures")
+
+
+def sql_statements(lines):
+    """Split a SQL script into statements (one statement may span several lines)."""
+    statement = []
+    for line in lines:
+        stripped = line.strip()
+        if not statement and (not stripped or stripped.startswith("--")):
+            continue
+        statement.append(line.rstrip("\n"))
+        if stripped.endswith(";"):
+            yield "\n".join(statement)
+            statement = []
+    if statement:
+        yield "\n".join(statement)
+
+
+def connect(args, database=None, local_infile=False):
+    return pymysql.connect(
+        host=args.host,
+        port=args.port,
+        user=args.user,
+        password=args.password,
+        database=database,
+        autocommit=False,
+        local_infile=local_infile,
+    )
+
+
+def create_schema(args) -> None:
+    with open(SCHEMA_PATH, encoding="utf-8") as f:
+        schema = f.read()
+    # The schema script targets `mealmind`; point it at the benchmark database
+    schema = schema.replace(
+        "CREATE DATABASE IF NOT EXISTS mealmind;",
+        f"DROP DATABASE IF EXISTS `{args.database}`;\nCREATE DATABASE `{args.database}`;",
+        1,
+    ).replace("USE mealmind;", f"USE `{args.database}`;", 1)
+
+    conn = connect(args)
+    try:
+        with conn.cursor() as cursor:
+            for statement in sql_statements(schema.splitlines()):
+                cursor.execute(statement)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def generate_fixtures(args) -> str:
+    """TSV fixtures for (scale, seed), generated once and reused."""
+    directory = os.path.join(FIXTURES_PATH, f"scale-{args.scale:g}-seed-{args.seed}-{args.as_of}")
+    if args.regenerate or not os.path.exists(os.path.join(directory, "manifest.json")):
+        subprocess.run([
+            sys.executable, GENERATOR_PATH, "--scale", str(args.scale), "--seed", str(args.seed),
+            "--as-of", args.as_of, "--format", "tsv", "--out", directory,
+        ], check=True)
+    return directory
+
+
+def add_connection_args(parser) -> None:
+    parser.add_argument("--host", default=os.getenv("DB_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("DB_PORT", "3200")))
+    parser.add_argument("--user", default=os.getenv("DB_USER", "root"))
+    parser.add_argument("--password", default=os.getenv("MYSQL_ROOT_PASSWORD", ""))
+    parser.add_argument("--database", default="mealmind_bench",
+                        help="benchmark database (seeding drops and recreates it)")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Seed a MealMind benchmark database.")
+    add_connection_args(parser)
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="row-count multiplier passed to generate_mock_data.py (1, 100, 10000)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--as-of", default=date.today().isoformat(),
+                        help="reference date for generated dates (part of the fixture cache key)")
+    parser.add_argument("--regenerate", action="store_true", help="ignore cached fixtures")
+    parser.add_argument("--snapshot", default=None, help="save the loaded data as this snapshot")
+    parser.add_argument("--enable-local-infile", action="store_true",
+                        help="allow SET GLOBAL local_infile = 1 if the server has it off (server-wide)")
+    args = parser.parse_args(argv)
+
+    # Imported here: benchmarks.fixtures imports this module
+    from benchmarks import fixtures
+
+    started = time.perf_counter()
+    directory = generate_fixtures(args)
+    create_schema(args)
+    counts = fixtures.load_fixtures(args, directory, args.enable_local_infile)
+    print(f"Loaded {sum(counts.values())} rows into {args.database} at scale {args.scale:g} "
+          f"in {time.perf_counter() - started:.1f}s")
+    if args.snapshot:
+        fixtures.save_snapshot(args, args.snapshot)
+        print(f"Saved snapshot {args.snapshot}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,13 @@
 CREATE DATABASE IF NOT EXISTS mealmind;
 USE mealmind;
 
+DROP TABLE IF EXISTS MetricRollupState;
+DROP TABLE IF EXISTS MetricRollup1d;
+DROP TABLE IF EXISTS MetricRollup1h;
+DROP TABLE IF EXISTS MetricRollup1m;
+DROP TABLE IF EXISTS DataQualityResult;
 DROP TABLE IF EXISTS SystemAlert;
+DROP TABLE IF EXISTS AlertRule;
 DROP TABLE IF EXISTS MetricSnapshot;
 DROP TABLE IF EXISTS SystemMetric;
 DROP TABLE IF EXISTS RecipeUsageStatistic;
@@ -97,27 +103,57 @@ CREATE TABLE IF NOT EXISTS MetricSnapshot
         foreign key (MetricID) references SystemMetric (MetricID)
 );
 
+create index MetricID_MeasuredAt
+    on MetricSnapshot (MetricID, MeasuredAt);
+
+create index MeasuredAt
+    on MetricSnapshot (MeasuredAt);
+
+CREATE TABLE IF NOT EXISTS AlertRule
+(
+    RuleID        int            not null
+        primary key,
+    MetricID      int            not null,
+    Name          varchar(255)   null,
+    RuleType      varchar(32)    not null,
+    Comparator    varchar(2)     null,
+    Threshold     decimal(12, 2) null,
+    WindowSeconds int            null,
+    Severity      varchar(255)   null,
+    IsActive      tinyint(1)     not null default 1,
+    constraint AlertRule_ibfk_1
+        foreign key (MetricID) references SystemMetric (MetricID)
+);
+
 create index MetricID
-    on MetricSnapshot (MetricID);
+    on AlertRule (MetricID);
 
 CREATE TABLE IF NOT EXISTS SystemAlert
 (
-    AlertID    int          not null
+    AlertID         int          not null
         primary key,
-    MetricID   int          null,
-    AlertType  varchar(255) null,
-    Severity   varchar(255) null,
-    Message    text         null,
-    CreatedAt  datetime     null,
-    ResolvedAt datetime     null,
-    Status     varchar(255) null,
+    MetricID        int          null,
+    AlertType       varchar(255) null,
+    Severity        varchar(255) null,
+    Message         text         null,
+    CreatedAt       datetime     null,
+    ResolvedAt      datetime     null,
+    Status          varchar(255) null,
+    RuleID          int          null,
+    OccurrenceCount int          null,
+    LastSeenAt      datetime     null,
     constraint SystemAlert_ibfk_1
-        foreign key (MetricID) references SystemMetric (MetricID)
+        foreign key (MetricID) references SystemMetric (MetricID),
+    constraint SystemAlert_ibfk_2
+        foreign key (RuleID) references AlertRule (RuleID)
 );
 
 create index MetricID
     on SystemAlert (MetricID);
 
+create index RuleID_Status
+    on SystemAlert (RuleID, Status);
+
 CREATE TABLE IF NOT EXISTS TimePeriod
 (
     PeriodID    int          not null
@@ -276,3 +312,73 @@ create index PeriodID
 create index SegmentID
     on WasteStatistic (SegmentID);
 
+CREATE TABLE IF NOT EXISTS DataQualityResult
+(
+    CheckName  varchar(100)   not null
+        primary key,
+    IssueCount int            null,
+    SampleIDs  text           null,
+    CheckedAt  datetime       null,
+    DurationMs decimal(10, 2) null
+);
+
+CREATE TABLE IF NOT EXISTS MetricRollup1m
+(
+    MetricID       int            not null,
+    BucketStart    datetime       not null,
+    MinValue       decimal(10, 2) null,
+    MaxValue       decimal(10, 2) null,
+    SumValue       decimal(20, 2) null,
+    SampleCount    int            null,
+    LastValue      decimal(10, 2) null,
+    LastMeasuredAt datetime       null,
+    primary key (MetricID, BucketStart),
+    constraint MetricRollup1m_ibfk_1
+        foreign key (MetricID) references SystemMetric (MetricID)
+);
+
+create index BucketStart
+    on MetricRollup1m (BucketStart);
+
+CREATE TABLE IF NOT EXISTS MetricRollup1h
+(
+    MetricID       int            not null,
+    BucketStart    datetime       not null,
+    MinValue       decimal(10, 2) null,
+    MaxValue       decimal(10, 2) null,
+    SumValue       decimal(20, 2) null,
+    SampleCount    int            null,
+    LastValue      decimal(10, 2) null,
+    LastMeasuredAt datetime       null,
+    primary key (MetricID, BucketStart),
+    constraint MetricRollup1h_ibfk_1
+        foreign key (MetricID) references SystemMetric (MetricID)
+);
+
+create index BucketStart
+    on MetricRollup1h (BucketStart);
+
+CREATE TABLE IF NOT EXISTS MetricRollup1d
+(
+    MetricID       int            not null,
+    BucketStart    datetime       not null,
+    MinValue       decimal(10, 2) null,
+    MaxValue       decimal(10, 2) null,
+    SumValue       decimal(20, 2) null,
+    SampleCount    int            null,
+    LastValue      decimal(10, 2) null,
+    LastMeasuredAt datetime       null,
+    primary key (MetricID, BucketStart),
+    constraint MetricRollup1d_ibfk_1
+        foreign key (MetricID) references SystemMetric (MetricID)
+);
+
+create index BucketStart
+    on MetricRollup1d (BucketStart);
+
+CREATE TABLE IF NOT EXISTS MetricRollupState
+(
+    Resolution       varchar(8) not null
+        primary key,
+    CompactedThrough datetime   null
+);
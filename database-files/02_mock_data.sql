@@ -254,6 +254,38 @@ INSERT INTO SystemMetric (MetricID, Name, Description) VALUES (28, 'Active Users
 INSERT INTO SystemMetric (MetricID, Name, Description) VALUES (29, 'API Latency 29', 'Above society budget get fly worry.');
 INSERT INTO SystemMetric (MetricID, Name, Description) VALUES (30, 'API Latency 30', 'Show health five cause.');
 
+-- AlertRule
+INSERT INTO AlertRule (RuleID, MetricID, Name, RuleType, Comparator, Threshold, WindowSeconds, Severity, IsActive) VALUES (1, 1, 'Active Users 1 absence', 'absence', NULL, NULL, 3600, 'Low', 1);
+INSERT INTO AlertRule (RuleID, MetricID, Name, RuleType, Comparator, Threshold, WindowSeconds, Severity, IsActive) VALUES (2, 2, 'Active Users 2 absence', 'absence', NULL, NULL, 3600, 'Low', 1);
+INSERT INTO AlertRule (RuleID, MetricID, Name, RuleType, Comparator, Threshold, WindowSeconds, Severity, IsActive) VALUES (3, 3, 'API Latency 3 threshold', 'threshold', '>', 800, NULL, 'High', 1);
+INSERT INTO AlertRule (RuleID, MetricID, Name, RuleType, Comparator, Threshold, WindowSeconds, Severity, IsActive) VALUES (4, 4, 'DB Storage 4 rate of change', 'rate_of_change', '>', 200, 3600, 'Medium', 1);
+INSERT INTO AlertRule (RuleID, MetricID, Name, RuleType, Comparator, Threshold, WindowSeconds, Severity, IsActive) VALUES (5, 5, 'Active Users 5 absence', 'absence', NULL, NULL, 3600, 'Low', 1);
+INSERT INTO AlertRule (RuleID, MetricID, Name, RuleType, Comparator, Threshold, WindowSeconds, Severity, IsActive) VALUES (6, 6, 'DB Storage 6 rate of change', 'rate_of_change', '>', 200, 3600, 'Medium', 1);
+INSERT INTO AlertRule (RuleID, MetricID, Name, RuleType, Comparator, Threshold, WindowSeconds, Severity, IsActive) VALUES (7, 7, 'Active Users 7 absence', 'absence', NULL, NULL, 3600, 'Low', 1);
+INSERT INTO AlertRule (RuleID, MetricID, Name, RuleType, Comparator, Threshold, WindowSeconds, Severity, IsActive) VALUES (8, 8, 'Error Rate 8 threshold', 'threshold', '>', 500, NULL, 'Critical', 1);
+INSERT INTO AlertRule (RuleID, MetricID, Name, RuleType, Comparator, Threshold, WindowSeconds, Severity, IsActive) VALUES (9, 9, 'API Latency 9 threshold', 'threshold', '>', 800, NULL, 'High', 1);
+INSERT INTO AlertRule (RuleID, MetricID, Name, RuleType, Comparator, Threshold, WindowSeconds, Severity, IsActive) VALUES (10, 10, 'Active Users 10 absence', 'absence', NULL, NULL, 3600, 'Low', 1);
+INSERT INTO AlertRule (RuleID, MetricID, Name, RuleType, Comparator, Threshold, WindowSeconds, Severity, IsActive) VALUES (11, 11, 'DB Storage 11 rate of change', 'rate_of_change', '>', 200, 3600, 'Medium', 1);
+INSERT INTO AlertRule (RuleID, MetricID, Name, RuleType, Comparator, Threshold, WindowSeconds, Severity, IsActive) VALUES (12, 12, 'DB Storage 12 rate of change', 'rate_of_change', '>', 200, 3600, 'Medium', 1);
+INSERT INTO AlertRule (RuleID, MetricID, Name, RuleType, Comparator, Threshold, WindowSeconds, Severity, IsActive) VALUES (13, 13, 'Active Users 13 absence', 'absence', NULL, NULL, 3600, 'Low', 1);
+INSERT INTO AlertRule (RuleID, MetricID, Name, RuleType, Comparator, Threshold, WindowSeconds, Severity, IsActive) VALUES (14, 14, 'API Latency 14 threshold', 'threshold', '>', 800, NULL, 'High', 1);
+INSERT INTO AlertRule (RuleID, MetricID, Name, RuleType, Comparator, Threshold, WindowSeconds, Severity, IsActive) VALUES (15, 15, 'Active Users 15 absence', 'absence', NULL, NULL, 3600, 'Low', 1);
+INSERT INTO AlertRule (RuleID, MetricID, Name, RuleType, Comparator, Threshold, WindowSeconds, Severity, IsActive) VALUES (16, 16, 'Active Users 16 absence', 'absence', NULL, NULL, 3600, 'Low', 1);
+INSERT INTO AlertRule (RuleID, MetricID, Name, RuleType, Comparator, Threshold, WindowSeconds, Severity, IsActive) VALUES (17, 17, 'DB Storage 17 rate of change', 'rate_of_change', '>', 200, 3600, 'Medium', 1);
+INSERT INTO AlertRule (RuleID, MetricID, Name, RuleType, Comparator, Threshold, WindowSeconds, Severity, IsActive) VALUES (18, 18, 'DB Storage 18 rate of change', 'rate_of_change', '>', 200, 3600, 'Medium', 1);
+INSERT INTO AlertRule (RuleID, MetricID, Name, RuleType, Comparator, Threshold, WindowSeconds, Severity, IsActive) VALUES (19, 19, 'DB Storage 19 rate of change', 'rate_of_change', '>', 200, 3600, 'Medium', 1);
+INSERT INTO AlertRule (RuleID, MetricID, Name, RuleType, Comparator, Threshold, WindowSeconds, Severity, IsActive) VALUES (20, 20, 'Error Rate 20 threshold', 'threshold', '>', 500, NULL, 'Critical', 1);
+INSERT INTO AlertRule (RuleID, MetricID, Name, RuleType, Comparator, Threshold, WindowSeconds, Severity, IsActive) VALUES (21, 21, 'API Latency 21 threshold', 'threshold', '>', 800, NULL, 'High', 1);
+INSERT INTO AlertRule (RuleID, MetricID, Name, RuleType, Comparator, Threshold, WindowSeconds, Severity, IsActive) VALUES (22, 22, 'API Latency 22 threshold', 'threshold', '>', 800, NULL, 'High', 1);
+INSERT INTO AlertRule (RuleID, MetricID, Name, RuleType, Comparator, Threshold, WindowSeconds, Severity, IsActive) VALUES (23, 23, 'API Latency 23 threshold', 'threshold', '>', 800, NULL, 'High', 1);
+INSERT INTO AlertRule (RuleID, MetricID, Name, RuleType, Comparator, Threshold, WindowSeconds, Severity, IsActive) VALUES (24, 24, 'Active Users 24 absence', 'absence', NULL, NULL, 3600, 'Low', 1);
+INSERT INTO AlertRule (RuleID, MetricID, Name, RuleType, Comparator, Threshold, WindowSeconds, Severity, IsActive) VALUES (25, 25, 'Active Users 25 absence', 'absence', NULL, NULL, 3600, 'Low', 1);
+INSERT INTO AlertRule (RuleID, MetricID, Name, RuleType, Comparator, Threshold, WindowSeconds, Severity, IsActive) VALUES (26, 26, 'DB Storage 26 rate of change', 'rate_of_change', '>', 200, 3600, 'Medium', 1);
+INSERT INTO AlertRule (RuleID, MetricID, Name, RuleType, Comparator, Threshold, WindowSeconds, Severity, IsActive) VALUES (27, 27, 'DB Storage 27 rate of change', 'rate_of_change', '>', 200, 3600, 'Medium', 1);
+INSERT INTO AlertRule (RuleID, MetricID, Name, RuleType, Comparator, Threshold, WindowSeconds, Severity, IsActive) VALUES (28, 28, 'Active Users 28 absence', 'absence', NULL, NULL, 3600, 'Low', 1);
+INSERT INTO AlertRule (RuleID, MetricID, Name, RuleType, Comparator, Threshold, WindowSeconds, Severity, IsActive) VALUES (29, 29, 'API Latency 29 threshold', 'threshold', '>', 800, NULL, 'High', 1);
+INSERT INTO AlertRule (RuleID, MetricID, Name, RuleType, Comparator, Threshold, WindowSeconds, Severity, IsActive) VALUES (30, 30, 'API Latency 30 threshold', 'threshold', '>', 800, NULL, 'High', 1);
+
 -- WasteStatistic
 INSERT INTO WasteStatistic (WasteStatID, IngredientID, PeriodID, SegmentID, WastedAmount, WasteRatePercent) VALUES (1, 16, 9, 11, 33.04, 3.63);
 INSERT INTO WasteStatistic (WasteStatID, IngredientID, PeriodID, SegmentID, WastedAmount, WasteRatePercent) VALUES (2, 16, 5, 21, 23.15, 52.86);
@@ -1,10 +1,36 @@
+"""
+Generate MealMind mock data for every table, at any scale.
+
+    python generate_mock_data.py > database-files/02_mock_data.sql
+    python generate_mock_data.py --scale 10000 --format tsv --out /tmp/mealmind-10000
+
+Output is reproducible: the same --seed, --scale, --chunk-size and --as-of
+give byte-identical output whatever the number of --workers. Each table is
+generated in chunks of --chunk-size ids (or parent ids for child tables);
+every chunk has its own random stream, so chunks are produced in parallel
+worker processes and streamed out in order without holding a table in memory.
+
+SQL output (the default) uses multi-row INSERTs and goes to stdout, or to one
+<Table>.sql per table with --out. CSV/TSV output (for LOAD DATA) always goes
+to --out: one file per table with a header line, NULL written as \\N, and a
+manifest.json listing tables in FK-safe order with their columns and row
+counts.
+"""
 from faker import Faker
-from datetime import datetime, timedelta, date
-import random
-
-fake = Faker()
-
-# ------------- CONFIG: HOW MANY ROWS -------------
+from datetime import date, datetime
+from multiprocessing import Pool
+from collections import deque
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import zlib
+
+import numpy as np
+
+# ------------- CONFIG: HOW MANY ROWS (at --scale 1) -------------
 NUM_CATEGORIES = 30
 NUM_SEGMENTS = 30
 NUM_INGREDIENTS = 40
@@ -26,6 +52,33 @@ NUM_SYSTEM_METRICS = 30
 NUM_METRIC_SNAPSHOTS = 60
 NUM_SYSTEM_ALERTS = 60
 
+# ------------- CONFIG: DISTRIBUTIONS -------------
+
+# Recipe and ingredient popularity follow a Zipf law with this exponent
+ZIPF_EXPONENT = 1.1
+# Median shelf life (days) of inventory items; log-normal spread
+SHELF_LIFE_MEDIAN_DAYS = 7
+SHELF_LIFE_SIGMA = 0.8
+NEAR_EXPIRY_DAYS = 3
+
+UNITS = ["g", "kg", "oz", "lb", "cup", "tbsp", "tsp"]
+MEAL_TYPES = ["Breakfast", "Lunch", "Dinner"]
+DIET_TYPES = ["None", "Vegetarian", "Vegan", "Gluten Free", "Pescatarian"]
+DIET_WEIGHTS = [0.55, 0.15, 0.08, 0.10, 0.12]
+METRIC_KINDS = ["API Latency", "DB Storage", "Active Users", "Error Rate"]
+
+# AlertRule: one default rule per metric, picked by the metric's kind
+# kind -> (RuleType, Comparator, Threshold, WindowSeconds, Severity)
+ALERT_RULE_DEFAULTS = {
+    "API Latency": ("threshold", ">", 800, None, "High"),
+    "Error Rate": ("threshold", ">", 500, None, "Critical"),
+    "DB Storage": ("rate_of_change", ">", 200, 3600, "Medium"),
+    "Active Users": ("absence", None, None, 3600, "Low"),
+}
+
+# Size of the Faker-generated pools that names, cities and text are drawn from
+POOL_SIZE = 500
+
 # ------------- HELPER FUNCTIONS -------------
 
 def sql_value(v):
@@ -38,325 +91,531 @@ def sql_value(v):
     if isinstance(v, date):
         return f"'{v.strftime('%Y-%m-%d')}'"
     if isinstance(v, str):
-        v = v.replace("'", "''")
+        v = v.replace("\\", "\\\\").replace("'", "''")
         return f"'{v}'"
     v = str(v).replace("'", "''")
     return f"'{v}'"
 
-def insert_stmt(table, row):
-    cols = ", ".join(row.keys())
-    vals = ", ".join(sql_value(v) for v in row.values())
-    return f"INSERT INTO {table} ({cols}) VALUES ({vals});"
 
+def insert_stmt(table, columns, rows):
+    cols = ", ".join(columns)
+    values = ",\n".join("(" + ", ".join(sql_value(v) for v in row) + ")" for row in rows)
+    return f"INSERT INTO {table} ({cols}) VALUES\n{values};"
 
-# ------------- STRONG ENTITIES -------------
 
-categories = [
-    {
-        "CategoryID": i,
-        "CategoryName": fake.word().title()
-    }
-    for i in range(1, NUM_CATEGORIES + 1)
-]
+def tsv_value(v):
+    if v is None:
+        return "\\N"
+    return str(v).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n")
+
+
+# State of the current (worker) process, set by init_worker()
+_ctx = {}
+_popularity = {}
+
+
+def init_worker(seed, as_of, sizes):
+    fake = Faker()
+    Faker.seed(seed)
+    _ctx.update(
+        seed=seed,
+        as_of=as_of,
+        sizes=sizes,
+        first_names=[fake.first_name() for _ in range(POOL_SIZE)],
+        last_names=[fake.last_name() for _ in range(POOL_SIZE)],
+        cities=[fake.city() for _ in range(POOL_SIZE)],
+        words=[fake.word().title() for _ in range(POOL_SIZE)],
+        sentences=[fake.sentence() for _ in range(POOL_SIZE)],
+        paragraphs=[fake.paragraph(nb_sentences=5) for _ in range(POOL_SIZE // 5)],
+    )
+    _popularity.clear()
+
+
+def rng_for(stream, chunk):
+    """Independent, reproducible random stream per (stream name, chunk)."""
+    return np.random.default_rng([_ctx["seed"], zlib.crc32(stream.encode()), chunk])
+
+
+def ids_for(lo, hi):
+    return np.arange(lo + 1, hi + 1)
+
+
+def pick(rng, values, n, p=None):
+    index = rng.choice(len(values), size=n, p=p)
+    return [values[i] for i in index]
+
+
+def dates_before(rng, n, min_days, max_days):
+    """Dates between max_days and min_days before --as-of, as 'YYYY-MM-DD'."""
+    offsets = rng.integers(min_days, max_days + 1, size=n)
+    return offsets, date_strings(-offsets)
+
+
+def date_strings(day_offsets):
+    base = np.datetime64(_ctx["as_of"].date(), "D")
+    return (base + np.asarray(day_offsets, dtype="timedelta64[D]")).astype(str).tolist()
 
-segments = []
-for i in range(1, NUM_SEGMENTS + 1):
-    age_min = random.choice([18, 25, 35])
-    age_max = age_min + random.choice([10, 15])
-    segments.append({
-        "SegmentID": i,
-        "Name": f"{age_min}-{age_max} {random.choice(['Students', 'Adults', 'Families'])}",
-        "AgeMin": age_min,
-        "AgeMax": age_max,
-        "Region": fake.city()
-    })
-
-ingredients = []
-for i in range(1, NUM_INGREDIENTS + 1):
-    ingredients.append({
-        "IngredientID": i,
-        "CategoryID": random.randint(1, NUM_CATEGORIES)
-    })
-
-recipes = []
-for i in range(1, NUM_RECIPES + 1):
-    created = fake.date_time_between(start_date="-1y", end_date="now")
-    recipes.append({
-        "RecipeId": i,
-        "Name": fake.sentence(nb_words=3).replace(".", ""),
-        "PrepTimeMinutes": random.choice(["15", "20", "30", "45", "60"]),
-        "DifficultyLevel": random.choice(["Easy", "Medium", "Hard"]),
-        "Instructions": fake.paragraph(nb_sentences=5),
-        "Status": random.choice(["Active", "Inactive"]),
-        "CreatedAt": created,
-        "LastUpdateAt": created + timedelta(days=random.randint(0, 60))
-    })
-
-time_periods = []
-for i in range(1, NUM_TIME_PERIODS + 1):
-    start = fake.date_between(start_date="-6M", end_date="-1M")
-    end = start + timedelta(days=30)
-    time_periods.append({
-        "PeriodID": i,
-        "StartDate": start,
-        "EndDate": end,
-        "Granularity": "Monthly"
-    })
-
-users = []
-for i in range(1, NUM_USERS + 1):
-    first = fake.first_name()
-    last = fake.last_name()
-    users.append({
-        "UserID": i,
-        "Email": fake.unique.email(),
-        "Region": fake.city(),
-        "FName": first,
-        "LName": last,
-        "Age": random.randint(18, 65)
-    })
-
-system_metrics = []
-for i in range(1, NUM_SYSTEM_METRICS + 1):
-    system_metrics.append({
-        "MetricID": i,
-        "Name": random.choice(["API Latency", "DB Storage", "Active Users", "Error Rate"]) + f" {i}",
-        "Description": fake.sentence()
-    })
+
+def datetime_strings(second_offsets):
+    base = np.datetime64(_ctx["as_of"], "s")
+    stamps = (base + np.asarray(second_offsets, dtype="timedelta64[s]")).astype(str)
+    return np.char.replace(stamps, "T", " ").tolist()
+
+
+def money(values):
+    return np.round(values, 2).tolist()
+
+
+def zipf_ids(rng, name, n_items, size):
+    """Ids in 1..n_items drawn with Zipfian popularity (a fixed, seeded rank order per name)."""
+    key = (name, n_items)
+    if key not in _popularity:
+        weights = 1.0 / np.arange(1, n_items + 1) ** ZIPF_EXPONENT
+        order = rng_for(f"popularity:{name}", 0).permutation(n_items) + 1
+        _popularity[key] = (np.cumsum(weights) / weights.sum(), order)
+    cdf, order = _popularity[key]
+    ranks = np.minimum(np.searchsorted(cdf, rng.random(size)), n_items - 1)
+    return order[ranks]
+
+
+def children_per_parent(rng, n, mean, cap, at_least_one=False):
+    """Heavy-tailed child counts (geometric) with the given mean, clipped to cap."""
+    if at_least_one:
+        counts = 1 + rng.negative_binomial(1, 1.0 / max(mean, 1.0), size=n)
+    else:
+        counts = rng.negative_binomial(1, 1.0 / (1.0 + mean), size=n)
+    return np.minimum(counts, cap)
+
+
+def unique_pairs(parents, children, n_children):
+    """Drop repeated (parent, child) pairs, keeping rows sorted by parent then child."""
+    keys = np.unique(parents.astype(np.int64) * (n_children + 1) + children)
+    return keys // (n_children + 1), keys % (n_children + 1)
+
+
+def rows_of(*columns):
+    return list(zip(*[c.tolist() if isinstance(c, np.ndarray) else c for c in columns]))
+
+
+# ------------- STRONG ENTITIES -------------
+
+def gen_categories(chunk, lo, hi):
+    rng = rng_for("Category", chunk)
+    return rows_of(ids_for(lo, hi), pick(rng, _ctx["words"], hi - lo))
+
+
+def gen_segments(chunk, lo, hi):
+    rng = rng_for("DemographicSegment", chunk)
+    n = hi - lo
+    age_min = rng.choice([18, 25, 35], size=n)
+    age_max = age_min + rng.choice([10, 15], size=n)
+    groups = pick(rng, ["Students", "Adults", "Families"], n)
+    names = [f"{a}-{b} {g}" for a, b, g in zip(age_min.tolist(), age_max.tolist(), groups)]
+    return rows_of(ids_for(lo, hi), names, age_min, age_max, pick(rng, _ctx["cities"], n))
+
+
+def gen_ingredients(chunk, lo, hi):
+    rng = rng_for("Ingredient", chunk)
+    return rows_of(ids_for(lo, hi), rng.integers(1, _ctx["sizes"]["categories"] + 1, size=hi - lo))
+
+
+def gen_recipes(chunk, lo, hi):
+    rng = rng_for("Recipe", chunk)
+    n = hi - lo
+    words = _ctx["words"]
+    names = [
+        f"{words[a]} {words[b].lower()} {words[c].lower()}"
+        for a, b, c in rng.integers(0, len(words), size=(n, 3)).tolist()
+    ]
+    created_offsets = rng.integers(0, 365 * 86400, size=n)
+    updated_offsets = created_offsets - rng.integers(0, 61, size=n) * 86400
+    return rows_of(
+        ids_for(lo, hi),
+        names,
+        pick(rng, ["15", "20", "30", "45", "60"], n),
+        pick(rng, ["Easy", "Medium", "Hard"], n, p=[0.5, 0.35, 0.15]),
+        pick(rng, _ctx["paragraphs"], n),
+        pick(rng, ["Active", "Inactive"], n, p=[0.85, 0.15]),
+        datetime_strings(-created_offsets),
+        datetime_strings(-np.maximum(updated_offsets, 0)),
+    )
+
+
+def gen_time_periods(chunk, lo, hi):
+    rng = rng_for("TimePeriod", chunk)
+    offsets, starts = dates_before(rng, hi - lo, 30, 182)
+    return rows_of(ids_for(lo, hi), starts, date_strings(30 - offsets), ["Monthly"] * (hi - lo))
+
+
+def gen_users(chunk, lo, hi):
+    rng = rng_for("User", chunk)
+    n = hi - lo
+    ids = ids_for(lo, hi)
+    first = pick(rng, _ctx["first_names"], n)
+    last = pick(rng, _ctx["last_names"], n)
+    # The user id keeps emails unique without a uniqueness check
+    emails = [f"{f}.{l}{i}@example.com".lower() for f, l, i in zip(first, last, ids.tolist())]
+    return rows_of(ids, emails, pick(rng, _ctx["cities"], n), first, last, rng.integers(18, 66, size=n))
+
+
+def metric_kinds(chunk, lo, hi):
+    return pick(rng_for("SystemMetric:kind", chunk), METRIC_KINDS, hi - lo)
+
+
+def gen_system_metrics(chunk, lo, hi):
+    rng = rng_for("SystemMetric", chunk)
+    ids = ids_for(lo, hi)
+    names = [f"{kind} {i}" for kind, i in zip(metric_kinds(chunk, lo, hi), ids.tolist())]
+    return rows_of(ids, names, pick(rng, _ctx["sentences"], hi - lo))
+
+
+def gen_alert_rules(chunk, lo, hi):
+    # Same chunks as SystemMetric, so the metric kinds can be regenerated instead of looked up
+    rows = []
+    for metric_id, kind in zip(ids_for(lo, hi).tolist(), metric_kinds(chunk, lo, hi)):
+        rule_type, comparator, threshold, window, severity = ALERT_RULE_DEFAULTS[kind]
+        rows.append((
+            metric_id, metric_id, f"{kind} {metric_id} {rule_type.replace('_', ' ')}",
+            rule_type, comparator, threshold, window, severity, 1,
+        ))
+    return rows
 
 
 # ------------- BRIDGE / WEAK TABLES -------------
 
-# RecipeIngredient (PK = RecipeID, IngredientID)
-recipe_ing_pairs = set()
-recipe_ingredients = []
-while len(recipe_ingredients) < NUM_RECIPE_INGREDIENTS:
-    rid = random.randint(1, NUM_RECIPES)
-    iid = random.randint(1, NUM_INGREDIENTS)
-    key = (rid, iid)
-    if key in recipe_ing_pairs:
-        continue
-    recipe_ing_pairs.add(key)
-    recipe_ingredients.append({
-        "RecipeID": rid,
-        "IngredientID": iid,
-        "RequiredQuantity": round(random.uniform(0.1, 3.0), 2),
-        "Unit": random.choice(["g", "kg", "oz", "lb", "cup", "tbsp", "tsp"])
-    })
-
-# WasteStatistic
-waste_stats = []
-for i in range(1, NUM_WASTE_STATS + 1):
-    waste_stats.append({
-        "WasteStatID": i,
-        "IngredientID": random.randint(1, NUM_INGREDIENTS),
-        "PeriodID": random.randint(1, NUM_TIME_PERIODS),
-        "SegmentID": random.randint(1, NUM_SEGMENTS),
-        "WastedAmount": round(random.uniform(0, 50), 2),
-        "WasteRatePercent": round(random.uniform(0, 100), 2)
-    })
-
-# RecipeUsageStatistic
-recipe_usage_stats = []
-for i in range(1, NUM_RECIPE_USAGE_STATS + 1):
-    recipe_usage_stats.append({
-        "UsageStatID": i,
-        "RecipeID": random.randint(1, NUM_RECIPES),
-        "PeriodID": random.randint(1, NUM_TIME_PERIODS),
-        "SegmentID": random.randint(1, NUM_SEGMENTS),
-        "UsageCount": random.randint(0, 200),
-        "UniqueUsers": random.randint(0, 100)
-    })
-
-# InventoryItem (PK = UserID, IngredientID, AddedDate)
-inv_keys = set()
-inventory_items = []
-while len(inventory_items) < NUM_INVENTORY_ITEMS:
-    user_id = random.randint(1, NUM_USERS)
-    ingredient_id = random.randint(1, NUM_INGREDIENTS)
-    added = fake.date_between(start_date="-30d", end_date="today")
-    key = (user_id, ingredient_id, added)
-    if key in inv_keys:
-        continue
-    inv_keys.add(key)
-    inventory_items.append({
-        "UserID": user_id,
-        "IngredientID": ingredient_id,
-        "AddedDate": added,
-        "Quantity": round(random.uniform(0.1, 5.0), 2),
-        "Unit": random.choice(["g", "kg", "oz", "lb", "cup", "tbsp", "tsp"]),
-        "ExpirationDate": added + timedelta(days=random.randint(1, 30)),
-        "Status": random.choice(["Fresh", "Near Expiry", "Expired"])
-    })
-
-# UserBudgetProfile (1 row per user)
-user_budget_profiles = []
-for u in users:
-    user_budget_profiles.append({
-        "UserID": u["UserID"],
-        "WeeklyBudgetAmount": round(random.uniform(25, 150), 2),
-        "Currency": "USD"
-    })
-
-# UsersBudgetProfile (diet/preferences)
-users_budget_profiles = []
-for u in users:
-    users_budget_profiles.append({
-        "UserID": u["UserID"],
-        "DietTypes": random.choice(["None", "Vegetarian", "Vegan", "Gluten Free", "Pescatarian"]),
-        "Notes": fake.sentence()
-    })
-
-# FavoriteRecipe (PK = UserID, RecipeID)
-fav_pairs = set()
-favorite_recipes = []
-while len(favorite_recipes) < NUM_FAVORITES:
-    uid = random.randint(1, NUM_USERS)
-    rid = random.randint(1, NUM_RECIPES)
-    key = (uid, rid)
-    if key in fav_pairs:
-        continue
-    fav_pairs.add(key)
-    favorite_recipes.append({
-        "UserID": uid,
-        "RecipeID": rid,
-        "FavoritedDate": fake.date_between(start_date="-6M", end_date="today")
-    })
-
-# MealPlan
-meal_plans = []
-for i in range(1, NUM_MEAL_PLANS + 1):
-    user_id = random.randint(1, NUM_USERS)
-    start = fake.date_between(start_date="-30d", end_date="today")
-    end = start + timedelta(days=6)
-    meal_plans.append({
-        "MealPlanID": i,
-        "UserID": user_id,
-        "StartDate": start,
-        "EndDate": end,
-        "IsSaved": 1  # tinyint(1)
-    })
-
-# MealPlanEntry (PK = MealPlanID, Date, MealType)
-entry_keys = set()
-meal_plan_entries = []
-while len(meal_plan_entries) < NUM_MEAL_PLAN_ENTRIES:
-    mp_id = random.randint(1, NUM_MEAL_PLANS)
-    day_offset = random.randint(0, 6)
-    date_val = date.today() + timedelta(days=day_offset)
-    meal_type = random.choice(["Breakfast", "Lunch", "Dinner"])
-    key = (mp_id, date_val, meal_type)
-    if key in entry_keys:
-        continue
-    entry_keys.add(key)
-    meal_plan_entries.append({
-        "MealPlanID": mp_id,
-        "Date": date_val,
-        "MealType": meal_type,
-        "RecipeID": random.randint(1, NUM_RECIPES),
-        "Notes": fake.sentence()
-    })
-
-# MetricSnapshot
-metric_snapshots = []
-for i in range(1, NUM_METRIC_SNAPSHOTS + 1):
-    metric_id = random.randint(1, NUM_SYSTEM_METRICS)
-    measured = fake.date_time_between(start_date="-7d", end_date="now")
-    metric_snapshots.append({
-        "SnapshotID": i,
-        "MetricID": metric_id,
-        "MeasuredAt": measured,
-        "Value": round(random.uniform(0, 1000), 2)
-    })
-
-# SystemAlert
-system_alerts = []
-for i in range(1, NUM_SYSTEM_ALERTS + 1):
-    metric_id = random.choice([None, random.randint(1, NUM_SYSTEM_METRICS)])
-    created = fake.date_time_between(start_date="-7d", end_date="now")
-    resolved = created + timedelta(hours=random.randint(1, 72)) if random.choice([True, False]) else None
-    system_alerts.append({
-        "AlertID": i,
-        "MetricID": metric_id,
-        "AlertType": random.choice(["Threshold", "Error Spike", "Downtime"]),
-        "Severity": random.choice(["Low", "Medium", "High", "Critical"]),
-        "Message": fake.sentence(),
-        "CreatedAt": created,
-        "ResolvedAt": resolved,
-        "Status": random.choice(["Open", "Acknowledged", "Resolved"])
-    })
-
-
-# ------------- PRINT INSERTS IN FK-SAFE ORDER -------------
-
-print("-- Category")
-for r in categories:
-    print(insert_stmt("Category", r))
-
-print("\n-- DemographicSegment")
-for r in segments:
-    print(insert_stmt("DemographicSegment", r))
-
-print("\n-- Ingredient")
-for r in ingredients:
-    print(insert_stmt("Ingredient", r))
-
-print("\n-- Recipe")
-for r in recipes:
-    print(insert_stmt("Recipe", r))
-
-print("\n-- TimePeriod")
-for r in time_periods:
-    print(insert_stmt("TimePeriod", r))
-
-print("\n-- User")
-for r in users:
-    print(insert_stmt("User", r))
-
-print("\n-- SystemMetric")
-for r in system_metrics:
-    print(insert_stmt("SystemMetric", r))
-
-print("\n-- WasteStatistic")
-for r in waste_stats:
-    print(insert_stmt("WasteStatistic", r))
-
-print("\n-- RecipeIngredient")
-for r in recipe_ingredients:
-    print(insert_stmt("RecipeIngredient", r))
-
-print("\n-- RecipeUsageStatistic")
-for r in recipe_usage_stats:
-    print(insert_stmt("RecipeUsageStatistic", r))
-
-print("\n-- InventoryItem")
-for r in inventory_items:
-    print(insert_stmt("InventoryItem", r))
-
-print("\n-- UserBudgetProfile")
-for r in user_budget_profiles:
-    print(insert_stmt("UserBudgetProfile", r))
-
-print("\n-- UsersBudgetProfile")
-for r in users_budget_profiles:
-    print(insert_stmt("UsersBudgetProfile", r))
-
-print("\n-- FavoriteRecipe")
-for r in favorite_recipes:
-    print(insert_stmt("FavoriteRecipe", r))
-
-print("\n-- MealPlan")
-for r in meal_plans:
-    print(insert_stmt("MealPlan", r))
-
-print("\n-- MealPlanEntry")
-for r in meal_plan_entries:
-    print(insert_stmt("MealPlanEntry", r))
-
-print("\n-- MetricSnapshot")
-for r in metric_snapshots:
-    print(insert_stmt("MetricSnapshot", r))
-
-print("\n-- SystemAlert")
-for r in system_alerts:
-    print(insert_stmt("SystemAlert", r))
+def gen_waste_stats(chunk, lo, hi):
+    rng = rng_for("WasteStatistic", chunk)
+    n = hi - lo
+    sizes = _ctx["sizes"]
+    return rows_of(
+        ids_for(lo, hi),
+        zipf_ids(rng, "Ingredient", sizes["ingredients"], n),
+        rng.integers(1, sizes["time_periods"] + 1, size=n),
+        rng.integers(1, sizes["segments"] + 1, size=n),
+        money(np.minimum(rng.gamma(2.0, 5.0, size=n), 50)),
+        money(rng.beta(2.0, 5.0, size=n) * 100),
+    )
+
+
+def gen_recipe_ingredients(chunk, lo, hi):
+    rng = rng_for("RecipeIngredient", chunk)
+    sizes = _ctx["sizes"]
+    n_ing = sizes["ingredients"]
+    counts = children_per_parent(rng, hi - lo, sizes["recipe_ingredients"] / sizes["recipes"],
+                                 min(n_ing, 25), at_least_one=True)
+    recipes, ingredients = unique_pairs(
+        np.repeat(ids_for(lo, hi), counts), zipf_ids(rng, "Ingredient", n_ing, int(counts.sum())), n_ing
+    )
+    n = len(recipes)
+    return rows_of(
+        recipes, ingredients, money(rng.uniform(0.1, 3.0, size=n)), pick(rng, UNITS, n)
+    )
+
+
+def gen_recipe_usage_stats(chunk, lo, hi):
+    rng = rng_for("RecipeUsageStatistic", chunk)
+    n = hi - lo
+    sizes = _ctx["sizes"]
+    usage = np.minimum(rng.negative_binomial(2, 0.04, size=n), 1000)
+    return rows_of(
+        ids_for(lo, hi),
+        zipf_ids(rng, "Recipe", sizes["recipes"], n),
+        rng.integers(1, sizes["time_periods"] + 1, size=n),
+        rng.integers(1, sizes["segments"] + 1, size=n),
+        usage,
+        rng.binomial(usage, 0.6),
+    )
+
+
+def gen_inventory_items(chunk, lo, hi):
+    rng = rng_for("InventoryItem", chunk)
+    sizes = _ctx["sizes"]
+    n_ing = sizes["ingredients"]
+    counts = children_per_parent(rng, hi - lo, sizes["inventory_items"] / sizes["users"], min(n_ing, 200))
+    users, ingredients = unique_pairs(
+        np.repeat(ids_for(lo, hi), counts), zipf_ids(rng, "Ingredient", n_ing, int(counts.sum())), n_ing
+    )
+    n = len(users)
+    # Most items were bought recently; a few linger for up to a month
+    added_offsets = np.minimum(rng.geometric(1 / 6, size=n) - 1, 30)
+    added = date_strings(-added_offsets)
+    shelf_life = np.clip(
+        np.rint(rng.lognormal(np.log(SHELF_LIFE_MEDIAN_DAYS), SHELF_LIFE_SIGMA, size=n)), 1, 365
+    ).astype(int)
+    days_left = shelf_life - added_offsets
+    status = np.where(days_left < 0, "Expired", np.where(days_left <= NEAR_EXPIRY_DAYS, "Near Expiry", "Fresh"))
+    return rows_of(
+        users, ingredients, added,
+        money(rng.uniform(0.1, 5.0, size=n)), pick(rng, UNITS, n),
+        date_strings(days_left), status,
+    )
+
+
+def gen_user_budget_profiles(chunk, lo, hi):
+    rng = rng_for("UserBudgetProfile", chunk)
+    n = hi - lo
+    budgets = np.clip(rng.lognormal(np.log(60), 0.4, size=n), 25, 150)
+    return rows_of(ids_for(lo, hi), money(budgets), ["USD"] * n)
+
+
+def gen_users_budget_profiles(chunk, lo, hi):
+    rng = rng_for("UsersBudgetProfile", chunk)
+    n = hi - lo
+    return rows_of(ids_for(lo, hi), pick(rng, DIET_TYPES, n, p=DIET_WEIGHTS), pick(rng, _ctx["sentences"], n))
+
+
+def gen_favorite_recipes(chunk, lo, hi):
+    rng = rng_for("FavoriteRecipe", chunk)
+    sizes = _ctx["sizes"]
+    n_rec = sizes["recipes"]
+    counts = children_per_parent(rng, hi - lo, sizes["favorites"] / sizes["users"], min(n_rec, 200))
+    users, recipes = unique_pairs(
+        np.repeat(ids_for(lo, hi), counts), zipf_ids(rng, "Recipe", n_rec, int(counts.sum())), n_rec
+    )
+    return rows_of(users, recipes, dates_before(rng, len(users), 0, 182)[1])
+
+
+def meal_plan_start_offsets(chunk, lo, hi):
+    return rng_for("MealPlan:StartDate", chunk).integers(0, 31, size=hi - lo)
+
+
+def gen_meal_plans(chunk, lo, hi):
+    rng = rng_for("MealPlan", chunk)
+    n = hi - lo
+    offsets = meal_plan_start_offsets(chunk, lo, hi)
+    return rows_of(
+        ids_for(lo, hi),
+        rng.integers(1, _ctx["sizes"]["users"] + 1, size=n),
+        date_strings(-offsets),
+        date_strings(6 - offsets),
+        [1] * n,
+    )
+
+
+def gen_meal_plan_entries(chunk, lo, hi):
+    # Same chunks as MealPlan, so each plan's start date is regenerated, not looked up
+    rng = rng_for("MealPlanEntry", chunk)
+    sizes = _ctx["sizes"]
+    n_plans = hi - lo
+    slots_per_plan = 7 * len(MEAL_TYPES)
+    counts = children_per_parent(rng, n_plans, sizes["meal_plan_entries"] / sizes["meal_plans"], slots_per_plan)
+    # A random permutation of each plan's (day, meal) slots; its first `count` slots are used
+    slots = np.argsort(rng.random((n_plans, slots_per_plan)), axis=1)
+    used = np.arange(slots_per_plan) < counts[:, None]
+    plan_index = np.repeat(np.arange(n_plans), counts)
+    slot = np.sort(np.where(used, slots, slots_per_plan), axis=1)[used]
+    n = len(slot)
+    start_offsets = meal_plan_start_offsets(chunk, lo, hi)[plan_index]
+    return rows_of(
+        ids_for(lo, hi)[plan_index],
+        date_strings(slot // len(MEAL_TYPES) - start_offsets),
+        [MEAL_TYPES[s] for s in (slot % len(MEAL_TYPES)).tolist()],
+        zipf_ids(rng, "Recipe", sizes["recipes"], n),
+        pick(rng, _ctx["sentences"], n),
+    )
+
+
+def gen_metric_snapshots(chunk, lo, hi):
+    rng = rng_for("MetricSnapshot", chunk)
+    n = hi - lo
+    return rows_of(
+        ids_for(lo, hi),
+        rng.integers(1, _ctx["sizes"]["system_metrics"] + 1, size=n),
+        datetime_strings(-rng.integers(0, 7 * 86400, size=n)),
+        money(rng.uniform(0, 1000, size=n)),
+    )
+
+
+def gen_system_alerts(chunk, lo, hi):
+    rng = rng_for("SystemAlert", chunk)
+    n = hi - lo
+    metric_ids = rng.integers(1, _ctx["sizes"]["system_metrics"] + 1, size=n)
+    created = -rng.integers(0, 7 * 86400, size=n)
+    resolved = datetime_strings(created + rng.integers(1, 73, size=n) * 3600)
+    is_resolved = rng.random(n) < 0.5
+    return rows_of(
+        ids_for(lo, hi),
+        [m if keep else None for m, keep in zip(metric_ids.tolist(), (rng.random(n) < 0.5).tolist())],
+        pick(rng, ["Threshold", "Error Spike", "Downtime"], n),
+        pick(rng, ["Low", "Medium", "High", "Critical"], n),
+        pick(rng, _ctx["sentences"], n),
+        datetime_strings(created),
+        [r if keep else None for r, keep in zip(resolved, is_resolved.tolist())],
+        np.where(is_resolved, "Resolved", np.where(rng.random(n) < 0.5, "Open", "Acknowledged")),
+    )
+
+
+# ------------- TABLES IN FK-SAFE ORDER -------------
+# (table, columns, size key whose ids are chunked, generator)
+
+TABLES = [
+    ("Category", ["CategoryID", "CategoryName"], "categories", gen_categories),
+    ("DemographicSegment", ["SegmentID", "Name", "AgeMin", "AgeMax", "Region"], "segments", gen_segments),
+    ("Ingredient", ["IngredientID", "CategoryID"], "ingredients", gen_ingredients),
+    ("Recipe", ["RecipeId", "Name", "PrepTimeMinutes", "DifficultyLevel", "Instructions", "Status",
+                "CreatedAt", "LastUpdateAt"], "recipes", gen_recipes),
+    ("TimePeriod", ["PeriodID", "StartDate", "EndDate", "Granularity"], "time_periods", gen_time_periods),
+    ("User", ["UserID", "Email", "Region", "FName", "LName", "Age"], "users", gen_users),
+    ("SystemMetric", ["MetricID", "Name", "Description"], "system_metrics", gen_system_metrics),
+    ("AlertRule", ["RuleID", "MetricID", "Name", "RuleType", "Comparator", "Threshold", "WindowSeconds",
+                   "Severity", "IsActive"], "system_metrics", gen_alert_rules),
+    ("WasteStatistic", ["WasteStatID", "IngredientID", "PeriodID", "SegmentID", "WastedAmount",
+                        "WasteRatePercent"], "waste_stats", gen_waste_stats),
+    ("RecipeIngredient", ["RecipeID", "IngredientID", "RequiredQuantity", "Unit"], "recipes",
+     gen_recipe_ingredients),
+    ("RecipeUsageStatistic", ["UsageStatID", "RecipeID", "PeriodID", "SegmentID", "UsageCount",
+                              "UniqueUsers"], "recipe_usage_stats", gen_recipe_usage_stats),
+    ("InventoryItem", ["UserID", "IngredientID", "AddedDate", "Quantity", "Unit", "ExpirationDate",
+                       "Status"], "users", gen_inventory_items),
+    ("UserBudgetProfile", ["UserID", "WeeklyBudgetAmount", "Currency"], "users", gen_user_budget_profiles),
+    ("UsersBudgetProfile", ["UserID", "DietTypes", "Notes"], "users", gen_users_budget_profiles),
+    ("FavoriteRecipe", ["UserID", "RecipeID", "FavoritedDate"], "users", gen_favorite_recipes),
+    ("MealPlan", ["MealPlanID", "UserID", "StartDate", "EndDate", "IsSaved"], "meal_plans", gen_meal_plans),
+    ("MealPlanEntry", ["MealPlanID", "Date", "MealType", "RecipeID", "Notes"], "meal_plans",
+     gen_meal_plan_entries),
+    ("MetricSnapshot", ["SnapshotID", "MetricID", "MeasuredAt", "Value"], "metric_snapshots",
+     gen_metric_snapshots),
+    ("SystemAlert", ["AlertID", "MetricID", "AlertType", "Severity", "Message", "CreatedAt", "ResolvedAt",
+                     "Status"], "system_alerts", gen_system_alerts),
+]
+_GENERATORS = {name: (columns, generator) for name, columns, _, generator in TABLES}
+
+
+def table_sizes(scale):
+    def scaled(n):
+        return max(1, int(n * scale))
+
+    return {
+        "categories": scaled(NUM_CATEGORIES),
+        "segments": scaled(NUM_SEGMENTS),
+        "ingredients": scaled(NUM_INGREDIENTS),
+        "recipes": scaled(NUM_RECIPES),
+        "time_periods": scaled(NUM_TIME_PERIODS),
+        "users": scaled(NUM_USERS),
+        "recipe_ingredients": scaled(NUM_RECIPE_INGREDIENTS),
+        "waste_stats": scaled(NUM_WASTE_STATS),
+        "recipe_usage_stats": scaled(NUM_RECIPE_USAGE_STATS),
+        "inventory_items": scaled(NUM_INVENTORY_ITEMS),
+        "favorites": scaled(NUM_FAVORITES),
+        "meal_plans": scaled(NUM_MEAL_PLANS),
+        "meal_plan_entries": scaled(NUM_MEAL_PLAN_ENTRIES),
+        "system_metrics": scaled(NUM_SYSTEM_METRICS),
+        "metric_snapshots": scaled(NUM_METRIC_SNAPSHOTS),
+        "system_alerts": scaled(NUM_SYSTEM_ALERTS),
+    }
+
+
+def render_chunk(task):
+    """Worker entry point: generate one chunk and format it. Returns (row count, text)."""
+    table, chunk, lo, hi, fmt, rows_per_insert = task
+    columns, generator = _GENERATORS[table]
+    rows = generator(chunk, lo, hi)
+    if fmt == "sql":
+        text = "".join(
+            insert_stmt(table, columns, rows[i:i + rows_per_insert]) + "\n"
+            for i in range(0, len(rows), rows_per_insert)
+        )
+    elif fmt == "csv":
+        out = io.StringIO()
+        csv.writer(out, lineterminator="\n").writerows(
+            ["\\N" if v is None else v for v in row] for row in rows
+        )
+        text = out.getvalue()
+    else:
+        text = "".join("\t".join(tsv_value(v) for v in row) + "\n" for row in rows)
+    return len(rows), text
+
+
+def chunk_tasks(sizes, fmt, chunk_size, rows_per_insert):
+    for table, _, size_key, _ in TABLES:
+        for chunk, lo in enumerate(range(0, sizes[size_key], chunk_size)):
+            yield table, chunk, lo, min(lo + chunk_size, sizes[size_key]), fmt, rows_per_insert
+
+
+def ordered_results(tasks, workers, worker_args):
+    """Run tasks in a process pool, yielding (task, result) in task order with a bounded backlog."""
+    if workers <= 1:
+        for task in tasks:
+            yield task, render_chunk(task)
+        return
+    with Pool(workers, initializer=init_worker, initargs=worker_args) as pool:
+        pending = deque()
+        for task in tasks:
+            pending.append((task, pool.apply_async(render_chunk, (task,))))
+            if len(pending) >= workers * 2:
+                done, result = pending.popleft()
+                yield done, result.get()
+        while pending:
+            done, result = pending.popleft()
+            yield done, result.get()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate MealMind mock data.")
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="multiply every row count (e.g. 100 for 100x the default data)")
+    parser.add_argument("--seed", type=int, default=42, help="random seed (default 42)")
+    parser.add_argument("--as-of", default=None,
+                        help="reference date YYYY-MM-DD that generated dates are relative to (default today)")
+    parser.add_argument("--format", choices=["sql", "csv", "tsv"], default="sql")
+    parser.add_argument("--out", default=None,
+                        help="directory for one file per table plus manifest.json (required for csv/tsv)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=20000,
+                        help="ids (or parent ids, for child tables) generated per task")
+    parser.add_argument("--rows-per-insert", type=int, default=1000, help="rows per multi-row INSERT")
+    args = parser.parse_args(argv)
+
+    if args.format != "sql" and not args.out:
+        parser.error("--out is required for csv/tsv output")
+    as_of = datetime.fromisoformat(args.as_of) if args.as_of else datetime.combine(date.today(), datetime.min.time())
+    sizes = table_sizes(args.scale)
+    worker_args = (args.seed, as_of, sizes)
+    init_worker(*worker_args)
+
+    extension = args.format
+    manifest = {
+        "format": args.format,
+        "seed": args.seed,
+        "scale": args.scale,
+        "as_of": as_of.date().isoformat(),
+        "tables": [],
+    }
+    if args.out:
+        os.makedirs(args.out, exist_ok=True)
+
+    current, stream = None, None
+    tasks = chunk_tasks(sizes, args.format, args.chunk_size, args.rows_per_insert)
+    for task, (count, text) in ordered_results(tasks, args.workers, worker_args):
+        table = task[0]
+        if table != current:
+            if args.out and stream is not None:
+                stream.close()
+            columns = _GENERATORS[table][0]
+            if args.out:
+                file_name = f"{table}.{extension}"
+                stream = open(os.path.join(args.out, file_name), "w", encoding="utf-8", newline="")
+                manifest["tables"].append({"name": table, "file": file_name, "columns": columns, "rows": 0})
+            else:
+                stream = sys.stdout
+                manifest["tables"].append({"name": table, "columns": columns, "rows": 0})
+                stream.write(f"\n-- {table}\n" if current else f"-- {table}\n")
+            if args.format == "csv":
+                stream.write(",".join(columns) + "\n")
+            elif args.format == "tsv":
+                stream.write("\t".join(columns) + "\n")
+            current = table
+        manifest["tables"][-1]["rows"] += count
+        stream.write(text)
+
+    if args.out:
+        if stream is not None:
+            stream.close()
+        with open(os.path.join(args.out, "manifest.json"), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+    for entry in manifest["tables"]:
+        print(f"{entry['name']:<22} {entry['rows']:>12}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()